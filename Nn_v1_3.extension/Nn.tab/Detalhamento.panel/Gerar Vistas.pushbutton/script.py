@@ -9,31 +9,24 @@ import math
 import re 
 from Autodesk.Revit.UI.Selection import ISelectionFilter, ObjectType
 from Autodesk.Revit.DB import *
-from pyrevit import forms, revit, script, DB
+from pyrevit import forms, revit, script, DB, EXEC_PARAMS
+
+# Filtro de seleção da lib NnBim (categoria por int-id, com suporte a vínculos)
+from Snippets._selection_filters import ISelectionFilter_Categories
+from Snippets._profiling import (get_profiler, SELECTION, DEDUP, COLLECTION,
+                                 GEOMETRY, CREATION, RENAME, API_CALLS)
+from Snippets._context_manager import ef_Transaction
 
 doc = revit.doc
 uidoc = revit.uidoc
 
+# Tempo por fase (relatório com Ctrl+Clique, JSONL sempre)
+PROFILER = get_profiler('Gerar Vistas')
+
 # ==============================================================================
 # 1. CLASSES AUXILIARES
 # ==============================================================================
 
-class NnBim_LinkFilter(ISelectionFilter):
-    def __init__(self, cat_id, doc_alvo):
-        self.cat_id = cat_id
-        self.doc_alvo = doc_alvo
-    def AllowElement(self, element):
-        if element.Category and element.Category.Id.IntegerValue == self.cat_id.IntegerValue:
-            return True
-        return False
-    def AllowReference(self, reference, point):
-        try:
-            elem = self.doc_alvo.GetElement(reference.LinkedElementId)
-            if elem and elem.Category and elem.Category.Id.IntegerValue == self.cat_id.IntegerValue:
-                return True
-        except: return False
-        return False
-
 def rotate_vector(vector, rotation_rad):
     vx, vy = vector.X, vector.Y
     rx = vx * math.cos(rotation_rad) - vy * math.sin(rotation_rad)
@@ -117,6 +110,7 @@ class SectionGenerator():
             for suffix, mode in sufixos:
                 bbox = self.create_section_box(mode)
                 view = ViewSection.CreateSection(self.doc, view_type_id, bbox)
+                PROFILER.count(API_CALLS)
                 final_name = name_base + suffix
                 self.safe_rename(view, final_name)
                 if template_id and template_id != ElementId.InvalidElementId:
@@ -127,10 +121,12 @@ class SectionGenerator():
             print("Erro ao criar vista: " + str(e))
         return views
 
+    @PROFILER.timed(RENAME)
     def safe_rename(self, view, name):
         for i in range(50):
             try:
                 new_name = name if i==0 else "{} ({})".format(name, i)
+                PROFILER.count(API_CALLS)
                 view.Name = new_name
                 break
             except: continue
@@ -202,25 +198,27 @@ if not cat_escolhida: script.exit()
 # PASSO 2: SELEÇÃO
 elementos_brutos = [] 
 
-try:
-    if is_link:
-        with forms.WarningBar(title="Selecione VÁRIOS elementos no VÍNCULO."):
-            refs = uidoc.Selection.PickObjects(ObjectType.LinkedElement, "Selecione")
-        for ref in refs:
-            link_instance = doc.GetElement(ref.ElementId) 
-            link_transform = link_instance.GetTotalTransform()
-            link_doc = link_instance.GetLinkDocument()
-            elem = link_doc.GetElement(ref.LinkedElementId)
-            if elem.Category.Id.IntegerValue == cat_dict[cat_escolhida].IntegerValue:
-                elementos_brutos.append( (elem, link_transform) )
-    else:
-        filtro = NnBim_SelectionFilter(cat_dict[cat_escolhida])
-        with forms.WarningBar(title="Selecione VÁRIOS elementos LOCAIS."):
-            refs = uidoc.Selection.PickObjects(ObjectType.Element, filtro, "Selecione")
-        for ref in refs:
-            elementos_brutos.append( (doc.GetElement(ref), None) )
-
-except: script.exit()
+with PROFILER.phase(SELECTION):
+    try:
+        if is_link:
+            filtro = ISelectionFilter_Categories([cat_dict[cat_escolhida]], allow_links=True)
+            with forms.WarningBar(title="Selecione VÁRIOS elementos no VÍNCULO."):
+                refs = uidoc.Selection.PickObjects(ObjectType.LinkedElement, filtro, "Selecione")
+            for ref in refs:
+                link_instance = doc.GetElement(ref.ElementId) 
+                link_transform = link_instance.GetTotalTransform()
+                link_doc = link_instance.GetLinkDocument()
+                elem = link_doc.GetElement(ref.LinkedElementId)
+                if elem.Category.Id.IntegerValue == cat_dict[cat_escolhida].IntegerValue:
+                    elementos_brutos.append( (elem, link_transform) )
+        else:
+            filtro = ISelectionFilter_Categories([cat_dict[cat_escolhida]])
+            with forms.WarningBar(title="Selecione VÁRIOS elementos LOCAIS."):
+                refs = uidoc.Selection.PickObjects(ObjectType.Element, filtro, "Selecione")
+            for ref in refs:
+                elementos_brutos.append( (doc.GetElement(ref), None) )
+
+    except: script.exit()
 
 if not elementos_brutos: 
     forms.alert("Nada selecionado.")
@@ -243,28 +241,30 @@ chaves_vistas = [] # Lista para guardar o que já foi processado
 
 print("Processando {} elementos selecionados...".format(len(elementos_brutos)))
 
-for item in elementos_brutos:
-    el = item[0]
+with PROFILER.phase(DEDUP):
+    for item in elementos_brutos:
+        el = item[0]
     
-    # Descobre o valor do Parâmetro Principal (Agrupador)
-    chave = get_param_value(el, p1)
+        # Descobre o valor do Parâmetro Principal (Agrupador)
+        chave = get_param_value(el, p1)
     
-    # Se o parâmetro estiver vazio, usa o ID (para não perder o elemento)
-    if not chave: chave = str(el.Id)
+        # Se o parâmetro estiver vazio, usa o ID (para não perder o elemento)
+        if not chave: chave = str(el.Id)
     
-    if chave not in chaves_vistas:
-        chaves_vistas.append(chave)
-        elementos_unicos.append(item)
-    else:
-        # Pula silenciosamente pois é duplicata
-        pass
+        if chave not in chaves_vistas:
+            chaves_vistas.append(chave)
+            elementos_unicos.append(item)
+        else:
+            # Pula silenciosamente pois é duplicata
+            pass
 
 # PASSO 4: TIPO DE VISTA
 view_types = {}
-for v in FilteredElementCollector(doc).OfClass(ViewFamilyType).ToElements():
-    if v.ViewFamily == ViewFamily.Section:
-        name = Element.Name.GetValue(v)
-        if name: view_types[name] = v
+with PROFILER.phase(COLLECTION):
+    for v in FilteredElementCollector(doc).OfClass(ViewFamilyType).ToElements():
+        if v.ViewFamily == ViewFamily.Section:
+            name = Element.Name.GetValue(v)
+            if name: view_types[name] = v
 
 tipo_vista_nome = forms.SelectFromList.show(sorted(view_types.keys()), title="Tipo de Vista", button_name="Confirmar")
 if not tipo_vista_nome: script.exit()
@@ -285,34 +285,34 @@ if not template_id_final:
         if res_t and res_t != '(Nenhum)': template_id_final = templates[res_t]
 
 # PASSO 6: EXECUÇÃO DOS ÚNICOS
-t = DB.Transaction(doc, "NnBim: V4.4 Gerar Vistas Típicas")
-t.Start()
 count = 0
-
-for item in elementos_unicos:
-    try:
-        el, trans = item[0], item[1]
-        props = ElementProperties(el, transform=trans)
-        if not props.width: continue
-
-        nome_parts = []
-        val1 = get_param_value(el, p1) # Já sabemos que é único
-        if not val1: val1 = str(el.Id)
-        nome_parts.append(clean_name(val1))
-
-        if p_opcionais:
-            for opt in p_opcionais:
-                val = get_param_value(el, opt)
-                if val: nome_parts.append(clean_name(val))
+with ef_Transaction(doc, "NnBim: V4.4 Gerar Vistas Típicas", exitscript=True):
+    for item in elementos_unicos:
+        try:
+            el, trans = item[0], item[1]
+            with PROFILER.phase(GEOMETRY):
+                props = ElementProperties(el, transform=trans)
+            if not props.width: continue
+
+            nome_parts = []
+            val1 = get_param_value(el, p1) # Já sabemos que é único
+            if not val1: val1 = str(el.Id)
+            nome_parts.append(clean_name(val1))
+
+            if p_opcionais:
+                for opt in p_opcionais:
+                    val = get_param_value(el, opt)
+                    if val: nome_parts.append(clean_name(val))
         
-        nome_base = prefixo + separador_final.join(nome_parts)
+            nome_base = prefixo + separador_final.join(nome_parts)
         
-        gen = SectionGenerator(doc, props)
-        gen.generate(nome_base, view_type_obj.Id, template_id_final)
-        count += 1
-    except: pass
+            with PROFILER.phase(CREATION):
+                gen = SectionGenerator(doc, props)
+                gen.generate(nome_base, view_type_obj.Id, template_id_final)
+            count += 1
+        except: pass
 
-t.Commit()
+PROFILER.finish(show=EXEC_PARAMS.debug_mode)
 
 # Relatório Final Inteligente
 economizados = len(elementos_brutos) - count
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+__title__   = "Matriz de\nRevisões"
+__doc__     = "Aplica uma matriz de Folhas x Revisões (CSV/Excel) às folhas do projeto em uma única transação."
+__author__  = "Nívea Lopes - NnBim"
+__version__ = "1.0.0"
+
+# --- Importações Padrão ---
+import datetime
+from pyrevit import forms, revit, script
+
+from Snippets._revisions import read_revision_matrix, apply_revision_matrix
+
+# Variáveis Globais Úteis
+doc    = revit.doc
+output = script.get_output()
+
+# --- Início da Lógica ---
+
+# 1. Planilha
+# Primeira linha: (qualquer) | Descrição Rev 1 | Descrição Rev 2 | ...
+# Demais linhas:  Nº da Folha | x              |                 | ...
+path = forms.pick_file(files_filter="Matriz de Revisões (*.csv;*.xlsx;*.xls)|*.csv;*.xlsx;*.xls")
+if not path: script.exit()
+
+try:
+    descriptions, issues = read_revision_matrix(path)
+except Exception as e:
+    forms.alert("Não foi possível ler a matriz:\n{}".format(e), exitscript=True)
+
+if not descriptions or not issues:
+    forms.alert("A matriz não tem revisões ou folhas.", exitscript=True)
+
+# 2. Opções
+date = forms.ask_for_string(default=datetime.date.today().strftime("%d/%m/%Y"),
+                            prompt="Data das revisões novas (que ainda não existem no projeto)")
+if date is None: script.exit()
+
+replace = forms.alert("Remover das folhas as revisões da matriz que não estão marcadas?",
+                      sub_msg="Revisões que não estão na matriz são sempre mantidas.",
+                      yes=True, no=True)
+
+# 3. Aplicar (uma transação, um SetAdditionalRevisionIds por folha)
+report = apply_revision_matrix(doc, descriptions, issues, date=date, replace=replace,
+                               transaction_name="Nn | Matriz de Revisões")
+
+# 4. Relatório
+output.print_md("## Matriz de Revisões")
+output.print_md("**Revisões criadas:** {}".format(", ".join(report['created']) or "-"))
+output.print_md("**Folhas atualizadas:** {}".format(len(report['updated'])))
+output.print_md("**Folhas sem alteração:** {}".format(len(report['unchanged'])))
+if report['missing']:
+    output.print_md("**Folhas não encontradas:** {}".format(", ".join(report['missing'])))
+for sheet_number, reason in report['failed']:
+    output.print_md("**Erro na folha {}:** {}".format(sheet_number, reason))
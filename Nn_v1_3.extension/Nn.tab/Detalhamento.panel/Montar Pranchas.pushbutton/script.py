@@ -16,11 +16,17 @@ from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import *
 
 # Imports do pyRevit
-from pyrevit import forms, revit, script
+from pyrevit import forms, revit, script, EXEC_PARAMS
 
 doc = revit.doc
 uidoc = revit.uidoc
 
+# Tempo por fase (relatorio com Ctrl+Clique, JSONL sempre)
+from Snippets._profiling import (get_profiler, SELECTION, COLLECTION, DEDUP, GEOMETRY, CREATION, LAYOUT,
+                                 VIEWPORTS, API_CALLS)
+from Snippets._context_manager import ef_Transaction
+PROFILER = get_profiler('Montar Pranchas')
+
 # --- 1. CONFIGURACOES & CALIBRACAO (Milimetros) ---
 
 # [GAPS INTERNOS DO GRUPO]
@@ -40,8 +46,16 @@ CFG_MARGIN_RIGHT = 15 # Margem direita
 # Altura livre reservada na parte de baixo da folha para tabelas inseridas manualmente
 CFG_TABLE_ZONE_HEIGHT = 100 
 
-# Fator de Conversao (Mm -> Feet)
-MM_TO_FT = 0.00328084
+# Conversao (Mm -> Feet) feita uma unica vez com os fatores da lib NnBim
+from Snippets._convert import to_internal
+
+(GAP_INT_X_FT, GAP_INT_Y_FT,
+ GAP_GRID_X_FT, GAP_GRID_Y_FT,
+ MARGIN_LEFT_FT, MARGIN_TOP_FT, MARGIN_RIGHT_FT,
+ TABLE_ZONE_FT, TABLE_CLEARANCE_FT) = to_internal([CFG_GAP_INT_X, CFG_GAP_INT_Y,
+                                                   CFG_GAP_GRID_X, CFG_GAP_GRID_Y,
+                                                   CFG_MARGIN_LEFT, CFG_MARGIN_TOP, CFG_MARGIN_RIGHT,
+                                                   CFG_TABLE_ZONE_HEIGHT, 20], units='mm')
 
 # --- 2. FUNCOES BLINDADAS (Para Revit 2025 e anteriores) ---
 
@@ -106,6 +120,7 @@ class ViewGroup:
     def add_view(self, view, type_key):
         self.views[type_key] = view
 
+    @PROFILER.timed(GEOMETRY)
     def calculate_dimensions(self):
         ve = ViewAnalysis(self.views['Elevacao']) if self.views['Elevacao'] else None
         vc = ViewAnalysis(self.views['Corte']) if self.views['Corte'] else None
@@ -113,12 +128,12 @@ class ViewGroup:
         
         w_elev = ve.width if ve else 0
         w_corte = vc.width if vc else 0
-        gap_x = (CFG_GAP_INT_X * MM_TO_FT) if (ve and vc) else 0
+        gap_x = GAP_INT_X_FT if (ve and vc) else 0
         self.total_width = w_elev + gap_x + w_corte
         
         h_elev = ve.height if ve else 0
         h_planta = vp.height if vp else 0
-        gap_y = (CFG_GAP_INT_Y * MM_TO_FT) if (ve and vp) else 0
+        gap_y = GAP_INT_Y_FT if (ve and vp) else 0
         self.total_height = h_elev + gap_y + h_planta
         
         return ve, vc, vp
@@ -137,17 +152,18 @@ class SheetEngine:
         self.sheet_h = p_h.AsDouble() if p_h else 1.95
         
         # Define Area Util (Canvas)
-        self.min_x = CFG_MARGIN_LEFT * MM_TO_FT
-        self.max_x = self.sheet_w - (CFG_MARGIN_RIGHT * MM_TO_FT)
+        self.min_x = MARGIN_LEFT_FT
+        self.max_x = self.sheet_w - MARGIN_RIGHT_FT
         
-        self.max_y = self.sheet_h - (CFG_MARGIN_TOP * MM_TO_FT)
-        self.min_y = (CFG_TABLE_ZONE_HEIGHT * MM_TO_FT) + (20 * MM_TO_FT)
+        self.max_y = self.sheet_h - MARGIN_TOP_FT
+        self.min_y = TABLE_ZONE_FT + TABLE_CLEARANCE_FT
         
         self.cursor_x = self.min_x
         self.cursor_y = self.max_y
         self.row_max_h = 0.0
         self.current_sheet = None
 
+    @PROFILER.timed(CREATION)
     def create_sheet(self):
         s_num = "A-{:03d}".format(self.sheet_num_start)
         self.sheet_num_start += 1
@@ -177,7 +193,7 @@ class SheetEngine:
 
         # 2. Corte (Direita)
         if vc:
-            offset_x = (ve.width if ve else 0) + (CFG_GAP_INT_X * MM_TO_FT)
+            offset_x = (ve.width if ve else 0) + GAP_INT_X_FT
             cx = start_x + offset_x + (vc.width / 2)
             cy = start_y - (vc.height / 2)
             self._safe_create_viewport(sheet, group.views['Corte'], XYZ(cx, cy, 0))
@@ -185,12 +201,14 @@ class SheetEngine:
         # 3. Planta (Abaixo)
         if vp:
             cx = start_x + (vp.width / 2)
-            offset_y = (ve.height if ve else 0) + (CFG_GAP_INT_Y * MM_TO_FT)
+            offset_y = (ve.height if ve else 0) + GAP_INT_Y_FT
             cy = start_y - offset_y - (vp.height / 2)
             self._safe_create_viewport(sheet, group.views['Planta'], XYZ(cx, cy, 0))
 
+    @PROFILER.timed(VIEWPORTS)
     def _safe_create_viewport(self, sheet, view, center):
         try:
+            PROFILER.count(API_CALLS)
             Viewport.Create(doc, sheet.Id, view.Id, center)
         except: pass
 
@@ -203,7 +221,7 @@ class SheetEngine:
             # Checa Largura (Quebra de Linha)
             if (self.cursor_x + grp.total_width) > self.max_x:
                 self.cursor_x = self.min_x
-                self.cursor_y -= (self.row_max_h + (CFG_GAP_GRID_Y * MM_TO_FT))
+                self.cursor_y -= (self.row_max_h + GAP_GRID_Y_FT)
                 self.row_max_h = 0.0
             
             # Checa Altura (Quebra de Folha)
@@ -214,7 +232,7 @@ class SheetEngine:
             self.place_views_generic(self.current_sheet, grp, self.cursor_x, self.cursor_y, ve, vc, vp)
             
             # Avanca Cursor
-            self.cursor_x += grp.total_width + (CFG_GAP_GRID_X * MM_TO_FT)
+            self.cursor_x += grp.total_width + GAP_GRID_X_FT
             if grp.total_height > self.row_max_h:
                 self.row_max_h = grp.total_height
 
@@ -237,11 +255,13 @@ class SheetEngine:
 
 def main():
     # 1. Seleciona Vistas
-    sel_views = forms.select_views(title="Selecione Vistas", use_selection=True)
+    with PROFILER.phase(SELECTION):
+        sel_views = forms.select_views(title="Selecione Vistas", use_selection=True)
     if not sel_views: return
 
     # 2. Seleciona Carimbo
-    tblocks = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TitleBlocks).WhereElementIsElementType().ToElements()
+    with PROFILER.phase(COLLECTION):
+        tblocks = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TitleBlocks).WhereElementIsElementType().ToElements()
     if not tblocks: forms.alert("Sem Carimbos carregados.", exitscript=True)
     
     dict_tb = {}
@@ -274,31 +294,32 @@ def main():
     mode = ops[res_mode]
 
     # 4. Agrupamento Inteligente
-    groups = {} 
-    pattern = re.compile(r"(.+)[_ -](Planta|Corte|Elevacao|Elev|Section|Plan)", re.IGNORECASE)
+    with PROFILER.phase(DEDUP):
+        groups = {} 
+        pattern = re.compile(r"(.+)[_ -](Planta|Corte|Elevacao|Elev|Section|Plan)", re.IGNORECASE)
     
-    for v in sel_views:
-        # AQUI ESTA A CORRECAO:
-        if is_view_placed(v): 
-            # Pula vista se ja estiver em folha
-            continue
+        for v in sel_views:
+            # AQUI ESTA A CORRECAO:
+            if is_view_placed(v): 
+                # Pula vista se ja estiver em folha
+                continue
             
-        match = pattern.search(v.Name)
-        if match:
-            base = match.group(1).strip()
-            suf = match.group(2).lower()
-            if base not in groups: groups[base] = ViewGroup(base)
+            match = pattern.search(v.Name)
+            if match:
+                base = match.group(1).strip()
+                suf = match.group(2).lower()
+                if base not in groups: groups[base] = ViewGroup(base)
             
-            if "planta" in suf or "plan" in suf: groups[base].add_view(v, 'Planta')
-            elif "corte" in suf or "section" in suf: groups[base].add_view(v, 'Corte')
-            elif "elev" in suf: groups[base].add_view(v, 'Elevacao')
+                if "planta" in suf or "plan" in suf: groups[base].add_view(v, 'Planta')
+                elif "corte" in suf or "section" in suf: groups[base].add_view(v, 'Corte')
+                elif "elev" in suf: groups[base].add_view(v, 'Elevacao')
 
     if not groups:
         forms.alert("Nenhum grupo identificado ou vistas ja estao em folhas.")
         return
 
     # 5. Execucao
-    with revit.Transaction("NnBim V5.11 Layout"):
+    with PROFILER.phase(LAYOUT), ef_Transaction(doc, "NnBim V5.11 Layout", exitscript=True):
         engine = SheetEngine(tb_symbol)
         sorted_groups = [groups[k] for k in sorted(groups.keys())]
         
@@ -306,6 +327,7 @@ def main():
             engine.process_grid(sorted_groups)
         else:
             engine.process_centered(sorted_groups)
+    PROFILER.finish(show=EXEC_PARAMS.debug_mode)
 
     forms.alert("Sucesso! Pranchas geradas no modo {}.".format(mode))
 
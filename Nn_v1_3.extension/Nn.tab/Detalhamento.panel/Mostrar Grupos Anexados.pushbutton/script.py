@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+__title__   = "Mostrar Grupos\nAnexados"
+__doc__     = "Mostra os grupos de detalhe anexados escolhidos em todos os grupos de modelo das vistas selecionadas."
+__author__  = "Nívea Lopes - NnBim"
+__version__ = "1.0.0"
+
+# --- Importações Padrão ---
+from pyrevit import forms, revit, script
+
+from Snippets._groups import (get_attached_group_index, get_group_type_name,
+                              select_attached_groups, show_attached_groups_in_views)
+
+# Variáveis Globais Úteis
+doc    = revit.doc
+uidoc  = revit.uidoc
+output = script.get_output()
+
+# --- Início da Lógica ---
+
+# 1. Vistas
+views = forms.select_views(title="Vistas para mostrar grupos anexados") or []
+if not views: script.exit()
+
+# 2. Grupos de modelo visíveis nas vistas
+index  = get_attached_group_index(doc)
+groups = {g.Id.IntegerValue: g for view in views for g in index.get_groups_in_view(view)}
+if not groups:
+    forms.alert("Nenhum grupo de modelo encontrado nas vistas selecionadas.", exitscript=True)
+
+# 3. Grupos anexados
+attached_types = select_attached_groups(list(groups.values()), uidoc=uidoc,
+                                        title=__title__.replace("\n", " "),
+                                        label="Grupos anexados para mostrar:",
+                                        version="Version: {}".format(__version__),
+                                        exit_if_none=True)
+names = [get_group_type_name(group_type) for group_type in attached_types]
+
+# 4. Mostrar (uma transação para todas as vistas)
+counts = show_attached_groups_in_views(views, names, uidoc=uidoc,
+                                       transaction_name="Nn | Mostrar Grupos Anexados")
+
+# 5. Relatório
+output.print_md("## Mostrar Grupos Anexados: {}".format(", ".join(names)))
+output.print_table(table_data=[[view.Name, n_shown, len(failed)] for view, n_shown, failed in counts],
+                   columns=["Vista", "Grupos mostrados", "Falhas"])
+for view, n_shown, failed in counts:
+    for group, reason in failed:
+        output.print_md("**Falha na vista {} (grupo {}):** {}".format(view.Name, output.linkify(group.Id), reason))
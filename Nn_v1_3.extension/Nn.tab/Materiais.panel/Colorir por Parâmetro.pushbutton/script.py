@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+__title__   = "Colorir por\nParâmetro"
+__doc__     = "Colore elementos pelo valor de um parâmetro com um filtro de vista por valor ou faixa numérica."
+__author__  = "Nívea Lopes - NnBim"
+__version__ = "1.0.0"
+
+# --- Importações Padrão ---
+from Autodesk.Revit.DB import FilteredElementCollector, CategoryType
+from pyrevit import forms, revit, script
+
+from Snippets._colors        import parse_rgb
+from Snippets._color_filters import ColorByParameter, MAX_BUCKETS, AUTO_RANGES, OTHER_VALUE
+
+# Variáveis Globais Úteis
+doc         = revit.doc
+uidoc       = revit.uidoc
+active_view = doc.ActiveView
+output      = script.get_output()
+
+# --- Início da Lógica ---
+
+# 1. Categorias (da seleção ou dos elementos visíveis na vista ativa)
+selection = [doc.GetElement(e_id) for e_id in uidoc.Selection.GetElementIds()]
+elements  = selection or FilteredElementCollector(doc, active_view.Id).WhereElementIsNotElementType()
+
+categories = {}     # {nome: (categoria, primeiro elemento)}
+for el in elements:
+    cat = el.Category
+    if cat and cat.CategoryType == CategoryType.Model and cat.Name not in categories:
+        categories[cat.Name] = (cat, el)
+
+if not categories:
+    forms.alert("Nenhum elemento de modelo encontrado na seleção ou na vista ativa.", exitscript=True)
+
+cat_names = forms.SelectFromList.show(sorted(categories), title="Categorias", multiselect=True)
+if not cat_names: script.exit()
+
+# 2. Parâmetro (de instância ou de tipo)
+param_names = set()
+for name in cat_names:
+    el = categories[name][1]
+    el_type = doc.GetElement(el.GetTypeId())
+    for e in (el, el_type):
+        if e:
+            param_names.update(p.Definition.Name for p in e.Parameters)
+
+param_name = forms.SelectFromList.show(sorted(param_names), title="Parâmetro", multiselect=False)
+if not param_name: script.exit()
+
+painter = ColorByParameter(doc, [categories[name][0].Id for name in cat_names], param_name,
+                           view=None if selection else active_view)
+if not painter.values:
+    forms.alert("Nenhum elemento tem o parâmetro '{}'.".format(param_name), exitscript=True)
+if not painter.is_filterable:
+    forms.alert("O parâmetro '{}' não pode ser usado em filtros de vista de todas as categorias escolhidas: {}.\n"
+                "Escolha outro parâmetro ou menos categorias.".format(param_name, ', '.join(cat_names)),
+                exitscript=True)
+
+# 3. Faixas numéricas (somente parâmetros numéricos)
+n_ranges = None
+if painter.is_numeric and forms.alert("Dividir os valores em faixas numéricas?", yes=True, no=True):
+    n_str = forms.ask_for_string(default="5", prompt="Quantidade de faixas (2 a {})".format(MAX_BUCKETS))
+    try:
+        n_ranges = int(n_str)
+        if n_ranges < 2 or n_ranges > MAX_BUCKETS: raise ValueError
+    except:
+        forms.alert("Quantidade de faixas inválida. Informe um inteiro entre 2 e {}.".format(MAX_BUCKETS),
+                    exitscript=True)
+
+# 4. Cores
+rgb_a = forms.ask_for_string(default="85,107,47", prompt="Cor A (início do degradê) — RGB (R,G,B) ou #HEX")
+rgb_b = forms.ask_for_string(default="205,236,203", prompt="Cor B (fim do degradê) — RGB (R,G,B) ou #HEX")
+if rgb_a is None or rgb_b is None: script.exit()
+try:
+    cA, cB = parse_rgb(rgb_a), parse_rgb(rgb_b)
+except Exception as ex:
+    forms.alert("Entrada inválida: %s" % ex, exitscript=True)
+
+buckets = painter.make_buckets(cA, cB, n_ranges)
+
+# Limite de filtros: muitos valores únicos viram faixas ou o grupo "outros"
+notes = []
+if painter.forced_ranges:
+    notes.append("O parâmetro tem mais de {} valores únicos; os valores foram divididos em {} faixas."
+                 .format(MAX_BUCKETS, AUTO_RANGES))
+if painter.pooled:
+    notes.append("O parâmetro tem mais de {} valores únicos; {} valores menos frequentes foram agrupados em '{}'."
+                 .format(MAX_BUCKETS, painter.pooled, OTHER_VALUE))
+if notes and not forms.alert("\n".join(notes) + "\nContinuar?", yes=True, no=True):
+    script.exit()
+
+# 5. Vistas
+if forms.alert("Aplicar somente na vista ativa?", yes=True, no=True):
+    views = [active_view]
+else:
+    views = forms.select_views(title="Vistas para colorir") or []
+if not views: script.exit()
+
+# 6. Aplicar (uma transação, um filtro por valor/faixa)
+report = painter.apply(views, transaction_name="Nn | Colorir por Parâmetro")
+
+# 7. Relatório
+output.print_md("## Colorir por Parâmetro: {}".format(param_name))
+for bucket in buckets:
+    output.print_md("- **{}** ({} elementos) RGB {},{},{}".format(bucket.label, bucket.count, *bucket.color))
+output.print_md("**Vistas:** {} | **Filtros aplicados:** {} | **Filtros antigos removidos:** {}".format(
+    len(views), report['filters'], report['removed']))
+for note in notes:
+    output.print_md("**Aviso:** {}".format(note))
+for view, reason in report['failed']:
+    output.print_md("**Erro na vista {}:** {}".format(view.Name, reason))
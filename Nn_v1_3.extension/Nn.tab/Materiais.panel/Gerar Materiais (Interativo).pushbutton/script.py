@@ -2,12 +2,20 @@
 __title__ = "Gerar Materiais\n(Interativo)"
 __doc__ = "Pede prefixo, paleta, quantidade de tons (N), Cor A, Cor B e percentual de branco para um material cinza. Cria N materiais do degradê + 1 cinza (Shaded)."
 
-from Autodesk.Revit.DB import (FilteredElementCollector, Material, Color, Transaction)
+from Autodesk.Revit.DB import (FilteredElementCollector, Material, Color, ViewType)
 from Autodesk.Revit.UI import TaskDialog
-from pyrevit import forms
+from pyrevit import forms, EXEC_PARAMS
+
+from Snippets._legend    import LegendBuilder, LegendRow
+from Snippets._colors    import parse_rgb, gradient
+from Snippets._profiling import get_profiler, COLLECTION, CREATION, LAYOUT
+from Snippets._context_manager import ef_Transaction
 
 doc = __revit__.ActiveUIDocument.Document
 
+# Tempo por fase (relatório com Ctrl+Clique, JSONL sempre)
+PROFILER = get_profiler('Gerar Materiais')
+
 # ----------------- helpers -----------------
 def sanitize(name):
     """Substitui caracteres problemáticos para nomes de material/Revit ribbon."""
@@ -17,39 +25,14 @@ def sanitize(name):
     name = name.strip()
     return name
 
-def parse_rgb(s):
-    if s is None: raise ValueError("RGB vazio")
-    s = s.strip()
-    # HEX: #RRGGBB
-    if s.startswith("#") and len(s)==7:
-        h = s[1:].upper()
-        try:
-            r = int(h[0:2],16); g = int(h[2:4],16); b = int(h[4:6],16)
-            return (r,g,b)
-        except:
-            raise ValueError("HEX inválido. Use #RRGGBB.")
-    # "R,G,B"
-    parts = s.replace(" ","").split(",")
-    if len(parts)==3:
-        try:
-            r = int(parts[0]); g = int(parts[1]); b = int(parts[2])
-        except:
-            raise ValueError("RGB inválido. Use 255,114,16.")
-        for v in (r,g,b):
-            if v<0 or v>255: raise ValueError("Valores RGB devem estar entre 0 e 255.")
-        return (r,g,b)
-    raise ValueError("Formato inválido. Use 255,114,16 ou #FF7210.")
-
 def ensure_material(name):
-    for m in FilteredElementCollector(doc).OfClass(Material):
-        if m.Name == name:
-            return m
+    with PROFILER.phase(COLLECTION):
+        for m in FilteredElementCollector(doc).OfClass(Material):
+            if m.Name == name:
+                return m
     mid = Material.Create(doc, name)
     return doc.GetElement(mid)
 
-def lerp(a,b,t): 
-    return int(round(a + (b-a)*t))
-
 # ----------------- inputs -----------------
 prefix = forms.ask_for_string(default="ARQ_Brise", prompt="Prefixo dos materiais (ex.: ARQ_Brise)")
 if prefix is None: raise SystemExit
@@ -88,36 +71,50 @@ except Exception as ex:
 pad = 2 if N <= 99 else 3
 
 # ----------------- create materials -----------------
-t = Transaction(doc, "Nn | Materiais (Interativo)")
-t.Start()
-
-# Gradient A->B
-for i in range(N):
-    tv = 0.0 if N==1 else float(i)/(N-1)
-    r = lerp(cA[0], cB[0], tv)
-    g = lerp(cA[1], cB[1], tv)
-    b = lerp(cA[2], cB[2], tv)
-    name = "%s_%s_%s" % (prefix, palette, str(i+1).zfill(pad))
-    m = ensure_material(name)
-    m.Color = Color(r,g,b)
+with PROFILER.phase(CREATION), ef_Transaction(doc, "Nn | Materiais (Interativo)", exitscript=True):
+    legend_rows = []   # (nome, (r,g,b)) para a legenda opcional
+
+    # Gradient A->B
+    for i, (r, g, b) in enumerate(gradient(cA, cB, N)):
+        name = "%s_%s_%s" % (prefix, palette, str(i+1).zfill(pad))
+        m = ensure_material(name)
+        m.Color = Color(r,g,b)
+        legend_rows.append((name, (r,g,b)))
+        try:
+            m.UseRenderAppearanceForShading = False
+        except:
+            pass
+
+    # Gray material from % white
+    gray_name = "%s_%s_Cinza_g%s" % (prefix, palette, str(gval).zfill(3))
+    mg = ensure_material(gray_name)
+    mg.Color = Color(cG[0], cG[1], cG[2])
+    legend_rows.append((gray_name, cG))
     try:
-        m.UseRenderAppearanceForShading = False
+        mg.UseRenderAppearanceForShading = False
     except:
         pass
 
-# Gray material from % white
-gray_name = "%s_%s_Cinza_g%s" % (prefix, palette, str(gval).zfill(3))
-mg = ensure_material(gray_name)
-mg.Color = Color(cG[0], cG[1], cG[2])
-try:
-    mg.UseRenderAppearanceForShading = False
-except:
-    pass
-
-t.Commit()
+# ----------------- legend (opcional) -----------------
+LEGEND_VIEW_TYPES = [ViewType.DraftingView, ViewType.Legend, ViewType.FloorPlan,
+                     ViewType.CeilingPlan, ViewType.Section, ViewType.Elevation, ViewType.Detail]
+legend_msg = ""
+view = doc.ActiveView
+if forms.alert("Criar legenda dos materiais na vista ativa?", yes=True, no=True):
+    if view.ViewType not in LEGEND_VIEW_TYPES:
+        forms.alert("A vista ativa não aceita elementos de detalhe. Abra uma vista de desenho ou legenda.")
+    else:
+        rows = [LegendRow([name, "%d,%d,%d" % rgb], color=rgb) for name, rgb in legend_rows]
+        with PROFILER.phase(LAYOUT), ef_Transaction(doc, "Nn | Legenda de Materiais", exitscript=True):
+            LegendBuilder(doc, view, column_widths=[8.0, 3.0]).build(
+                rows, header=LegendRow(["Material", "RGB"], bold=True),
+                transaction_name="Nn | Legenda de Materiais")
+        legend_msg = "\nLegenda: %d linhas na vista '%s'" % (len(rows), view.Name)
+
+PROFILER.finish(show=EXEC_PARAMS.debug_mode)
 
 # Summary
 msg = "Criados/atualizados %d materiais do degradê %s→%s\nNome base: %s_%s_XX (padding %d)\nCinza: %s (%%branco=%.1f%%, RGB %d,%d,%d)" % (
     N, str(cA), str(cB), prefix, palette, pad, gray_name, P, cG[0], cG[1], cG[2]
-)
+) + legend_msg
 TaskDialog.Show("Nn | Gerar Materiais (Interativo)", msg)
@@ -16,7 +16,8 @@ from Autodesk.Revit.DB import ( Transaction,
 from Autodesk.Revit.Exceptions import ArgumentException
 
 #CUSTOM
-from GUI.forms import my_WPF
+from GUI.forms          import my_WPF
+from GUI.RenamePreview  import RenamePreview
 
 # .NET IMPORTS
 from clr import AddReference
@@ -38,15 +39,16 @@ PATH_SCRIPT = os.path.dirname(__file__)
 # ║║║╠═╣║║║║
 # ╩ ╩╩ ╩╩╝╚╝MAIN
 #====================================================================================================
-class FindReplace(my_WPF):
-    """GUI for [Views: Find and Replace]"""
-    run = False
-
-    def __init__(self, title, label = "Find and Replace", button_name = "Rename"):
-        self.add_wpf_resource()
-
-        path_xaml_file = os.path.join(PATH_SCRIPT, 'FindReplace.xaml')
-        wpf.LoadComponent(self, path_xaml_file)
+class FindReplace(RenamePreview, my_WPF):
+    """GUI for [Views: Find and Replace]
+    If elements are given, new names are previewed live and applied on <Rename> in a single Transaction."""
+    run      = False
+    counters = {}
+
+    def __init__(self, title, label = "Find and Replace", button_name = "Rename", elements = None, doc = None):
+        self.load_xaml(os.path.join(PATH_SCRIPT, 'FindReplace.xaml'))
+        if elements:
+            self.start_preview(doc or __revit__.ActiveUIDocument.Document, elements)
         # self.form = forms.WPFWindow.__init__(self, path_xaml_file)
 
         self.UI_label.Content       = label
@@ -99,5 +101,7 @@ class FindReplace(my_WPF):
 
     def button_run(self, sender, e):
         """Button action: Rename view with given """
-        # view_rename(selected_views,self.find,self.replace, self.prefix, self.suffix)
+        self.run = True
+        if self.plan:
+            self.counters = self.apply_renames(transaction_name=self.main_title.Text)
         self.Close()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+#====================================================================================================
+import re
+
+# Custom Imports
+from Snippets._rename import RenamePlan, RenameRule, OK, UNCHANGED
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System                     import TimeSpan
+from System.Windows.Threading   import DispatcherTimer
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+#====================================================================================================
+PREVIEW_DELAY_MS = 150      # Preview is updated when user stops typing for this long.
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+#====================================================================================================
+class RenamePreview(object):
+    """Mixin for Find/Replace windows: live preview of old -> new names and bulk apply.
+    Window XAML has to define: input_find, input_replace, input_prefix, input_suffix,
+    UI_regex (CheckBox), UI_preview (ListView) and UI_counters (TextBlock),
+    and call preview_updated on TextChanged/Checked/Unchecked."""
+    plan = None     #type: RenamePlan
+
+    def start_preview(self, doc, elements):
+        """Function to index existing names once and show the first preview."""
+        self.preview_timer           = DispatcherTimer()
+        self.preview_timer.Interval  = TimeSpan.FromMilliseconds(PREVIEW_DELAY_MS)
+        self.preview_timer.Tick     += self.show_preview
+
+        self.plan = RenamePlan(doc, elements, RenameRule())
+        self.show_preview()
+
+    def get_rule(self):
+        #type:() -> RenameRule
+        return RenameRule(find    = self.input_find.Text,
+                          replace = self.input_replace.Text,
+                          prefix  = self.input_prefix.Text,
+                          suffix  = self.input_suffix.Text,
+                          regex   = bool(self.UI_regex.IsChecked))
+
+    # ╔═╗╦ ╦╦  ╔═╗╦  ╦╔═╗╔╗╔╔╦╗╔═╗
+    # ║ ╦║ ║║  ║╣ ╚╗╔╝║╣ ║║║ ║ ╚═╗
+    # ╚═╝╚═╝╩  ╚═╝ ╚╝ ╚═╝╝╚╝ ╩ ╚═╝ GUI EVENTS
+    #==================================================
+    def preview_updated(self, sender, e):
+        """Debounced preview update - restarts the timer on every change."""
+        if self.plan:
+            self.preview_timer.Stop()
+            self.preview_timer.Start()
+
+    def show_preview(self, sender=None, e=None):
+        """Function to recompute new names and update preview and counters."""
+        if not self.plan:
+            return
+        self.preview_timer.Stop()
+
+        try:
+            rule = self.get_rule()
+        except re.error as err:
+            self.UI_counters.Text = 'Invalid regular expression: {}'.format(err)
+            return
+
+        self.plan.update(rule)
+
+        # Problems first, then renamed, unchanged last.
+        order = lambda row: (row.Status == UNCHANGED, row.Status == OK)
+        self.UI_preview.ItemsSource = sorted(self.plan.rows, key=order)
+        self.UI_counters.Text       = self.format_counters(self.plan.counters)
+
+    @staticmethod
+    def format_counters(counters):
+        #type:(dict) -> str
+        """{'OK': 10, 'Duplicate': 2} -> 'To rename: 10 | Duplicate: 2'"""
+        parts = ['To rename: {}'.format(counters.get(OK, 0))]
+        parts += ['{}: {}'.format(status, n) for status, n in sorted(counters.items()) if status != OK]
+        return ' | '.join(parts)
+
+    def apply_renames(self, transaction_name='Rename Elements'):
+        #type:(str) -> dict
+        """Function to apply current preview in a single Transaction.
+        :return: counters after renaming"""
+        if not self.plan:
+            return {}
+        self.show_preview()
+        counters = self.plan.apply(transaction_name)
+        self.UI_counters.Text = self.format_counters(counters)
+        return counters
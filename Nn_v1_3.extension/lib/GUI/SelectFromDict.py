@@ -10,14 +10,20 @@ import os
 from pyrevit import forms # Needed for wpf import to work.
 
 # Custom Imports
-from GUI.forms import my_WPF
+from GUI.forms        import my_WPF
+from Snippets._search import SearchIndex
 
 #>>>>>>>>>> .NET IMPORTS
 import clr
 clr.AddReference("System.Windows.Forms")
 clr.AddReference("System")
-from System.Collections.Generic import List
-from System.Windows             import Visibility
+from System.Collections.Generic      import List
+from System.Collections.ObjectModel  import ObservableCollection
+from System.Windows                  import Visibility
+from System.Windows.Data             import CollectionViewSource
+from System.Windows.Threading        import DispatcherTimer, DispatcherPriority
+from System                          import TimeSpan, Predicate, Object, Action
+from System.Collections              import IComparer
 import wpf
 
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
@@ -34,12 +40,41 @@ active_view_id      = doc.ActiveView.Id
 active_view         = doc.GetElement(active_view_id)
 active_view_level   = active_view.GenLevel
 
-class ListItem:
-    """Helper Class for displaying selected sheets in my custom GUI."""
-    def __init__(self,  Name='Unnamed', element = None, checked = False):
+FILTER_DELAY_MS     = 200   # Filter is applied when user stops typing for this long.
+LOAD_CHUNK_SIZE     = 500   # Items added to the ListBox per Dispatcher call while loading.
+SEARCH_LIMIT        = 1000  # Filtered list shows only this many best matches (Select All checks all of them).
+
+class ListItem(forms.Reactive):
+    """Helper Class for displaying selected sheets in my custom GUI.
+    IsChecked notifies the ListBox on change, so items never need to be re-added to refresh checkboxes."""
+    def __init__(self,  Name='Unnamed', element = None, checked = False, index = 0):
         self.Name       = Name
-        self.IsChecked  = checked
+        self.index      = index             # Position in SearchIndex
         self.element    = element
+        self._checked   = checked
+
+    @forms.reactive
+    def IsChecked(self):
+        return self._checked
+
+    @IsChecked.setter
+    def IsChecked(self, value):
+        self._checked = value
+
+
+class RankComparer(IComparer):
+    """CustomSort of the filtered view - best search match first."""
+    def __init__(self, ranks):
+        self.ranks = ranks
+
+    def Compare(self, x, y):
+        return cmp(self.ranks[x.index], self.ranks[y.index])
+
+
+class NameComparer(IComparer):
+    """CustomSort of the unfiltered view - by Name (items may arrive in any order while loading)."""
+    def Compare(self, x, y):
+        return cmp(x.Name, y.Name)
 
 # ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
 # ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
@@ -52,15 +87,19 @@ class SelectFromDict(my_WPF):
                  button_name = 'Select',
                  version = 'version= 1.0',
                  SelectMultiple = True):
+        """:param items: dict {name: element} or an iterable/generator of (name, element) pairs.
+                      Pairs are pulled in chunks after the window is shown."""
         self.SelectMultiple = SelectMultiple
-        self.given_dict_items = {k:v for k,v in items.items() if k}
+        self.given_items    = iter(items.items() if isinstance(items, dict) else items)
 
-        self.items          = self.generate_list_items()
+        self.items          = ObservableCollection[ListItem]()
         self.selected_items = []
-        #>>>>>>>>>> SET RESOURCES FOR WPF
-        self.add_wpf_resource()
-        path_xaml_file = os.path.join(PATH_SCRIPT, 'SelectFromDict.xaml')
-        wpf.LoadComponent(self, path_xaml_file )
+        self.filter_keyword = ''
+        self.ranks          = None      # {ListItem.index: rank} of current filter
+        self.search_index   = SearchIndex()
+        self.loading        = True
+        #>>>>>>>>>> SET RESOURCES AND LOAD WPF
+        self.load_xaml(os.path.join(PATH_SCRIPT, 'SelectFromDict.xaml'))
 
         # UPDATE GUI ELEMENTS
         self.main_title.Text        = title
@@ -71,23 +110,75 @@ class SelectFromDict(my_WPF):
             self.UI_Buttons_all_none.Visibility = Visibility.Collapsed
 
 
-        self.main_ListBox.ItemsSource = self.items
+        #>>>>>>>>>> FILTERED VIEW + DEBOUNCE
+        # ListBox is bound once to the default CollectionView of self.items,
+        # filtering only refreshes that view (items and containers are reused).
+        self.items_view             = CollectionViewSource.GetDefaultView(self.items)
+        self.items_view.Filter      = Predicate[Object](self.filter_item)
+        self.items_view.CustomSort  = NameComparer()
+        self.main_ListBox.ItemsSource = self.items_view
+
+        self.filter_timer           = DispatcherTimer()
+        self.filter_timer.Interval  = TimeSpan.FromMilliseconds(FILTER_DELAY_MS)
+        self.filter_timer.Tick     += self.apply_filter
+
+        #>>>>>>>>>> LOAD ITEMS IN BACKGROUND
+        # Window is shown right away; chunks are added between UI events (Background priority),
+        # so typing and filtering stay responsive while items keep loading.
+        self.UI_loading.Visibility = Visibility.Visible
+        self.Closed += self.window_closed
+        self.schedule_next_chunk()
         self.ShowDialog()
 
     def __iter__(self):
         """Return selected items."""
         return iter(self.selected_items )
 
-    def generate_list_items(self):
-        """Function to create a ICollection to pass to ListBox in GUI"""
+    def schedule_next_chunk(self):
+        self.Dispatcher.BeginInvoke(DispatcherPriority.Background, Action(self.load_next_chunk))
+
+    def load_items(self, limit=None):
+        #type:(int) -> bool
+        """Function to add up to limit items to the ListBox (all remaining items if None).
+        :return: True if all items are loaded."""
+        n_loaded = 0
+        for name, element in self.given_items:
+            if not name:
+                continue
+            index = self.search_index.add(name)
+            self.items.Add(ListItem(name, element, index=index))
+            n_loaded += 1
+            if limit and n_loaded >= limit:
+                return False
+        return True
+
+    def load_next_chunk(self):
+        """Function to add next LOAD_CHUNK_SIZE items to the ListBox."""
+        if not self.loading:
+            return
+
+        if self.load_items(LOAD_CHUNK_SIZE):
+            self.finish_loading()
+        else:
+            self.UI_loading.Content = 'Loading... {}'.format(self.items.Count)
+            self.schedule_next_chunk()
 
-        list_of_items = List[type(ListItem())]()
-        first = True
-        for type_name, floor_type in sorted(self.given_dict_items.items()):
-            checked = True if first else False
-            first = False
-            list_of_items.Add(ListItem(type_name, floor_type))
-        return list_of_items
+    def load_all(self):
+        """Function to load remaining items right away (e.g. before Select All)."""
+        if self.loading:
+            self.load_items()
+            self.finish_loading()
+
+    def finish_loading(self):
+        """Items loaded while a filter is active are ranked once here, not per chunk."""
+        self.loading = False
+        self.UI_loading.Visibility = Visibility.Collapsed
+        if self.filter_keyword:
+            self.update_ranks()
+
+    def filter_item(self, item):
+        """Predicate of items_view. Keeps items found by SearchIndex."""
+        return self.ranks is None or item.index in self.ranks
 
 
 
@@ -102,33 +193,48 @@ class SelectFromDict(my_WPF):
     # ╚═╝╚═╝╩  ╚═╝ ╚╝ ╚═╝╝╚╝ ╩ ╚═╝ GUI EVENTS
     #==================================================
     def text_filter_updated(self, sender, e):
-        """Function to filter items in the main_ListBox."""
-        filtered_list_of_items = List[type(ListItem())]()
-        filter_keyword = self.textbox_filter.Text
-
-        #RESTORE ORIGINAL LIST
-        if not filter_keyword:
-            self.main_ListBox.ItemsSource = self.items
-
+        """Function to filter items in the main_ListBox (debounced - restarts the timer on every keystroke)."""
+        self.filter_timer.Stop()
+        self.filter_timer.Start()
+
+    def apply_filter(self, sender=None, e=None):
+        """Refresh filtered view with current filter keyword."""
+        self.filter_timer.Stop()
+        keyword = self.textbox_filter.Text.strip().lower()
+        if keyword == self.filter_keyword:
             return
-
-        # FILTER ITEMS
-        for item in self.items:
-            if filter_keyword.lower() in item.Name.lower():
-                filtered_list_of_items.Add(item)
-
-        # UPDATE LIST OF ITEMS
-        self.main_ListBox.ItemsSource = filtered_list_of_items
-
+        self.filter_keyword = keyword
+
+        self.update_ranks()
+
+    def update_ranks(self):
+        """Rank items for current filter keyword. Changing CustomSort refreshes the view (Filter + order)."""
+        if self.filter_keyword:
+            self.ranks                  = self.search_index.rank(self.filter_keyword, SEARCH_LIMIT)
+            self.items_view.CustomSort  = RankComparer(self.ranks)
+        else:
+            self.ranks                  = None
+            self.items_view.CustomSort  = NameComparer()
+
+        # Tell user that the list is cut (Select All still checks every match).
+        if not self.loading:
+            truncated = self.ranks is not None and len(self.ranks) >= SEARCH_LIMIT
+            self.UI_loading.Content     = 'Showing {} best matches'.format(SEARCH_LIMIT)
+            self.UI_loading.Visibility  = Visibility.Visible if truncated else Visibility.Collapsed
+
+    def window_closed(self, sender, e):
+        """Stop loading and filtering when window is closed (Select or X button).
+        Queued chunks must not read Revit elements after ShowDialog returns."""
+        self.loading = False
+        self.filter_timer.Stop()
 
     def UIe_ItemChecked(self, sender, e):
         # SINGLE SELECTIOn
         if not self.SelectMultiple:
-            filtered_list_of_items = List[type(ListItem())]()
-            for item in self.main_ListBox.Items:
-                item.IsChecked = True if item.Name == sender.Content.Text else False
-                filtered_list_of_items.Add(item)
-            self.main_ListBox.ItemsSource = filtered_list_of_items
+            checked_item = sender.DataContext
+            for item in self.items:
+                if item.IsChecked and item is not checked_item:
+                    item.IsChecked = False
 
     # ╔╗ ╦ ╦╔╦╗╔╦╗╔═╗╔╗╔╔═╗
     # ╠╩╗║ ║ ║  ║ ║ ║║║║╚═╗
@@ -139,13 +245,18 @@ class SelectFromDict(my_WPF):
         - button_select_all
         - button_select_none"""
 
-        list_of_items = List[type(ListItem())]()
         checked = True if mode=='all' else False
-        for item in self.main_ListBox.ItemsSource:
-            item.IsChecked = checked
-            list_of_items.Add(item)
-
-        self.main_ListBox.ItemsSource = list_of_items
+        if checked:
+            self.load_all()             # Select All includes items that are not loaded yet
+
+        if self.filter_keyword:
+            # Every match, not only the SEARCH_LIMIT best ones shown in the list.
+            # Items are added in SearchIndex order, so a position is also the index in self.items.
+            for n in self.search_index.search(self.filter_keyword):
+                self.items[n].IsChecked = checked
+        else:
+            for item in self.items:
+                item.IsChecked = checked
 
     def button_select_all(self, sender, e):
         """ """
@@ -157,17 +268,9 @@ class SelectFromDict(my_WPF):
 
     def button_select(self, sender, e):
         """Button to finilize selection"""
-        # Reset Filter
-        self.textbox_filter.Text = ''
         self.Close()
 
-
-
-        selected_items = []
-        for item in self.main_ListBox.ItemsSource:
-            if item.IsChecked:
-                selected_items.append(item.element)
-        self.selected_items = selected_items
+        self.selected_items = [item.element for item in self.items if item.IsChecked]
 
 
 
@@ -186,6 +289,7 @@ def select_from_dict(elements_dict,
     """Function to present a DialogBox to a user to select elements from the list based on the dict keys.
     :param elements_dict:   Dictonary or list of elements {name : element}.
                                 if list is provided it will be converted to dict {i:i}.
+                                Generator of (name, element) pairs is loaded while the window is open.
     :param title:           Title of the window.
     :param label:           Label that is displayed above ListBox
     :param button_name:     Text in Button
@@ -193,9 +297,9 @@ def select_from_dict(elements_dict,
     :param SelectMultiple:  By default it allows multiple selection. Set False if you need only single item selection.
     :return:                Selected elements. (dict values)"""
 
-    # CONVERT LIST TO DICT
+    # CONVERT LIST TO PAIRS
     if isinstance(elements_dict,list):
-        elements_dict = {i:i for i in elements_dict}
+        elements_dict = ((i, i) for i in elements_dict)
 
     GUI_select = SelectFromDict(items          = elements_dict,
                                 title          = title,
@@ -11,6 +11,7 @@ from pyrevit import forms # Needed for wpf import to work.
 # Custom Imports
 from GUI.forms         import my_WPF
 from Snippets._convert import convert_internal_units
+from Snippets._search  import SearchIndex
 
 #>>>>>>>>>> .NET IMPORTS
 clr.AddReference("System")
@@ -31,6 +32,8 @@ active_view_id      = doc.ActiveView.Id
 active_view         = doc.GetElement(active_view_id)
 active_view_level   = active_view.GenLevel
 
+SEARCH_LIMIT        = 1000  # Filtered list shows only this many best matches.
+
 class ListItem:
     """Helper Class for displaying selected sheets in my custom GUI."""
     def __init__(self,  Name='Unnamed', element = None, checked = False):
@@ -63,9 +66,7 @@ class CreateFromRooms(my_WPF):
         self.version     = version      #type: str
 
         #>>>>>>>>>> SET RESOURCES AND LOAD WPF
-        super(CreateFromRooms, self).add_wpf_resource()
-        path_xaml_file = os.path.join(PATH_SCRIPT, 'CreateFromRooms.xaml')
-        wpf.LoadComponent(self, path_xaml_file )
+        self.load_xaml(os.path.join(PATH_SCRIPT, 'CreateFromRooms.xaml'))
 
         self.update_UI()
         self.ShowDialog()
@@ -79,6 +80,7 @@ class CreateFromRooms(my_WPF):
         self.footer_version.Text      = self.version
 
         self.items                    = self.generate_list_items()
+        self.search_index             = SearchIndex([item.Name for item in self.items])
         self.main_ListBox.ItemsSource = self.items
 
 
@@ -108,13 +110,15 @@ class CreateFromRooms(my_WPF):
             self.main_ListBox.ItemsSource = self.items
             return
 
-        # FILTER ITEMS
-        for item in self.items:
-            if filter_keyword.lower() in item.Name.lower():
-                filtered_list_of_items.Add(item)
-            else:
-                if item.IsChecked:
-                    item.IsChecked = False
+        # FILTER ITEMS (ranked, best match first)
+        found = self.search_index.search(filter_keyword, SEARCH_LIMIT)
+        for n in found:
+            filtered_list_of_items.Add(self.items[n])
+
+        found = set(found)
+        for n, item in enumerate(self.items):
+            if n not in found and item.IsChecked:
+                item.IsChecked = False
 
         # UPDATE LIST OF ITEMS
         self.main_ListBox.ItemsSource = filtered_list_of_items
@@ -164,3 +168,25 @@ class CreateFromRooms(my_WPF):
             # print(traceback.format_exc())
 
             self.offset = 0
+
+
+# ╔╦╗╔═╗╦╔╗╔
+# ║║║╠═╣║║║║
+# ╩ ╩╩ ╩╩╝╚╝MAIN
+#====================================================================================================
+def create_from_rooms_GUI(rooms, types, title='Create from Rooms', version='Version: 1.0'):
+    #type:(list, dict, str, str) -> tuple
+    """Function to ask user for a Floor/Ceiling type and offset and create an element for each room.
+    :param rooms:   Rooms to create elements from.
+    :param types:   Dictionary of FloorTypes or CeilingTypes {e.Name:e}
+    :return:        ([created ElementId], [(room, reason)])"""
+    from Snippets._rooms import create_from_rooms
+
+    GUI = CreateFromRooms(types, title=title, version=version)
+    if not GUI.selected_type:
+        return [], []
+    try:
+        return create_from_rooms(doc, rooms, GUI.selected_type, GUI.offset)
+    except ValueError as e:     # Element type not supported in this Revit version
+        forms.alert(str(e), title=title)
+        return [], []
@@ -8,7 +8,7 @@ __author__ = "Erik Frits"
 # ==================================================
 #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> .NET IMPORTS
 import os, sys
-from pyrevit import revit, forms
+from pyrevit import revit, forms, script
 
 import os, clr
 clr.AddReference("System")
@@ -19,6 +19,76 @@ from System.Windows.Input import MouseButtonState
 import wpf
 from System.Windows import Application, Window, ResourceDictionary
 from System import Uri
+from System.IO import StringReader, File
+from System.Diagnostics import Stopwatch
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+PATH_STYLES = os.path.join(os.path.dirname(__file__), 'Resources', 'WPF_styles.xaml')
+
+# Kept in AppDomain slots, so they survive between pyRevit commands (see Snippets._cache).
+ENVVAR_STYLES  = 'NNBIM_WPF_STYLES'     # ResourceDictionary parsed from WPF_styles.xaml
+ENVVAR_XAML    = 'NNBIM_WPF_XAML'       # {path: (modified time, xaml text)}
+ENVVAR_METRICS = 'NNBIM_WPF_METRICS'    # {xaml file name: [opens, total ms, last ms, max ms]}
+
+logger = script.get_logger()
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def _get_session_dict(envvar):
+    #type:(str) -> dict
+    store = script.get_envvar(envvar)
+    if store is None:
+        store = {}
+        script.set_envvar(envvar, store)
+    return store
+
+
+def get_styles():
+    #type:() -> ResourceDictionary
+    """Function to get ResourceDictionary of WPF_styles.xaml. It is parsed once per Revit session."""
+    styles = script.get_envvar(ENVVAR_STYLES)
+    if styles is None:
+        styles        = ResourceDictionary()
+        styles.Source = Uri(PATH_STYLES)
+        script.set_envvar(ENVVAR_STYLES, styles)
+    return styles
+
+
+def get_xaml_text(path_xaml):
+    #type:(str) -> str
+    """Function to get text of a XAML file. File is read again only if it was modified."""
+    cache    = _get_session_dict(ENVVAR_XAML)
+    modified = File.GetLastWriteTimeUtc(path_xaml).Ticks
+    cached   = cache.get(path_xaml)
+    if not cached or cached[0] != modified:
+        cached = (modified, File.ReadAllText(path_xaml))
+        cache[path_xaml] = cached
+    return cached[1]
+
+
+def record_open_time(name, milliseconds):
+    """Function to record how long it took to load a window."""
+    metrics = _get_session_dict(ENVVAR_METRICS)
+    opens, total, last, longest = metrics.get(name, [0, 0.0, 0.0, 0.0])
+    metrics[name] = [opens + 1, total + milliseconds, milliseconds, max(longest, milliseconds)]
+    logger.debug('{} loaded in {:.0f} ms'.format(name, milliseconds))
+
+
+def get_open_metrics():
+    #type:() -> dict
+    """Function to get {xaml file name: {'opens', 'average_ms', 'last_ms', 'max_ms'}} of this session."""
+    return {name: {'opens'      : opens,
+                   'average_ms' : total / opens,
+                   'last_ms'    : last,
+                   'max_ms'     : longest}
+            for name, (opens, total, last, longest) in _get_session_dict(ENVVAR_METRICS).items()}
+
 
 # ╦ ╦╔═╗╔═╗  ╔╦╗╔═╗╔╦╗╔═╗╦  ╔═╗╔╦╗╔═╗
 # ║║║╠═╝╠╣    ║ ║╣ ║║║╠═╝║  ╠═╣ ║ ║╣
@@ -31,12 +101,18 @@ class my_WPF(Window):
     # ╩ ╩╚═╝ ╩ ╩ ╩╚═╝═╩╝╚═╝ METHODS
     #==================================================
     def add_wpf_resource(self):
-        """Function to add WPF resources."""
-        dir_path        = os.path.dirname(__file__)
-        path_styles     = os.path.join(dir_path, 'Resources/WPF_styles.xaml')
-        r               = ResourceDictionary()
-        r.Source        = Uri(path_styles)
-        self.Resources  = r
+        """Function to add WPF resources (shared styles are merged, not parsed again)."""
+        styles = get_styles()
+        if not self.Resources.MergedDictionaries.Contains(styles):
+            self.Resources.MergedDictionaries.Add(styles)
+
+    def load_xaml(self, path_xaml):
+        """Function to add WPF resources and load window from cached XAML text.
+        Time of loading is recorded in open-time metrics (see get_open_metrics)."""
+        timer = Stopwatch.StartNew()
+        self.add_wpf_resource()
+        wpf.LoadComponent(self, StringReader(get_xaml_text(path_xaml)))
+        record_open_time(os.path.basename(path_xaml), timer.Elapsed.TotalMilliseconds)
 
     # ╔═╗╦ ╦╦  ╔═╗╦  ╦╔═╗╔╗╔╔╦╗╔═╗
     # ║ ╦║ ║║  ║╣ ╚╗╔╝║╣ ║║║ ║ ╚═╗
@@ -7,12 +7,18 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
 from pyrevit import forms
 
+# CUSTOM IMPORTS
+from Snippets._selection import get_selection_snapshot
+from GUI.WPF_Base        import get_xaml_text, record_open_time
+from GUI.RenamePreview   import RenamePreview
+
 # .NET IMPORTS
 from clr import AddReference
 AddReference("System")
 from System.Diagnostics.Process import Start
 from System.Windows.Window import DragMove
 from System.Windows.Input import MouseButtonState
+from System.Diagnostics import Stopwatch
 
 import os
 
@@ -21,18 +27,21 @@ import os
 # ╚═╝╩ ╩╚═╝╚═╝  ╚═╝╩═╝╩ ╩╚═╝╚═╝ BASE CLASS
 #====================================================================================================
 
-class BaseRenaming(forms.WPFWindow):
-    """GUI for [Views: Find and Replace]"""
+class BaseRenaming(RenamePreview, forms.WPFWindow):
+    """GUI for [Views: Find and Replace] with live preview of new names."""
     def start(self, title, version="Version: _"):
         xaml_dir_abs_path = os.path.abspath(os.path.dirname(__file__))
         xaml_file_name = os.path.join(xaml_dir_abs_path,"GUI_BaseRename.xaml")
 
-        self.form = forms.WPFWindow.__init__(self, xaml_file_name)
+        timer = Stopwatch.StartNew()
+        self.form = forms.WPFWindow.__init__(self, get_xaml_text(xaml_file_name), literal_string=True)
+        record_open_time("GUI_BaseRename.xaml", timer.Elapsed.TotalMilliseconds)
         self.main_title.Text     = title
         self.footer_version.Text = version
         self.selected_elements   = self.get_selected_elements()
 
         if self.selected_elements:
+            self.start_preview(self.doc, self.selected_elements)
             self.ShowDialog()
         else:
             forms.alert("No matching elements for renaming were selected. \nPlease Try again.", exitscript=True, title="Script Cancelled.")
@@ -57,13 +66,13 @@ class BaseRenaming(forms.WPFWindow):
         """Abstract property of a list of types that should be filtered from selection."""
         pass
 
-    @abstractmethod
     def rename_elements(self):
-        """This is an abstract method that will be replaced with a function that contains renaming logic for given elements."""
-        pass
+        """Renaming logic for selected elements. By default current preview is applied in a single Transaction.
+        Override it if elements need a different renaming logic."""
+        return self.apply_renames(transaction_name=self.main_title.Text)
 
     def get_selected_elements(self):
-        return [self.doc.GetElement(elem_id) for elem_id in self.uidoc.Selection.GetElementIds() if type(self.doc.GetElement(elem_id)) in self.element_types]
+        return get_selection_snapshot(self.uidoc).of_types(self.element_types)
 
     # ╔═╗╦ ╦╦  ╔═╗╦═╗╔═╗╔═╗╔═╗╦═╗╔╦╗╦╔═╗╔═╗
     # ║ ╦║ ║║  ╠═╝╠╦╝║ ║╠═╝║╣ ╠╦╝ ║ ║║╣ ╚═╗
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+__title__ = "Select Similar in Links"
+__author__ = "Erik Frits"
+__doc__ = """Version = 1.0
+Date    = 19.10.2026
+_____________________________________________________________________
+Description:
+Super Select / Select similar category / Select similar family
+for elements picked in Revit links. Similarity rules are the same
+as for the host model, they are evaluated in each link's Document
+and results are selected as link references.
+_____________________________________________________________________
+How-to:
+- Select elements in links (Tab / PickObjects - LinkedElement)
+  or run the tool and pick them.
+- Get all similar elements in the links in Model/View
+_____________________________________________________________________
+Last update:
+- [19.10.2026] - 1.0 RELEASE
+_____________________________________________________________________
+"""
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+import clr, sys
+clr.AddReference("System")
+from System.Collections.Generic import List
+from Autodesk.Revit.DB import ElementId, Reference
+from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.Exceptions import OperationCanceledException
+
+# CUSTOM IMPORTS
+from Snippets._links                   import get_link_registry
+from Snippets._selection_filters       import NnSelectionFilter
+from Selection.super_select            import get_rule_keys, build_queries
+from Selection.select_similar_category import build_category_queries
+from Selection.select_similar_family   import build_family_queries
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+app      = __revit__.Application
+rvt_year = int(app.VersionNumber)
+
+RULES = ('super', 'category', 'family')
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_linked_references(uidoc):
+    #type:(UIDocument) -> list
+    """Function to get references of linked elements in current selection.
+    If there are none, user is asked to pick elements in links."""
+    refs = []
+    if rvt_year >= 2023:
+        refs = [r for r in uidoc.Selection.GetReferences() if r.LinkedElementId != ElementId.InvalidElementId]
+    if refs:
+        return refs
+
+    try:
+        return list(uidoc.Selection.PickObjects(ObjectType.LinkedElement,
+                                                NnSelectionFilter(allow_links=True),
+                                                'Select elements in Revit links'))
+    except OperationCanceledException:
+        return []
+
+
+def build_link_queries(link_doc, elements, rule):
+    #type:(Document, list, str) -> list
+    """Function to build queries of the given rule against a link Document.
+    :return: list of (label, Q)"""
+    if rule == 'super':
+        return [(label, query.instances()) for label, _, query in build_queries(link_doc, get_rule_keys(elements))]
+    elif rule == 'category':
+        return [('Category', query) for query in build_category_queries(link_doc, elements)]
+    elif rule == 'family':
+        return [('Family', query) for query in build_family_queries(link_doc, elements)]
+    raise ValueError("Unknown rule '{}'. Use one of: {}".format(rule, RULES))
+
+
+# ╔╦╗╔═╗╦╔╗╔
+# ║║║╠═╣║║║║
+# ╩ ╩╩ ╩╩╝╚╝ MAIN
+# ==================================================
+def select_similar_in_links(uidoc, mode, rule = 'super', references = None, report = False):
+    """Select similar elements inside Revit links.
+    Picked references are grouped by link Document, so a link placed many times
+    is queried once per rule key in 'model' mode. In 'view' mode each instance
+    is queried with the host view (RVT 2024+), because visibility differs per instance.
+
+    :param mode:       'view' or 'model'
+    :param rule:       'super', 'category' or 'family'
+    :param references: Linked References; current selection / PickObjects if None.
+    :param report:     True to print match count per link and rule.
+    :return:           list of link References"""
+    doc = uidoc.Document
+
+    if mode not in ("view", "model"):
+        print("ERROR occured: 'wrong mode'.\n Please contact developer.")
+        sys.exit()
+
+    if mode == "view" and rvt_year < 2024:
+        print('Selecting linked elements visible in view requires Revit 2024+. Model mode is used instead.')
+        mode = "model"
+
+    references = references if references is not None else get_linked_references(uidoc)
+    registry   = get_link_registry(doc)
+
+    # COLLECT SIMILAR ELEMENTS PER LINK DOCUMENT
+    link_refs = {}      # {(link_id, linked_id): Reference}
+    results   = []
+    for link_doc, (links, elements) in registry.group_references(references).items():
+        for label, query in build_link_queries(link_doc, elements, rule):
+
+            if mode == "model":
+                ids = query.ids()
+                ids_per_link = [(link, ids) for link in links]
+            else:
+                ids_per_link = [(link, query.in_view(doc.ActiveView, link).ids()) for link in links]
+
+            for link, ids in ids_per_link:
+                for e_id in ids:
+                    key = (link.Id.IntegerValue, e_id.IntegerValue)
+                    if key not in link_refs:
+                        link_refs[key] = Reference(link_doc.GetElement(e_id)).CreateLinkReference(link)
+                results.append((link.Name, label, ids.Count))
+
+    if report:
+        for link_name, label, count in results:
+            print('{:<40} {:<30} matched: {}'.format(link_name, label, count))
+
+    # SET SELECTION
+    refs = list(link_refs.values())
+    if refs and rvt_year >= 2023:
+        uidoc.Selection.SetReferences(List[Reference](refs))
+    elif refs:
+        print('Selecting linked elements requires Revit 2023+. Found {} elements.'.format(len(refs)))
+    return refs
@@ -1,17 +1,21 @@
 # -*- coding: utf-8 -*-
 __title__ = "Select Similar Family Instances in Model"
 __author__ = "Erik Frits"
-__doc__ = """Version = 1.0
-Date    = 22.08.2022
+__doc__ = """Version = 1.1
+Date    = 19.10.2026
 _____________________________________________________________________
 Description:
 Select all instances in the project of the same Family.
 _____________________________________________________________________
 How-to:
-- Select a single element
-- Get All instances of the same family in Model
+- Select one or more elements
+- Get All instances of the same families in Model/View
 _____________________________________________________________________
 Last update:
+- [19.10.2026] - 1.1 RELEASE
+- [19.10.2026] - Any selection is supported (multiple elements/families)
+- [19.10.2026] - Family -> FamilySymbols index cached per session,
+                 instances selected by ELEM_TYPE_PARAM instead of FamilyName string
 - [22.08.2022] - 1.0 RELEASE
 _____________________________________________________________________
 """
@@ -24,6 +28,11 @@ clr.AddReference("System")
 from System.Collections.Generic import List
 from Autodesk.Revit.DB import *
 
+# CUSTOM IMPORTS
+from Snippets._cache     import DocumentCache
+from Snippets._query     import Q
+from Snippets._selection import get_selection_snapshot
+
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
 # ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
 #  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝
@@ -33,48 +42,81 @@ from Autodesk.Revit.DB import *
 app     = __revit__.Application
 rvt_year = int(app.VersionNumber)
 
+# {doc: {Family.Id.IntegerValue: [FamilySymbol.Id]}} - kept for the whole session, cleared on DocumentChanged.
+_FAMILY_SYMBOLS = DocumentCache('family_symbol_ids', session=True)
+
 # ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔
 # ╠╣ ║ ║║║║║   ║ ║║ ║║║║
 # ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝ FUNCTION
 # ==================================================
-def select_similar_by_family(uidoc, mode):
-    doc = uidoc.Document
-    selected_elements = uidoc.Selection.GetElementIds()
+def get_family_symbol_ids(doc, family):
+    #type:(Document, Family) -> list
+    """Function to get FamilySymbol ids of a Family (cached per session)."""
+    return _FAMILY_SYMBOLS.get(doc, family.Id.IntegerValue, lambda: list(family.GetFamilySymbolIds()))
 
-    try:
-        # Check that Only single item is selected!
-        if len(selected_elements) != 1:
-            from pyrevit import forms
-            forms.alert('You need to select only 1 element.', title=__title__, exitscript=True)
 
-        selected_element = doc.GetElement(selected_elements[0])
+def build_family_queries(doc, elements):
+    #type:(Document, list) -> list
+    """Function to create queries that select all instances of the families of given elements.
+    - Loadable families: FamilySymbol ids of each unique Family -> ELEM_TYPE_PARAM rules.
+    - System families (Walls, Floors...): unique FamilyName per category -> ALL_MODEL_FAMILY_NAME rules.
+    Every query starts with a quick category filter.
+    :return: list of Q"""
+    # UNIQUE TYPES OF SELECTION
+    type_ids = set()
+    for element in elements:
+        type_id = element.GetTypeId()
+        if type_id != ElementId.InvalidElementId:
+            type_ids.add(type_id.IntegerValue)
+        else:
+            print('{} is not supported with this tool.'.format(type(element).__name__))
 
-        # CREATE FILTER RULE
-        elem_type_id = selected_element.get_Parameter(BuiltInParameter.ELEM_TYPE_PARAM).AsElementId()
-        elem_type = doc.GetElement(elem_type_id)
-        elem_family_name = elem_type.FamilyName
-        f_parameter = ParameterValueProvider(ElementId(BuiltInParameter.ALL_MODEL_FAMILY_NAME))
-        f_parameter_value = elem_family_name
+    # UNIQUE FAMILIES
+    symbols_by_cat  = {}     # {cat_id: set(symbol_id)}
+    names_by_cat    = {}     # {cat_id: set(family_name)}
+    family_ids_seen = set()
+    for type_id in type_ids:
+        elem_type = doc.GetElement(ElementId(type_id))
+        if not elem_type or not elem_type.Category:
+            continue
+        cat_id = elem_type.Category.Id.IntegerValue
 
-        if rvt_year < 2023:
-            f_rule = FilterStringRule(f_parameter, FilterStringEquals(), f_parameter_value,True)
+        if isinstance(elem_type, FamilySymbol):
+            family = elem_type.Family
+            if family.Id.IntegerValue in family_ids_seen:
+                continue
+            family_ids_seen.add(family.Id.IntegerValue)
+            symbols_by_cat.setdefault(cat_id, set()).update(s_id.IntegerValue for s_id in get_family_symbol_ids(doc, family))
         else:
-            f_rule = FilterStringRule(f_parameter, FilterStringEquals(), f_parameter_value)
+            names_by_cat.setdefault(cat_id, set()).add(elem_type.FamilyName)
+
+    # QUERIES
+    queries = []
+    for cat_id, symbol_ids in symbols_by_cat.items():
+        queries.append(Q(doc).category(cat_id).instances().type_id([ElementId(i) for i in symbol_ids]))
+    for cat_id, family_names in names_by_cat.items():
+        queries.append(Q(doc).category(cat_id).instances().param_eq(BuiltInParameter.ALL_MODEL_FAMILY_NAME, list(family_names)))
+    return queries
+
+
+def select_similar_by_family(uidoc, mode):
+    """Select all instances of the families of selected elements.
+    :param mode: 'model' or 'view'"""
+    doc      = uidoc.Document
+    snapshot = get_selection_snapshot(uidoc)
 
-        # CREATE FILTER
-        filter_family_name = ElementParameterFilter(f_rule)
+    if not snapshot:
+        from pyrevit import forms
+        forms.alert('You need to select at least 1 element.', title=__title__, exitscript=True)
 
-        # GET ELEMENTS
-        elements_by_f_name = []
-        if mode   == 'model':
-            elements_by_f_name = FilteredElementCollector(doc)\
-                    .WherePasses(filter_family_name).WhereElementIsNotElementType().ToElementIds()
-        elif mode == 'view':
-            elements_by_f_name = FilteredElementCollector(doc, doc.ActiveView.Id)\
-                    .WherePasses(filter_family_name).WhereElementIsNotElementType().ToElementIds()
+    # GET ELEMENTS
+    elements_by_family = {}     # {int: ElementId}
+    for query in build_family_queries(doc, snapshot):
+        if mode == 'view':
+            query.in_view(doc.ActiveView)
+        for e_id in query.ids():
+            elements_by_family[e_id.IntegerValue] = e_id
 
-        # SET SELECTION
-        if elements_by_f_name:
-            uidoc.Selection.SetElementIds(List[ElementId](elements_by_f_name))
-    except:
-        print('{} is not supported with this tool.'.format(type(selected_element)))
\ No newline at end of file
+    # SET SELECTION
+    if elements_by_family:
+        uidoc.Selection.SetElementIds(List[ElementId](elements_by_family.values()))
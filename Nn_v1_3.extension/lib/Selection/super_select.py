@@ -2,7 +2,7 @@
 __title__ = "Super Select"
 __author__ = "Erik Frits"
 __helpurl__ = "https://erikfrits.com/blog/super-select-multiple-elements-in-viewmodel/"
-__doc__ = """Version = 1.2
+__doc__ = """Version = 1.3
 Date    = 08.02.2021
 _____________________________________________________________________
 Description:
@@ -20,6 +20,11 @@ How-to:
 Select a few instances in the model and run the script.
 _____________________________________________________________________
 Last update:
+- [19.10.2026] - 1.3 RELEASE
+- [19.10.2026] - Selection is reduced to unique rule keys first,
+                 one filter per key, quick category filters first,
+                 match count reported per rule.
+- [19.10.2026] - Fixed MatchLine rule (was checking PlanRegion id)
 - [10.06.2021] - 1.2 RELEASE
 - [10.06.2021] - Script was refactorred and placed in lib/Selection/ 
 - [10.06.2021] - Selection rule added - [Rooms/Area]
@@ -50,151 +55,157 @@ _____________________________________________________________________
 import clr, sys
 clr.AddReference("System")
 from System.Collections.Generic import List
-# from Autodesk.Revit.DB import *
-from Autodesk.Revit.DB import ( ModelLine,
-                                DetailLine,
-                                PropertyLine,
+from Autodesk.Revit.DB import ( PropertyLine,
                                 RevisionCloud,
                                 ReferencePlane,
-                                FilteredElementCollector,
-                                FilterNumericEquals,
-                                FilterElementIdRule,
-                                ElementFilter,
-                                ElementParameterFilter,
-                                LogicalOrFilter,
-                                ParameterValueProvider,
                                 BuiltInParameter,
                                 ElementId,
-                                DetailCurve,
-                                DetailArc,
-                                DetailEllipse,
-                                DetailNurbSpline,
-                                ModelCurve,
-                                ModelArc,
-                                ModelEllipse,
-                                ModelNurbSpline,
-                                ElementCategoryFilter,
-                                BuiltInCategory,
+                                Category,
                                 )
 
+# CUSTOM IMPORTS
+from Snippets._query     import Q
+from Snippets._selection import get_selection_snapshot
+from Snippets._variables import LINE_TYPES
+
+
+#____________________________________________________________________ RULES
+# Categories that are always selected as a whole category (one quick ElementMulticategoryFilter)
+CATEGORY_RULES = {-2000160 : 'Rooms',
+                  -2003200 : 'Areas',
+                  -2006000 : 'ScopeBox',
+                  -2000191 : 'PlanRegion',
+                  -2000193 : 'MatchLine'}
+# Line categories that are selected by category instead of LineStyle
+LINE_CATEGORY_RULES = {-2000066 : 'RoomSeparation',
+                       -2000079 : 'AreaBoundary'}
+
+P_TYPE        = int(BuiltInParameter.ELEM_TYPE_PARAM)
+P_LINE_STYLE  = int(BuiltInParameter.BUILDING_CURVE_GSTYLE)
+P_SUBCATEGORY = int(BuiltInParameter.CLINE_SUBCATEGORY)
+P_REVISION    = int(BuiltInParameter.REVISION_CLOUD_REVISION)
+
+
+def get_rule_key(element):
+    #type:(Element) -> tuple
+    """Function to get the similarity key of an element.
+    Elements with the same key select the same elements.
+    :return: (rule_name, parameter_id, category_id, value_id)
+             parameter_id is None for rules that select the whole category."""
+    element_type = type(element)
+    cat_id       = element.Category.Id.IntegerValue if element.Category else None
+
+    # [RULE] - LINES
+    if element_type in LINE_TYPES:
+        # RoomSeparation / AreaBoundary -> whole category
+        if cat_id in LINE_CATEGORY_RULES:
+            return ('Category', None, cat_id, cat_id)
+        # Other lines -> same LineStyle
+        return ('LineStyle', P_LINE_STYLE, cat_id, element.LineStyle.Id.IntegerValue)
+
+    # [RULE] - ReferencePlane
+    elif element_type == ReferencePlane:
+        subcategory_id = element.get_Parameter(BuiltInParameter.CLINE_SUBCATEGORY).AsElementId()
+        return ('SubCategory', P_SUBCATEGORY, cat_id, subcategory_id.IntegerValue)
+
+    # [RULE] - PropertyLine
+    elif element_type == PropertyLine:
+        return ('Category', None, cat_id, cat_id)
+
+    # [RULE] - RevisionClouds
+    elif element_type == RevisionCloud:
+        revision_id = element.get_Parameter(BuiltInParameter.REVISION_CLOUD_REVISION).AsElementId()
+        return ('Revision', P_REVISION, cat_id, revision_id.IntegerValue)
+
+    # [RULE] - Rooms/Areas/ScopeBox/PlanRegion/MatchLine
+    elif cat_id in CATEGORY_RULES:
+        return ('Category', None, cat_id, cat_id)
+
+    # [RULE] - Others
+    return ('Type', P_TYPE, cat_id, element.GetTypeId().IntegerValue)
+
+
+def get_rule_keys(elements):
+    #type:(list) -> set
+    """Function to reduce elements to a set of unique rule keys."""
+    keys = set()
+    for element in elements:
+        try:
+            keys.add(get_rule_key(element))
+        except:
+            print('{} is not supported with Super Select.'.format(type(element).__name__))
+    return keys
+
+
+def get_category_name(doc, cat_id):
+    #type:(Document, int) -> str
+    """Category name for a report label, the id itself if the category can't be resolved."""
+    category = Category.GetCategory(doc, ElementId(cat_id))
+    return category.Name if category else str(cat_id)
+
+
+def build_queries(doc, rule_keys):
+    #type:(Document, set) -> list
+    """Function to build one query per rule instead of one filter per selected element.
+    - All whole-category rules are merged into one ElementMulticategoryFilter.
+    - Parameter rules are grouped by (rule, parameter, category), so each group is a
+      quick category filter followed by a single OR-group of unique values.
+    :return: list of (label, number_of_keys, Q)"""
+    categories = set()
+    groups     = {}     # {(rule, param, cat_id): set(value_id)}
+    for rule, param, cat_id, value in rule_keys:
+        if param is None:
+            categories.add(value)
+        else:
+            groups.setdefault((rule, param, cat_id), set()).add(value)
 
+    queries = []
+    if categories:
+        queries.append(('Category', len(categories), Q(doc).category(categories)))
 
+    for (rule, param, cat_id), values in sorted(groups.items()):
+        query = Q(doc).param_eq(param, [ElementId(v) for v in sorted(values)])
+        if cat_id is not None:
+            query.category(cat_id)
+        label = '{} [{}]'.format(rule, get_category_name(doc, cat_id) if cat_id is not None else '-')
+        queries.append((label, len(values), query))
+    return queries
 
 
-#____________________________________________________________________ FUNCTIONS
-def create_filter(key_parameter, element_value):
-    """Function to create a RevitAPI filter."""
-    f_parameter = ParameterValueProvider(ElementId(key_parameter))
-    f_parameter_value = element_value #e.g. element.Category.Id
-    f_rule = FilterElementIdRule(f_parameter, FilterNumericEquals(), f_parameter_value)
-    filter = ElementParameterFilter(f_rule)
-    return filter
 #____________________________________________________________________ MAIN
-
-def select(mode):
-    """Run Super Select: all in model/view based on given mode."""
+def select(mode, report = False):
+    """Run Super Select: all in model/view based on given mode.
+    :param mode:   'view' or 'model'
+    :param report: True to print match count per rule.
+    :return:       list of (rule label, number of unique keys, number of matched elements)"""
 
     uidoc = __revit__.ActiveUIDocument
     doc = __revit__.ActiveUIDocument.Document
-    # print(doc.Title)
-
-
-    # FILTERS CONTAINER
-    list_of_filters = List[ElementFilter]()
-
-    # GET CURRENT SELECTION
-    current_selection_ids = uidoc.Selection.GetElementIds()
-
-    # LOOP THROUGH SELECTION
-    for id in current_selection_ids:
-        element = doc.GetElement(id)
-        element_type = type(element)
-
-        # [RULE] - LINES
-        line_types = [DetailLine, DetailCurve, DetailArc, DetailEllipse, DetailNurbSpline,
-                      ModelLine, ModelCurve, ModelArc, ModelEllipse, ModelNurbSpline]
-        if element_type in line_types:
-            # [FILTER FOR CATEGORY] - RoomSeparation(-2000066)  / AreaBoundary(-2000079)
-            if element.Category.Id == ElementId(-2000066) or element.Category.Id == ElementId(-2000079):
-                filter = create_filter(key_parameter=BuiltInParameter.ELEM_CATEGORY_PARAM,
-                                       element_value=element.Category.Id)
-                list_of_filters.Add(filter)
-
-            # [FILTER FOR LINESTYLE] - Other Lines
-            else:
-                filter = create_filter(key_parameter=BuiltInParameter.BUILDING_CURVE_GSTYLE,
-                                       element_value=element.LineStyle.Id)
-                list_of_filters.Add(filter)
-
-
-        # [RULE] - ReferencePlane
-        elif element_type == ReferencePlane:
-            filter = create_filter(key_parameter=BuiltInParameter.CLINE_SUBCATEGORY,
-                                   element_value=element.get_Parameter(
-                                       BuiltInParameter.CLINE_SUBCATEGORY).AsElementId())
-            list_of_filters.Add(filter)
-
-        # [RULE] - PropertyLine
-        elif element_type == PropertyLine:
-            filter = create_filter(key_parameter=BuiltInParameter.ELEM_CATEGORY_PARAM,
-                                   element_value=element.Category.Id)
-            list_of_filters.Add(filter)
-
-        # [RULE] - RevisionClouds
-        elif element_type == RevisionCloud:
-            filter = create_filter(key_parameter=BuiltInParameter.REVISION_CLOUD_REVISION,
-                                   element_value=element.get_Parameter(
-                                       BuiltInParameter.REVISION_CLOUD_REVISION).AsElementId())
-            list_of_filters.Add(filter)
-
-        # [RULE] - ROOMS(-2000160)
-        elif element.Category.Id == ElementId(-2000160):
-            list_of_filters.Add(ElementCategoryFilter(BuiltInCategory.OST_Rooms))
-
-        # [RULE] - AREAS(-2003200)
-        elif element.Category.Id == ElementId(-2003200):
-            list_of_filters.Add(ElementCategoryFilter(BuiltInCategory.OST_Areas))
-
-        # [RULE] - ScopeBox(-2006000)
-        elif element.Category.Id == ElementId(-2006000):
-            filter = create_filter(key_parameter=BuiltInParameter.ELEM_CATEGORY_PARAM,
-                                   element_value=element.Category.Id)
-            list_of_filters.Add(filter)
-
-        # [RULE] - PlanRegion(-2000191)
-        elif element.Category.Id == ElementId(-2000191):
-            filter = create_filter(key_parameter=BuiltInParameter.ELEM_CATEGORY_PARAM,
-                                   element_value=element.Category.Id)
-            list_of_filters.Add(filter)
-
-        # [RULE] - MatchLine(-2000193)
-        elif element.Category.Id == ElementId(-2000191):
-            filter = create_filter(key_parameter=BuiltInParameter.ELEM_CATEGORY_PARAM,
-                                   element_value=element.Category.Id)
-            list_of_filters.Add(filter)
-
-        # [RULE] - Others
-        else:
-            filter = create_filter(key_parameter=BuiltInParameter.ELEM_TYPE_PARAM,
-                                   element_value=element.GetTypeId())
-            list_of_filters.Add(filter)
 
-    if list_of_filters:
-        # COMBINE FILTERS
-        multiple_filters = LogicalOrFilter(list_of_filters)
+    if mode not in ("view", "model"):
+        print("ERROR occured: 'wrong mode'.\n Please contact developer.")
+        sys.exit()
 
-        # GET ELEMENTS BASED ON SELECTION MODE
-        if mode == "view":
-            elems = FilteredElementCollector(doc, doc.ActiveView.Id).WherePasses(multiple_filters).ToElementIds()
-        elif mode == "model":
-            elems = FilteredElementCollector(doc).WherePasses(multiple_filters).ToElementIds()
-        else:
-            print("ERROR occured: 'wrong mode'.\n Please contact developer.")
-            sys.exit()
+    # UNIQUE RULE KEYS OF CURRENT SELECTION
+    rule_keys = get_rule_keys(get_selection_snapshot(uidoc))
 
-        # SET SELECTION
-        if elems:
-            uidoc.Selection.SetElementIds(List[ElementId](elems))
+    # ONE QUERY PER RULE
+    matched = {}        # {int: ElementId}
+    results = []
+    for label, n_keys, query in build_queries(doc, rule_keys):
+        if mode == "view":
+            query.in_view(doc.ActiveView)
+        ids = query.instances().ids()
+        for e_id in ids:
+            matched[e_id.IntegerValue] = e_id
+        results.append((label, n_keys, ids.Count))
 
+    if report:
+        for label, n_keys, count in results:
+            print('{:<40} keys: {:<5} matched: {}'.format(label, n_keys, count))
 
+    # SET SELECTION
+    if matched:
+        uidoc.Selection.SetElementIds(List[ElementId](matched.values()))
 
+    return results
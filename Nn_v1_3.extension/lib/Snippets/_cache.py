@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB.Events import DocumentChangedEventArgs, DocumentClosingEventArgs
+from pyrevit import script
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System import EventHandler
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+app = __revit__.Application
+
+# pyRevit runs every command in a fresh engine, so handlers and session caches
+# are parked in AppDomain slots (script.set_envvar) to survive between commands.
+ENVVAR_HANDLERS      = 'NNBIM_DOCUMENT_CACHE_HANDLERS'
+ENVVAR_SESSION_STORE = 'NNBIM_DOCUMENT_CACHE_SESSION'
+
+_CACHES     = []     # DocumentCache instances created in this engine
+_subscribed = False
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def _get_session_store():
+    #type:() -> dict
+    """Function to get the session-wide store {cache_name: {doc: {key: value}}}."""
+    store = script.get_envvar(ENVVAR_SESSION_STORE)
+    if store is None:
+        store = {}
+        script.set_envvar(ENVVAR_SESSION_STORE, store)
+    return store
+
+
+def invalidate_document(doc):
+    """Function to drop every cached value of the given Document (local and session caches)."""
+    for cache in _CACHES:
+        cache.invalidate(doc)
+
+    for per_doc in _get_session_store().values():
+        per_doc.pop(doc, None)
+
+
+def _on_document_changed(sender, args):
+    invalidate_document(args.GetDocument())
+
+
+def _on_document_closing(sender, args):
+    invalidate_document(args.Document)
+
+
+def subscribe_invalidation():
+    """Function to register DocumentChanged/DocumentClosing handlers once per engine.
+    Handlers left behind by a previous command are removed first,
+    so there is only ever one live pair of NnBim handlers per Revit session."""
+    global _subscribed
+    if _subscribed:
+        return
+
+    previous = script.get_envvar(ENVVAR_HANDLERS)
+    if previous:
+        try:
+            app.DocumentChanged -= previous[0]
+            app.DocumentClosing -= previous[1]
+        except:
+            pass
+
+    h_changed = EventHandler[DocumentChangedEventArgs](_on_document_changed)
+    h_closing = EventHandler[DocumentClosingEventArgs](_on_document_closing)
+    app.DocumentChanged += h_changed
+    app.DocumentClosing += h_closing
+    script.set_envvar(ENVVAR_HANDLERS, (h_changed, h_closing))
+    _subscribed = True
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class DocumentCache(object):
+    """Memo store keyed by Document, cleared for a Document whenever it changes or closes.
+
+    Example:
+        _SYMBOLS = DocumentCache('family_symbols', session=True)
+        symbols  = _SYMBOLS.get(doc, family_id.IntegerValue, lambda: family.GetFamilySymbolIds())
+
+    session=False keeps values for the current command only.
+    session=True  keeps values across commands; store only Revit API objects and
+                  builtin containers (list/dict/set/tuple) there, never instances
+                  of classes defined in a script."""
+
+    def __init__(self, name, session=False):
+        self.name    = name
+        self.session = session
+        self._local  = {}
+        _CACHES.append(self)
+
+    @property
+    def _store(self):
+        #type:() -> dict
+        if not self.session:
+            return self._local
+        return _get_session_store().setdefault(self.name, {})
+
+    def for_document(self, doc):
+        #type:(Document) -> dict
+        """Return the dict of cached values for the given Document."""
+        subscribe_invalidation()
+        return self._store.setdefault(doc, {})
+
+    def get(self, doc, key, factory):
+        """Return cached value for (doc, key). factory() is called only on a cache miss."""
+        values = self.for_document(doc)
+        if key not in values:
+            values[key] = factory()
+        return values[key]
+
+    def invalidate(self, doc=None):
+        """Clear cached values of the given Document or of all Documents if None."""
+        if doc is None:
+            self._store.clear()
+        else:
+            self._store.pop(doc, None)
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import *
+import hashlib
+
+# CUSTOM IMPORTS
+from Snippets._colors    import gradient, to_revit_color
+from Snippets._overrides import OverrideEngine, get_filter_elements
+from Snippets._legend    import get_solid_fill_pattern_id
+from Snippets._rename    import PROHIBITED_CHARS
+from Snippets._convert   import get_spec, format_value
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+app      = __revit__.Application
+rvt_year = int(app.VersionNumber)
+
+FILTER_PREFIX = 'NnBim_Cor'
+EPSILON       = 1e-6        # Tolerance of numeric filter rules (internal units)
+EMPTY_VALUE   = '<vazio>'   # Bucket label of elements without a value
+OTHER_VALUE   = '<outros>'  # Bucket label of values over MAX_BUCKETS
+OTHER_COLOR   = (192, 192, 192)
+MAX_BUCKETS   = 64          # More unique values -> Doubles are split into AUTO_RANGES, the rest go to OTHER_VALUE
+AUTO_RANGES   = 10
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_parameter(element, param_name):
+    #type:(Element, str) -> Parameter
+    """Function to get instance parameter by name, or type parameter if instance has none."""
+    param = element.LookupParameter(param_name)
+    if param is None:
+        element_type = element.Document.GetElement(element.GetTypeId())
+        if element_type:
+            param = element_type.LookupParameter(param_name)
+    return param
+
+
+def read_value(param):
+    #type:(Parameter) -> any
+    """Parameter -> str / int / float (internal units) or None."""
+    if param is None or not param.HasValue:
+        return None
+    storage = param.StorageType
+    if storage == StorageType.String:   return param.AsString() or None
+    if storage == StorageType.Integer:  return param.AsInteger()
+    if storage == StorageType.Double:   return param.AsDouble()
+    return param.AsValueString()
+
+
+def collect_values(doc, category_ids, param_name, view=None):
+    #type:(Document, list, str, View) -> tuple
+    """Function to read parameter values of all elements of given categories in one collector pass.
+    :param view: Collect only elements visible in this view (whole project if None)
+    :return:     (first Parameter found or None, {value: count})"""
+    collector = FilteredElementCollector(doc, view.Id) if view else FilteredElementCollector(doc)
+    collector = collector.WherePasses(ElementMulticategoryFilter(List[ElementId](category_ids)))\
+                         .WhereElementIsNotElementType()
+
+    first, values = None, {}
+    for element in collector:
+        param = get_parameter(element, param_name)
+        if param is None:
+            continue
+        first = first or param
+        value = read_value(param)
+        values[value] = values.get(value, 0) + 1
+    return first, values
+
+
+def filter_name(*parts):
+    #type:(*str) -> str
+    """Function to make a valid FilterElement name from parts."""
+    name = ' - '.join(unicode(p) for p in parts)
+    return ''.join('_' if c in PROHIBITED_CHARS else c for c in name)
+
+
+def get_filterable_parameter_ids(doc, category_ids):
+    #type:(Document, list) -> set
+    """Function to get ids (IntegerValue) of parameters that can be used in a view filter of all given categories."""
+    common = ParameterFilterUtilities.GetFilterableParametersInCommon(doc, List[ElementId](category_ids))
+    return set(p_id.IntegerValue for p_id in common)
+
+
+def rule_hash(rule_key):
+    #type:(tuple) -> str
+    """Short hash of a bucket rule, e.g. ('value', 'A') or ('range', 0.0, 3.28, False).
+    Labels are rounded/sanitized, the hash keeps filters of different rules apart."""
+    return hashlib.md5(repr(rule_key).encode('utf-8')).hexdigest()[:8]
+
+
+def _equals_rule(param_id, value, not_equals=False):
+    """Version-aware 'equals' (or 'not equals') rule for str / int / float values."""
+    create = ParameterFilterRuleFactory.CreateNotEqualsRule if not_equals else \
+             ParameterFilterRuleFactory.CreateEqualsRule
+    if isinstance(value, basestring):
+        if rvt_year >= 2023:
+            return create(param_id, value)
+        return create(param_id, value, True)
+    if isinstance(value, float):
+        return create(param_id, value, EPSILON)
+    return create(param_id, value)
+
+
+def _has_no_value_rule(param_id, storage):
+    """Rule for elements without a value (Revit 2022+ has HasNoValue rules).
+    Older versions can only match empty text, None is returned for other storage types."""
+    if rvt_year >= 2022:
+        return ParameterFilterRuleFactory.CreateHasNoValueParameterRule(param_id)
+    if storage == StorageType.String:
+        return ParameterFilterRuleFactory.CreateEqualsRule(param_id, '', True)
+    return None
+
+
+def _has_value_rule(param_id, storage):
+    """Opposite of _has_no_value_rule (None if it can't be expressed)."""
+    if rvt_year >= 2022:
+        return ParameterFilterRuleFactory.CreateHasValueParameterRule(param_id)
+    if storage == StorageType.String:
+        return ParameterFilterRuleFactory.CreateNotEqualsRule(param_id, '', True)
+    return None
+
+
+def other_filter(param_id, values, storage=StorageType.String):
+    #type:(ElementId, list, StorageType) -> ElementFilter
+    """ElementFilter for every value except given ones (all rules must pass)."""
+    rules = [_has_value_rule(param_id, storage) if value is None else _equals_rule(param_id, value, not_equals=True)
+             for value in values]
+    rules = [rule for rule in rules if rule]
+    return ElementParameterFilter(List[FilterRule](rules)) if rules else None
+
+
+def value_filter(param_id, value, storage=StorageType.String):
+    #type:(ElementId, any, StorageType) -> ElementFilter
+    """ElementFilter for a single value or None if it can't be expressed as a rule."""
+    if storage not in (StorageType.String, StorageType.Integer, StorageType.Double):
+        return None
+    rule = _has_no_value_rule(param_id, storage) if value is None else _equals_rule(param_id, value)
+    return ElementParameterFilter(rule) if rule else None
+
+
+def range_filter(param_id, low, high, last=False):
+    #type:(ElementId, float, float, bool) -> ElementFilter
+    """low <= value < high (value <= high for the last range)."""
+    upper = ParameterFilterRuleFactory.CreateLessOrEqualRule if last else ParameterFilterRuleFactory.CreateLessRule
+    rules = List[FilterRule]([ParameterFilterRuleFactory.CreateGreaterOrEqualRule(param_id, float(low), EPSILON),
+                              upper(param_id, float(high), EPSILON)])
+    return ElementParameterFilter(rules)
+
+
+def get_ranges(values, n):
+    #type:(list, int) -> list
+    """Function to split numeric values into n equal ranges [(low, high)]."""
+    low, high = min(values), max(values)
+    if high - low < EPSILON or n < 2:
+        return [(low, high)]
+    step = (high - low) / float(n)
+    return [(low + i * step, high if i == n - 1 else low + (i + 1) * step) for i in range(n)]
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class ColorBucket(object):
+    """Values that get the same color: label, ElementFilter, (r, g, b) and rule_key (exact rule of the filter)."""
+    def __init__(self, label, element_filter, color, count=0, rule_key=None):
+        self.label          = label
+        self.element_filter = element_filter
+        self.color          = color
+        self.count          = count
+        self.rule_key       = rule_key if rule_key is not None else ('label', label)
+
+
+class ColorByParameter(object):
+    """Colors elements by parameter value with one view filter per bucket (no element overrides).
+    Unique values are read in one collector pass, each bucket becomes a ParameterFilterElement
+    (created or reused by name) and colors are applied with OverrideEngine to many views at once.
+
+    Example:
+        painter = ColorByParameter(doc, [ElementId(BuiltInCategory.OST_Rooms)], 'Name', view=doc.ActiveView)
+        painter.make_buckets((85,107,47), (205,236,203))        # one bucket per unique value
+        painter.apply([doc.ActiveView])"""
+
+    def __init__(self, doc, category_ids, param_name, view=None):
+        #type:(Document, list, str, View) -> None
+        self.doc          = doc
+        self.category_ids = list(category_ids)
+        self.param_name   = param_name
+        param, self.values = collect_values(doc, self.category_ids, param_name, view)
+        self.param_id     = param.Id if param else None
+        self.storage      = param.StorageType if param else None
+        self.spec         = get_spec(param.Definition) if param else None
+        self.buckets      = []
+        self.forced_ranges = False  # make_buckets split Doubles into ranges (too many unique values)
+        self.pooled        = 0      # Number of unique values put into OTHER_VALUE bucket
+
+    @property
+    def is_numeric(self):
+        """Only Double parameters can be split into ranges (integers are usually flags or enums)."""
+        return self.storage == StorageType.Double
+
+    @property
+    def is_filterable(self):
+        """True if the parameter can be used in a view filter of all chosen categories
+        (e.g. type-only parameters of some categories can't)."""
+        return self.param_id is not None and \
+               self.param_id.IntegerValue in get_filterable_parameter_ids(self.doc, self.category_ids)
+
+    def format_value(self, value):
+        #type:(float) -> str
+        """Internal units -> text in project units (as users see it in Revit)."""
+        return format_value(self.doc, value, self.spec)
+
+    def get_name_prefix(self, prefix=FILTER_PREFIX):
+        #type:(str) -> str
+        """Common start of filter names of this parameter, e.g. 'NnBim_Cor - Name - '."""
+        return filter_name(prefix, self.param_name, '')
+
+    def make_buckets(self, color_a, color_b, n_ranges=None):
+        #type:(tuple, tuple, int) -> list
+        """Function to create buckets with gradient colors from color_a to color_b.
+        There are never more than MAX_BUCKETS buckets (filters): with more unique values Doubles are split
+        into AUTO_RANGES ranges (forced_ranges) and other types keep the most frequent values,
+        the rest share one OTHER_VALUE bucket (pooled).
+        :param n_ranges: Split numeric values into n ranges. One bucket per unique value if None."""
+        self.buckets, self.forced_ranges, self.pooled = [], False, 0
+        if self.param_id is None:
+            return self.buckets
+
+        numbers = set(v for v in self.values if isinstance(v, float))
+        if n_ranges:
+            n_ranges = min(n_ranges, MAX_BUCKETS)
+        elif self.is_numeric and len(numbers) > MAX_BUCKETS:
+            n_ranges, self.forced_ranges = AUTO_RANGES, True
+
+        if n_ranges and self.is_numeric and numbers:
+            ranges = get_ranges(numbers, n_ranges)
+            colors = gradient(color_a, color_b, len(ranges))
+            for i, ((low, high), color) in enumerate(zip(ranges, colors)):
+                last  = i == len(ranges) - 1
+                count = sum(c for v, c in self.values.items()
+                            if v in numbers and low <= v and (v <= high if last else v < high))
+                label = '{} - {}'.format(self.format_value(low), self.format_value(high))
+                self.buckets.append(ColorBucket(label, range_filter(self.param_id, low, high, last), color, count,
+                                                rule_key=('range', low, high, last)))
+        else:
+            filters = [(value, value_filter(self.param_id, value, self.storage))
+                       for value in sorted(self.values, key=lambda v: (v is None, v))]
+            filters = [(value, element_filter) for value, element_filter in filters if element_filter]
+
+            others = []
+            if len(filters) > MAX_BUCKETS:
+                top     = sorted(filters, key=lambda f: -self.values[f[0]])[:MAX_BUCKETS - 1]
+                kept    = set(value for value, _ in top)
+                others  = [value for value, _ in filters if value not in kept]
+                filters = [f for f in filters if f[0] in kept]
+
+            for (value, element_filter), color in zip(filters, gradient(color_a, color_b, len(filters))):
+                if value is None:               label = EMPTY_VALUE
+                elif isinstance(value, float):  label = self.format_value(value)
+                else:                           label = value
+                self.buckets.append(ColorBucket(label, element_filter, color, self.values[value],
+                                                rule_key=('value', value)))
+
+            kept_values    = [value for value, _ in filters]
+            element_filter = other_filter(self.param_id, kept_values, self.storage) if others else None
+            if element_filter:
+                self.pooled = len(others)
+                self.buckets.append(ColorBucket(OTHER_VALUE, element_filter, OTHER_COLOR,
+                                                sum(self.values[value] for value in others),
+                                                rule_key=('other', tuple(kept_values))))
+        return self.buckets
+
+    def _is_reusable(self, filter_element):
+        #type:(FilterElement) -> bool
+        """Filter with the same name is reused only with the same categories (it is never modified,
+        other views may use it). Its name encodes the parameter and a hash of the exact value/range."""
+        return isinstance(filter_element, ParameterFilterElement) and \
+               set(c.IntegerValue for c in filter_element.GetCategories()) == \
+               set(c.IntegerValue for c in self.category_ids)
+
+    def create_filters(self, prefix=FILTER_PREFIX):
+        #type:(str) -> list
+        """Function to create (or reuse) one ParameterFilterElement per bucket (must run in a Transaction).
+        Raises ValueError if the parameter can't be used in a view filter of all categories.
+        :return: [(ColorBucket, ParameterFilterElement)]"""
+        if not self.is_filterable:
+            raise ValueError("Parameter '{}' can't be used in a view filter of all selected categories."
+                             .format(self.param_name))
+
+        existing   = get_filter_elements(self.doc)
+        categories = List[ElementId](self.category_ids)
+        filters    = []
+        for bucket in self.buckets:
+            base_name = name = filter_name(prefix, self.param_name, bucket.label, rule_hash(bucket.rule_key))
+            parameter_filter, n = existing.get(name), 2
+            while parameter_filter is not None and not self._is_reusable(parameter_filter):
+                name = '{} ({})'.format(base_name, n)
+                parameter_filter, n = existing.get(name), n + 1
+
+            if parameter_filter is None:
+                parameter_filter = ParameterFilterElement.Create(self.doc, name, categories, bucket.element_filter)
+                existing[name]   = parameter_filter
+            filters.append((bucket, parameter_filter))
+        return filters
+
+    def apply(self, views, prefix=FILTER_PREFIX, transaction_name='Color by Parameter'):
+        #type:(list, str, str) -> dict
+        """Function to create filters and apply bucket colors (solid fill) to given views in one Transaction.
+        Filters of earlier runs for the same parameter are removed from the views first,
+        so old values/ranges don't keep their colors (OverrideEngine with this parameter's name prefix).
+        :return: report of OverrideEngine.apply"""
+        solid_fill_id = get_solid_fill_pattern_id(self.doc)
+
+        t = Transaction(self.doc, transaction_name)
+        t.Start()
+        try:
+            engine = OverrideEngine(self.doc, filter_prefix=self.get_name_prefix(prefix))
+            for bucket, parameter_filter in self.create_filters(prefix):
+                engine.add_filter(parameter_filter,
+                                  fg_pattern_id = solid_fill_id,
+                                  fg_color      = to_revit_color(bucket.color))
+            report = engine.apply(views)
+            t.Commit()
+        except:
+            t.RollBack()
+            raise
+        return report
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import Color
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def parse_rgb(s):
+    #type:(str) -> tuple
+    """'255,114,16' or '#FF7210' -> (255, 114, 16). Raises ValueError with a message for the user."""
+    if s is None: raise ValueError("RGB vazio")
+    s = s.strip()
+    # HEX: #RRGGBB
+    if s.startswith("#") and len(s)==7:
+        h = s[1:].upper()
+        try:
+            r = int(h[0:2],16); g = int(h[2:4],16); b = int(h[4:6],16)
+            return (r,g,b)
+        except:
+            raise ValueError("HEX inválido. Use #RRGGBB.")
+    # "R,G,B"
+    parts = s.replace(" ","").split(",")
+    if len(parts)==3:
+        try:
+            r = int(parts[0]); g = int(parts[1]); b = int(parts[2])
+        except:
+            raise ValueError("RGB inválido. Use 255,114,16.")
+        for v in (r,g,b):
+            if v<0 or v>255: raise ValueError("Valores RGB devem estar entre 0 e 255.")
+        return (r,g,b)
+    raise ValueError("Formato inválido. Use 255,114,16 ou #FF7210.")
+
+
+def lerp(a, b, t):
+    #type:(int, int, float) -> int
+    return int(round(a + (b-a)*t))
+
+
+def lerp_rgb(color_a, color_b, t):
+    #type:(tuple, tuple, float) -> tuple
+    """(r,g,b) between color_a (t=0) and color_b (t=1)."""
+    return tuple(lerp(a, b, t) for a, b in zip(color_a, color_b))
+
+
+def gradient(color_a, color_b, n):
+    #type:(tuple, tuple, int) -> list
+    """Function to get n colors (r,g,b) from color_a to color_b, both included."""
+    if n < 1:
+        return []
+    if n == 1:
+        return [tuple(color_a)]
+    return [lerp_rgb(color_a, color_b, float(i)/(n-1)) for i in range(n)]
+
+
+def to_revit_color(rgb):
+    #type:(tuple) -> Color
+    return Color(rgb[0], rgb[1], rgb[2])
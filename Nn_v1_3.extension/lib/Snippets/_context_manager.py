@@ -1,9 +1,132 @@
 # -*- coding: utf-8 -*-
-from Autodesk.Revit.DB import Transaction
+from Autodesk.Revit.DB import (Transaction, TransactionGroup, SubTransaction, TransactionStatus,
+                               IFailuresPreprocessor, FailureProcessingResult, FailureSeverity,
+                               FilteredElementCollector)
+from pyrevit import script
 import contextlib
 import traceback
 
 import sys, os
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Diagnostics import Stopwatch
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+#====================================================================================================
+logger  = script.get_logger()
+METRICS = []        # [TransactionMetrics] of named blocks run by this command
+
+
+# ╔═╗╔═╗╦╦  ╦ ╦╦═╗╔═╗  ╔═╗╔═╗╦  ╦╔═╗╦╔═╗╔═╗
+# ╠╣ ╠═╣║║  ║ ║╠╦╝║╣   ╠═╝║ ║║  ║║  ║║╣ ╚═╗
+# ╚  ╩ ╩╩╩═╝╚═╝╩╚═╚═╝  ╩  ╚═╝╩═╝╩╚═╝╩╚═╝╚═╝ FAILURE POLICIES
+#====================================================================================================
+class SwallowWarnings(IFailuresPreprocessor):
+    """Delete warnings (e.g. overlapping elements), so a batch is not interrupted by dialogs.
+    Errors are left to Revit."""
+    def PreprocessFailures(self, failuresAccessor):
+        failuresAccessor.DeleteAllWarnings()
+        return FailureProcessingResult.Continue
+
+
+class RollbackOnError(IFailuresPreprocessor):
+    """Delete warnings and roll back the whole Transaction silently if there is any error."""
+    def PreprocessFailures(self, failuresAccessor):
+        for failure in failuresAccessor.GetFailureMessages():
+            if failure.GetSeverity() != FailureSeverity.Warning:
+                return FailureProcessingResult.ProceedWithRollBack
+        failuresAccessor.DeleteAllWarnings()
+        return FailureProcessingResult.Continue
+
+
+def set_failure_policy(transaction, policy):
+    #type:(Transaction, IFailuresPreprocessor) -> None
+    """Function to set IFailuresPreprocessor (e.g. SwallowWarnings()) of a Transaction before it starts."""
+    options = transaction.GetFailureHandlingOptions()
+    options.SetFailuresPreprocessor(policy)
+    transaction.SetFailureHandlingOptions(options)
+
+
+# ╔╦╗╔═╗╔╦╗╦═╗╦╔═╗╔═╗
+# ║║║║╣  ║ ╠╦╝║║  ╚═╗
+# ╩ ╩╚═╝ ╩ ╩╚═╩╚═╝╚═╝ METRICS
+#====================================================================================================
+def count_elements(doc):
+    #type:(Document) -> int
+    return FilteredElementCollector(doc).WhereElementIsNotElementType().GetElementCount() + \
+           FilteredElementCollector(doc).WhereElementIsElementType().GetElementCount()
+
+
+class TransactionMetrics(object):
+    """Duration, element count delta and regeneration time of a named block."""
+    def __init__(self, name, kind='Transaction'):
+        self.name          = name
+        self.kind          = kind
+        self.status        = None
+        self.duration_ms   = 0.0
+        self.regenerate_ms = 0.0
+        self.element_delta = None
+
+    def __repr__(self):
+        delta = '' if self.element_delta is None else ', {:+d} elements'.format(self.element_delta)
+        return '[{}] {}: {} in {:.0f} ms (regenerate {:.0f} ms{})'.format(
+            self.kind, self.name, self.status, self.duration_ms, self.regenerate_ms, delta)
+
+    def as_dict(self):
+        return {'name': self.name, 'kind': self.kind, 'status': str(self.status),
+                'duration_ms': self.duration_ms, 'regenerate_ms': self.regenerate_ms,
+                'element_delta': self.element_delta}
+
+
+def get_metrics():
+    #type:() -> list
+    """Function to get TransactionMetrics recorded by this command."""
+    return list(METRICS)
+
+
+def print_metrics():
+    for metrics in METRICS:
+        print(metrics)
+
+
+@contextlib.contextmanager
+def _measure(doc, name, kind, track_elements):
+    """Record TransactionMetrics of the wrapped block into METRICS."""
+    metrics = TransactionMetrics(name, kind)
+    before  = count_elements(doc) if track_elements else None
+    timer   = Stopwatch.StartNew()
+    try:
+        yield metrics
+    finally:
+        timer.Stop()
+        metrics.duration_ms = timer.Elapsed.TotalMilliseconds
+        if track_elements:
+            metrics.element_delta = count_elements(doc) - before
+        METRICS.append(metrics)
+        logger.debug(metrics)
+
+
+def _regenerate(doc, metrics):
+    """Regenerate explicitly before commit, so its time is measured (commit does not regenerate again)."""
+    timer = Stopwatch.StartNew()
+    doc.Regenerate()
+    metrics.regenerate_ms += timer.Elapsed.TotalMilliseconds
+
+
+def _report(debug, message):
+    if debug:
+        print("*"*20)
+        print(message)
+        print(traceback.format_exc())
+        print("*"*20)
+    else:
+        logger.debug(message + '\n' + traceback.format_exc())
+
+
 # ╔═╗╔═╗╔╗╔╔╦╗╔═╗═╗ ╦╔╦╗  ╔╦╗╔═╗╔╗╔╔═╗╔═╗╔═╗╦═╗╔═╗
 # ║  ║ ║║║║ ║ ║╣ ╔╩╦╝ ║   ║║║╠═╣║║║╠═╣║ ╦║╣ ╠╦╝╚═╗
 # ╚═╝╚═╝╝╚╝ ╩ ╚═╝╩ ╚═ ╩   ╩ ╩╩ ╩╝╚╝╩ ╩╚═╝╚═╝╩╚═╚═╝ CONTEXT MANAGERS
@@ -12,39 +135,75 @@ import sys, os
 @contextlib.contextmanager
 def try_except(debug=False):
     """ContextManager for Try/Except statement with debug option for except.
-    :param debug: if True - Exception error will be displayed with traceback.format_exc()"""
+    :param debug: if True - Exception error will be displayed with traceback.format_exc(),
+                  otherwise it is logged with pyRevit logger (visible in debug mode)."""
     try:
         yield
     except Exception as e:
-        if debug:
-            print("*"*20)
-            print("Exception occured: " + traceback.format_exc())
-            print("*"*20)
+        _report(debug, "Exception occured: {}".format(e))
 
 
 @contextlib.contextmanager
-def ef_Transaction(doc, title, debug = True, exitscript = False ):
+def ef_Transaction(doc, title, debug = True, exitscript = False, policy = None, track_elements = False):
+    """Transaction that is rolled back on exception. Metrics are recorded in METRICS.
+    :param policy:          IFailuresPreprocessor, e.g. SwallowWarnings() or RollbackOnError()
+    :param track_elements:  Count elements before/after (two extra collectors over the whole model)."""
     t = Transaction(doc, title)
-    t.Start()
+    if policy:
+        set_failure_policy(t, policy)
 
-    try:
-        yield
-        t.Commit()
+    with _measure(doc, title, 'Transaction', track_elements) as metrics:
+        t.Start()
+        try:
+            yield t
+            _regenerate(doc, metrics)
+            metrics.status = t.Commit()
 
-    except Exception as e:
-        if debug:
-            print("*"*20)
-            print("Exception occured - Transaction is being Rollbacked!")
-            print(traceback.format_exc())
-            print("*"*20)
-        t.RollBack()
+        except Exception as e:
+            _report(debug, "Exception occured - Transaction is being Rollbacked!")
+            if t.HasStarted() and not t.HasEnded():
+                metrics.status = t.RollBack()
+
+            if exitscript:
+                print('*Script Excution stopped!*')
+                sys.exit()
 
-        if exitscript:
-            print('*Script Excution stopped!*')
-            sys.exit()
 
+@contextlib.contextmanager
+def ef_TransactionGroup(doc, title, assimilate = True, debug = True, exitscript = False, track_elements = False):
+    """TransactionGroup for batched commits: Transactions inside are merged into a single undo step
+    (Assimilate) or kept as separate steps (assimilate=False). Rolled back on exception."""
+    tg = TransactionGroup(doc, title)
+    with _measure(doc, title, 'TransactionGroup', track_elements) as metrics:
+        tg.Start()
+        try:
+            yield tg
+            metrics.status = tg.Assimilate() if assimilate else tg.Commit()
 
+        except Exception as e:
+            _report(debug, "Exception occured - TransactionGroup is being Rollbacked!")
+            if tg.HasStarted() and not tg.HasEnded():
+                metrics.status = tg.RollBack()
 
+            if exitscript:
+                print('*Script Excution stopped!*')
+                sys.exit()
 
 
+@contextlib.contextmanager
+def ef_SubTransaction(doc, title = 'SubTransaction', debug = True, reraise = False):
+    """SubTransaction inside an open Transaction. Only this block is rolled back on exception.
+    :param reraise: Raise the exception after rollback (so the outer Transaction can react)."""
+    st = SubTransaction(doc)
+    with _measure(doc, title, 'SubTransaction', False) as metrics:
+        st.Start()
+        try:
+            yield st
+            metrics.status = st.Commit()
 
+        except Exception as e:
+            _report(debug, "Exception occured - SubTransaction is being Rollbacked!")
+            if st.HasStarted() and not st.HasEnded():
+                metrics.status = st.RollBack()
+            if reraise:
+                raise
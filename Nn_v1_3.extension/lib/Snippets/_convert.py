@@ -4,6 +4,7 @@
 # ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
 # ==================================================
 from Autodesk.Revit.DB import *
+from array import array
 
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
 # ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
@@ -13,128 +14,132 @@ app      = __revit__.Application
 rvt_year = int(app.VersionNumber)
 
 
-# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
-# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
-# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ╔═╗╔═╗╔═╗╔╦╗╔═╗╦═╗╔═╗
+# ╠╣ ╠═╣║   ║ ║ ║╠╦╝╚═╗
+# ╚  ╩ ╩╚═╝ ╩ ╚═╝╩╚═╚═╝ FACTORS
 # ==================================================
-def convert_internal_units(value, get_internal = True, units='m'):
-    #type: (float, bool, str) -> float
-    """Function to convert Internal units to meters or vice versa.
-    :param value:        Value to convert
-    :param get_internal: True to get internal units, False to get Meters
-    :param units:        Select desired Units: ['m', 'm2']
-    :return:             Length in Internal units or Meters."""
-
+def _get_internal_factors():
+    #type: () -> dict
+    """Function to resolve {units: internal units per 1 unit} for the running Revit version.
+    Conversions are linear, so the API is asked only once per unit on import."""
     if rvt_year >= 2021:
         from Autodesk.Revit.DB import UnitTypeId
-        if   units == 'm' : units = UnitTypeId.Meters
-        elif units == "m2": units = UnitTypeId.SquareMeters
-        elif units == 'cm': units = UnitTypeId.Centimeters
+        units = {'mm': UnitTypeId.Millimeters,
+                 'cm': UnitTypeId.Centimeters,
+                 'm' : UnitTypeId.Meters,
+                 'm2': UnitTypeId.SquareMeters,
+                 'm3': UnitTypeId.CubicMeters}
     else:
         from Autodesk.Revit.DB import DisplayUnitType
-        if   units == 'm' : units = DisplayUnitType.DUT_METERS
-        elif units == "m2": units = DisplayUnitType.DUT_SQUARE_METERS
-        elif units == "cm": units = DisplayUnitType.DUT_CENTIMETERS
-
-    if get_internal:
-        return UnitUtils.ConvertToInternalUnits(value, units)
-    return UnitUtils.ConvertFromInternalUnits(value, units)
-
+        units = {'mm': DisplayUnitType.DUT_MILLIMETERS,
+                 'cm': DisplayUnitType.DUT_CENTIMETERS,
+                 'm' : DisplayUnitType.DUT_METERS,
+                 'm2': DisplayUnitType.DUT_SQUARE_METERS,
+                 'm3': DisplayUnitType.DUT_CUBIC_METERS}
 
+    return {name: UnitUtils.ConvertToInternalUnits(1.0, unit) for name, unit in units.items()}
 
+INTERNAL_PER_UNIT = _get_internal_factors()    # e.g. INTERNAL_PER_UNIT['cm'] -> 0.0328...
 
+MM_TO_FEET  = INTERNAL_PER_UNIT['mm']
+CM_TO_FEET  = INTERNAL_PER_UNIT['cm']
+M_TO_FEET   = INTERNAL_PER_UNIT['m']
+FEET_TO_MM  = 1.0 / MM_TO_FEET
+FEET_TO_CM  = 1.0 / CM_TO_FEET
+FEET_TO_M   = 1.0 / M_TO_FEET
+SQFT_TO_M2  = 1.0 / INTERNAL_PER_UNIT['m2']
+CUFT_TO_M3  = 1.0 / INTERNAL_PER_UNIT['m3']
 
 
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def scale_values(values, factor, in_place=False):
+    """Function to multiply a number or a whole batch of numbers by a factor.
+    :param values:   float | list | tuple | array('d')
+    :param factor:   Conversion factor (e.g. CM_TO_FEET)
+    :param in_place: Overwrite given list/array instead of returning a new one.
+    :return:         Same kind of object that was given (tuple -> list)."""
+    if isinstance(values, (int, float)):
+        return values * factor
 
+    if in_place:
+        for i in range(len(values)):
+            values[i] *= factor
+        return values
 
+    if isinstance(values, array):
+        return array(values.typecode, [v * factor for v in values])
+    return [v * factor for v in values]
 
 
+def to_internal(values, units='cm', in_place=False):
+    """Function to convert a value or a batch of values to Internal units (feet).
+    :param units: ['mm', 'cm', 'm', 'm2', 'm3']"""
+    return scale_values(values, INTERNAL_PER_UNIT[units], in_place)
 
 
+def from_internal(values, units='m', in_place=False):
+    """Function to convert a value or a batch of values from Internal units (feet).
+    :param units: ['mm', 'cm', 'm', 'm2', 'm3']"""
+    return scale_values(values, 1.0 / INTERNAL_PER_UNIT[units], in_place)
 
 
+def convert_internal_units(value, get_internal = True, units='m'):
+    #type: (float, bool, str) -> float
+    """Function to convert Internal units to meters or vice versa.
+    :param value:        Value to convert (or list/array('d') of values)
+    :param get_internal: True to get internal units, False to get Meters
+    :param units:        Select desired Units: ['mm', 'cm', 'm', 'm2', 'm3']
+    :return:             Length in Internal units or Meters."""
+    if get_internal:
+        return to_internal(value, units)
+    return from_internal(value, units)
 
 
+def get_spec(definition):
+    #type:(Definition) -> any
+    """Function to get the spec of a parameter Definition for UnitFormatUtils
+    (ForgeTypeId in Revit 2021+, UnitType in older versions)."""
+    if rvt_year >= 2022:
+        return definition.GetDataType()
+    if rvt_year >= 2021:
+        return definition.GetSpecTypeId()
+    return definition.UnitType
 
 
+def format_value(doc, value, spec):
+    #type:(Document, float, any) -> str
+    """Function to format a value in internal units with project units of the Document (e.g. '2.50 m²').
+    :param spec: see get_spec"""
+    try:
+        if rvt_year >= 2021:
+            return UnitFormatUtils.Format(doc.GetUnits(), spec, value, False)
+        return UnitFormatUtils.Format(doc.GetUnits(), spec, value, False, False)
+    except Exception:
+        return '{:.2f}'.format(value)   # Spec without units (e.g. invalid for UnitFormatUtils)
 
 
 # ╔═╗╔╗ ╔═╗╔═╗╦  ╔═╗╔╦╗╔═╗
 # ║ ║╠╩╗╚═╗║ ║║  ║╣  ║ ║╣
-# ╚═╝╚═╝╚═╝╚═╝╩═╝╚═╝ ╩ ╚═╝ OBSOLETE ( still need to refactor the code)
+# ╚═╝╚═╝╚═╝╚═╝╩═╝╚═╝ ╩ ╚═╝ OBSOLETE ( kept for older scripts - use to_internal/from_internal )
 def convert_cm_to_feet(length):
     """Function to convert cm to feet."""
-
-    # RVT >= 2022
-    if rvt_year < 2022:
-        from Autodesk.Revit.DB import DisplayUnitType
-        return UnitUtils.Convert(length,
-                                DisplayUnitType.DUT_CENTIMETERS,
-                                DisplayUnitType.DUT_DECIMAL_FEET)
-    # RVT >= 2022
-    else:
-        from Autodesk.Revit.DB import UnitTypeId
-        return UnitUtils.ConvertToInternalUnits(length, UnitTypeId.Centimeters)
+    return length * CM_TO_FEET
 
 def convert_m_to_feet(length):
-    """Function to convert cm to feet."""
-
-    # RVT >= 2022
-    if rvt_year < 2022:
-        from Autodesk.Revit.DB import DisplayUnitType
-        return UnitUtils.Convert(length,
-                                 DisplayUnitType.DUT_METERS,
-                                 DisplayUnitType.DUT_DECIMAL_FEET)
-    # RVT >= 2022
-    else:
-        from Autodesk.Revit.DB import UnitTypeId
-        return UnitUtils.ConvertToInternalUnits(length, UnitTypeId.Meters)
-
-
+    """Function to convert m to feet."""
+    return length * M_TO_FEET
 
 def convert_internal_to_m(length):
     """Function to convert internal to meters."""
-
-    # RVT >= 2022
-    if rvt_year < 2022:
-        from Autodesk.Revit.DB import DisplayUnitType
-        return UnitUtils.Convert(length,
-                                 DisplayUnitType.DUT_DECIMAL_FEET,
-                                 DisplayUnitType.DUT_METERS)
-    # RVT >= 2022
-    else:
-        from Autodesk.Revit.DB import UnitTypeId
-        return UnitUtils.ConvertFromInternalUnits(length, UnitTypeId.Meters)
-
-
+    return length * FEET_TO_M
 
 def convert_internal_to_cm(length):
     """Function to convert internal to centimeters."""
-
-    # RVT >= 2022
-    if rvt_year < 2022:
-        from Autodesk.Revit.DB import DisplayUnitType
-        return UnitUtils.Convert(length,
-                                 DisplayUnitType.DUT_DECIMAL_FEET,
-                                 DisplayUnitType.DUT_CENTIMETERS)
-    # RVT >= 2022
-    else:
-        from Autodesk.Revit.DB import UnitTypeId
-        return UnitUtils.ConvertFromInternalUnits(length, UnitTypeId.Centimeters)
-
-
-
+    return length * FEET_TO_CM
 
 def convert_internal_to_m2(area):
-    """Function to convert internal to meters."""
-
-    # RVT >= 2022
-    if rvt_year < 2022:
-        from Autodesk.Revit.DB import DisplayUnitType
-        return UnitUtils.Convert(area,
-                                 DisplayUnitType.DUT_SQUARE_FEET,
-                                 DisplayUnitType.DUT_SQUARE_METERS)
-    # RVT >= 2022
-    else:
-        from Autodesk.Revit.DB import UnitTypeId
-        return UnitUtils.ConvertFromInternalUnits(area, UnitTypeId.SquareMeters)
\ No newline at end of file
+    """Function to convert internal to square meters."""
+    return area * SQFT_TO_M2
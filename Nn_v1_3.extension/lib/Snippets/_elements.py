@@ -2,8 +2,7 @@ from Autodesk.Revit.DB import *
 
 
 
-all_floor_types = FilteredElementCollector(doc).OfCategory(
-    BuiltInCategory.OST_Floors).WhereElementIsElementType().ToElements()
+# all_floor_types -> Snippets._filtered_element_collector.FEC.all_floor_types
 
 def dict_name_element(given_elements, dotNet=False):
     dict_output = {Element.Name.GetValue(fr): fr for fr in given_elements}
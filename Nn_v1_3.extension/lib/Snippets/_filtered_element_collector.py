@@ -1,106 +1,158 @@
 #>>>>>>>>>> IMPORTS
 from Autodesk.Revit.DB import *
 
+#>>>>>>>>>> CUSTOM IMPORTS
+from Snippets._cache import DocumentCache
+
 #>>>>>>>>>> .NET IMPORTS
 import clr, sys
 clr.AddReference("System")
 from System.Collections.Generic import List
 
 #>>>>>>>>>> VARIABLES
-doc = __revit__.ActiveUIDocument.Document
-uidoc = __revit__.ActiveUIDocument
-app = __revit__.Application
-
-
-#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> FilteredElementCollector(doc).
-
-all_text               = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TextNotes).WhereElementIsNotElementType().ToElements()
-
-all_lines               = FilteredElementCollector(doc, doc.ActiveView.Id).WherePasses(ElementClassFilter(CurveElement)).ToElements()
-all_rooms               = FilteredElementCollector(doc).WherePasses(ElementCategoryFilter(BuiltInCategory.OST_Rooms)).ToElements()
-all_doors               = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements()
-all_windows             = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Windows).WhereElementIsNotElementType().ToElements()
-all_floors              = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Floors).WhereElementIsNotElementType().ToElements()
-all_structural_columns  = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_StructuralColumns).WhereElementIsNotElementType().ToElements()
-all_columns             = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_StructuralColumns).WhereElementIsNotElementType().ToElements()
-all_walls               = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType().ToElements()
-all_generic_models      = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_GenericModel).WhereElementIsNotElementType().ToElements()
-
-#>>>>>>>>>> ANNOTATIONS
-all_revision_clouds     = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_RevisionClouds).WhereElementIsNotElementType().ToElements()
-
-#>>>>>>>>>> VIEWS
-all_views               = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).ToElements()
-all_legends             = [view for view in all_views if view.ViewType == ViewType.Legend]
-all_sheets              = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets).WhereElementIsNotElementType().ToElements()
-
-#>>>>>>>>>> TAGS
-view_window_tags        = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_WindowTags).WhereElementIsNotElementType().ToElements()
-view_doors_tags         = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_DoorTags).WhereElementIsNotElementType().ToElements()
-
-#>>>>>>>>>> DOC
-all_Categories = doc.Settings.Categories
-
-#>>>>>>>>>> SPECIAL
-materials    = FilteredElementCollector(doc).OfClass(Material)
-all_worksets = FilteredWorksetCollector(doc).OfKind(WorksetKind.UserWorkset).ToWorksets()
-
-
-
-
-
-# ElementMulticategoryFilter
-list_of_categories  = List[BuiltInCategory]([BuiltInCategory.OST_Walls, BuiltInCategory.OST_Floors, BuiltInCategory.OST_Roofs])
-multi_cat_filter    = ElementMulticategoryFilter(list_of_categories)
-all_builtin_types   = FilteredElementCollector(doc).WherePasses(multi_cat_filter).ToElements()
-
-
-
-
-
-
-#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
-#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
-#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
-#
-# #>>>>>>>>>> CREATE FILTER
-# def create_filter(key_parameter, element_value):
-#     """Function to create a RevitAPI filter."""
-#     f_parameter         = ParameterValueProvider(ElementId(key_parameter))  #sheet.SheetNumber
-#     f_parameter_value   = element_value #e.g. element.Category.Id           #element.GetPara
-#     f_rule              = FilterElementIdRule(f_parameter, FilterNumericEquals(), f_parameter_value)
-#
-#     return ElementParameterFilter(f_rule)
-#
-#
-#
-# random_view = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).FirstElement()
-#
-# def get_sheet_from_view():
-#
-#     sheet              = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets).WhereElementIsNotElementType().ToElements()
-#
-#     filter_sheets   = ElementCategoryFilter(BuiltInCategory.OST_Sheets)
-#     filter_specific_view_id = []
-#
-#     list_of_filters = List[ElementFilter]()
-#
-#
-#
-#
-#     filter = create_filter(key_parameter=BuiltInParameter.ELEM_TYPE_PARAM,
-#                            element_value=element.GetTypeId())
-#     list_of_filters.Add(filter)
-#
-#
-#
-#     if list_of_filters:
-#         # COMBINE FILTERS
-#         multiple_filters = LogicalOrFilter(list_of_filters)
-#
-#
-#     elems = FilteredElementCollector(doc).WherePasses(multiple_filters).ToElementIds()
-
-
-
-
+_CACHE = DocumentCache('filtered_element_collector')
+
+
+#>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> LAZY COLLECTIONS
+class collected(object):
+    """Decorator for queries of LazyCollector.
+    The query runs on first access and the result is memoized per Document
+    until the Document changes (see Snippets._cache.DocumentCache)."""
+    def __init__(self, query):
+        self.query   = query
+        self.name    = query.__name__
+        self.__doc__ = query.__doc__
+
+    def __get__(self, collector, owner):
+        if collector is None:
+            return self
+        doc = collector.doc
+        return _CACHE.get(doc, self.name, lambda: self.query(doc))
+
+
+class LazyCollector(object):
+    """Namespace of common FilteredElementCollector queries.
+    Nothing is collected on import - each attribute is collected on first access.
+
+    Example:
+        from Snippets._filtered_element_collector import FEC
+        for legend in FEC.all_legends: ...          # Active Document
+        walls = LazyCollector(link_doc).all_walls   # Any other Document"""
+
+    def __init__(self, doc=None):
+        self._doc = doc
+
+    @property
+    def doc(self):
+        #type:() -> Document
+        """Given Document or the Document that is active at the moment of access."""
+        return self._doc or __revit__.ActiveUIDocument.Document
+
+    def invalidate(self):
+        """Forget collected elements of this Document (done automatically on DocumentChanged)."""
+        _CACHE.invalidate(self.doc)
+
+    def lines_in_view(self, view=None):
+        """CurveElements visible in the given View (ActiveView if None)."""
+        doc     = self.doc
+        view_id = view.Id if view else doc.ActiveView.Id
+        return _CACHE.get(doc, ('all_lines', view_id.IntegerValue),
+                          lambda: FilteredElementCollector(doc, view_id).WherePasses(ElementClassFilter(CurveElement)).ToElements())
+
+    @property
+    def all_lines(self):
+        return self.lines_in_view()
+
+    #>>>>>>>>>> MODEL
+    @collected
+    def all_text(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TextNotes).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_rooms(doc):
+        return FilteredElementCollector(doc).WherePasses(ElementCategoryFilter(BuiltInCategory.OST_Rooms)).ToElements()
+
+    @collected
+    def all_doors(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Doors).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_windows(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Windows).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_floors(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Floors).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_floor_types(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Floors).WhereElementIsElementType().ToElements()
+
+    @collected
+    def all_structural_columns(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_StructuralColumns).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_columns(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_StructuralColumns).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_walls(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def all_generic_models(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_GenericModel).WhereElementIsNotElementType().ToElements()
+
+    #>>>>>>>>>> ANNOTATIONS
+    @collected
+    def all_revision_clouds(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_RevisionClouds).WhereElementIsNotElementType().ToElements()
+
+    #>>>>>>>>>> VIEWS
+    @collected
+    def all_views(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).ToElements()
+
+    @property
+    def all_legends(self):
+        return _CACHE.get(self.doc, 'all_legends',
+                          lambda: [view for view in self.all_views if view.ViewType == ViewType.Legend])
+
+    @collected
+    def all_sheets(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets).WhereElementIsNotElementType().ToElements()
+
+    #>>>>>>>>>> TAGS
+    @collected
+    def view_window_tags(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_WindowTags).WhereElementIsNotElementType().ToElements()
+
+    @collected
+    def view_doors_tags(doc):
+        return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_DoorTags).WhereElementIsNotElementType().ToElements()
+
+    #>>>>>>>>>> DOC
+    @property
+    def all_Categories(self):
+        return self.doc.Settings.Categories
+
+    #>>>>>>>>>> SPECIAL
+    @collected
+    def materials(doc):
+        return FilteredElementCollector(doc).OfClass(Material).ToElements()
+
+    @collected
+    def all_worksets(doc):
+        return FilteredWorksetCollector(doc).OfKind(WorksetKind.UserWorkset).ToWorksets()
+
+    @collected
+    def all_builtin_types(doc):
+        # ElementMulticategoryFilter
+        list_of_categories = List[BuiltInCategory]([BuiltInCategory.OST_Walls, BuiltInCategory.OST_Floors, BuiltInCategory.OST_Roofs])
+        multi_cat_filter   = ElementMulticategoryFilter(list_of_categories)
+        return FilteredElementCollector(doc).WherePasses(multi_cat_filter).ToElements()
+
+
+#>>>>>>>>>> ACTIVE DOCUMENT
+FEC = LazyCollector()
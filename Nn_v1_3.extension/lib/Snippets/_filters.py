@@ -13,14 +13,25 @@ from pyrevit.forms import alert
 doc   = __revit__.ActiveUIDocument.Document     # Document   class from RevitAPI that represents project. Used to Create, Delete, Modify and Query elements from the project.
 uidoc = __revit__.ActiveUIDocument              # UIDocument class from RevitAPI that represents Revit project opened in the Revit UI.
 app   = __revit__.Application                   # Represents the Autodesk Revit Application, providing access to documents, options and other application wide data and settings.
+rvt_year = int(app.VersionNumber)
 
 # ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
 # ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
 # ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
 # ==================================================
+def get_parameter_id(key_parameter):
+    #type:(any) -> ElementId
+    """Function to get ElementId of a BuiltInParameter.
+    ElementId of a Shared/Project parameter is returned unchanged."""
+    if isinstance(key_parameter, ElementId):
+        return key_parameter
+    return ElementId(key_parameter)
+
+
 def create_filter(key_parameter, element_value):
-    """Function to create a RevitAPI filter."""
-    f_parameter = ParameterValueProvider(ElementId(key_parameter))
+    """Function to create a RevitAPI filter.
+    :param key_parameter: BuiltInParameter or ElementId of a Shared/Project parameter."""
+    f_parameter = ParameterValueProvider(get_parameter_id(key_parameter))
     f_parameter_value = element_value  # e.g. element.Category.Id
     f_rule = FilterElementIdRule(f_parameter, FilterNumericEquals(), f_parameter_value)
     filter = ElementParameterFilter(f_rule)
@@ -31,17 +42,48 @@ def create_filter(key_parameter, element_value):
 # group = FilteredElementCollector(doc).WherePasses(filter).FirstElement()
 
 
+def create_string_rule(key_parameter, element_value, caseSensitive = True):
+    #type:(BuiltInParameter, str, bool) -> FilterStringRule
+    """Function to create FilterStringRule(Equals) for any Revit version.
+    key_parameter is a BuiltInParameter or ElementId of a Shared/Project parameter.
+    caseSensitive argument was removed from FilterStringRule in RVT 2022+ (rules are case sensitive)."""
+    f_parameter = ParameterValueProvider(get_parameter_id(key_parameter))
+    if rvt_year < 2022:
+        return FilterStringRule(f_parameter, FilterStringEquals(), element_value, caseSensitive)
+    return FilterStringRule(f_parameter, FilterStringEquals(), element_value)
+
+
+def create_string_equals_filter(key_parameter, element_value, caseSensitive = True):
+    """Function to create ElementParameterFilter based on FilterStringRule."""
+    return ElementParameterFilter(create_string_rule(key_parameter, element_value, caseSensitive))
+
+
+def create_rule(key_parameter, element_value, epsilon = 1e-6):
+    #type:(BuiltInParameter, any, float) -> FilterRule
+    """Function to create an Equals FilterRule that matches the type of the given value.
+    :param key_parameter: BuiltInParameter or ElementId of a Shared/Project parameter.
+    :param element_value: ElementId | str | int | float
+    :param epsilon:       Tolerance used for float values.
+    :return:              FilterRule"""
+    f_parameter = ParameterValueProvider(get_parameter_id(key_parameter))
+
+    if isinstance(element_value, ElementId):
+        return FilterElementIdRule(f_parameter, FilterNumericEquals(), element_value)
+    if isinstance(element_value, basestring):
+        return create_string_rule(key_parameter, element_value)
+    if isinstance(element_value, float):
+        return FilterDoubleRule(f_parameter, FilterNumericEquals(), element_value, epsilon)
+    return FilterIntegerRule(f_parameter, FilterNumericEquals(), int(element_value))
+
+
 def get_family_types(family_name):
     """Function to get FamilyTypes of a given FamilyName. It has to be written exactly the same."""
-    pvp         = ParameterValueProvider(ElementId(BuiltInParameter.ALL_MODEL_FAMILY_NAME))
-    condition   = FilterStringEquals()
-    ruleValue   = family_name
-    fRule       = FilterStringRule(pvp, condition, ruleValue, True)
-    my_filter   = ElementParameterFilter(fRule)
+    my_filter = create_string_equals_filter(BuiltInParameter.ALL_MODEL_FAMILY_NAME, family_name)
 
-    family_types = FilteredElementCollector(doc).WherePasses(my_filter).WhereElementIsElementType().ToElements()
+    # Quick filter (types only) goes first, string rule is evaluated on the remaining elements.
+    family_types = FilteredElementCollector(doc).WhereElementIsElementType().WherePasses(my_filter).ToElements()
 
     if not family_types:
-        alert("Could not find a Family with a name: " + ruleValue, title = 'Family Not Found.', exitscript=True)
+        alert("Could not find a Family with a name: " + family_name, title = 'Family Not Found.', exitscript=True)
 
-    return family_types
\ No newline at end of file
+    return family_types
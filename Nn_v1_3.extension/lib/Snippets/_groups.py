@@ -10,12 +10,73 @@ from pyrevit import forms
 
 # CUSTOM IMPORTS
 from GUI.forms           import select_from_dict
+from Snippets._cache     import DocumentCache
 
 
 default_doc     = __revit__.ActiveUIDocument.Document
 default_uidoc   = __revit__.ActiveUIDocument
 default_app     = __revit__.Application
 
+_GROUP_INDEXES  = DocumentCache('attached_group_index')
+
+
+def get_group_type_name(group_type):
+    #type:(GroupType) -> str
+    return group_type.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_NAME).AsString()
+
+
+class AttachedGroupIndex(object):
+    """Model Groups of a Document and their attached Detail Group types, resolved once.
+    - instances: {model GroupType id: [Group]}
+    - attached:  {model GroupType id: {attached group name: attached GroupType ElementId}}
+    Keys are ElementId.IntegerValue.
+    Attached types are resolved once per model GroupType (not per instance) and
+    every attached type name is read only once."""
+
+    def __init__(self, doc):
+        self.doc       = doc
+        self.instances = {}
+        self.attached  = {}
+        self._names    = {}     # {attached GroupType id: name}
+
+        for group in FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_IOSModelGroups)\
+                                                  .WhereElementIsNotElementType():
+            self.instances.setdefault(group.GetTypeId().IntegerValue, []).append(group)
+
+        for type_id, groups in self.instances.items():
+            attached = {}
+            for a_group_id in groups[0].GetAvailableAttachedDetailGroupTypeIds():
+                name = self._names.get(a_group_id.IntegerValue)
+                if name is None:
+                    name = get_group_type_name(doc.GetElement(a_group_id))
+                    self._names[a_group_id.IntegerValue] = name
+                if name:
+                    attached[name] = a_group_id
+            self.attached[type_id] = attached
+
+    def get_attached_ids(self, group, names=None):
+        #type:(Group, list) -> list
+        """Function to get ids of attached group types of given model group.
+        :param names: Names of attached groups to keep. All attached groups if None."""
+        attached = self.attached.get(group.GetTypeId().IntegerValue, {})
+        if names is None:
+            return list(attached.values())
+        return [attached[name] for name in names if name in attached]
+
+    def get_groups_in_view(self, view):
+        #type:(View) -> list
+        """Function to get indexed model groups visible in the given view."""
+        visible = set(e_id.IntegerValue for e_id in FilteredElementCollector(self.doc, view.Id)
+                                                        .OfCategory(BuiltInCategory.OST_IOSModelGroups)
+                                                        .WhereElementIsNotElementType().ToElementIds())
+        return [group for groups in self.instances.values() for group in groups if group.Id.IntegerValue in visible]
+
+
+def get_attached_group_index(doc=default_doc):
+    #type:(Document) -> AttachedGroupIndex
+    """Function to get AttachedGroupIndex of the Document (built once, rebuilt after the document changes)."""
+    return _GROUP_INDEXES.get(doc, 'index', lambda: AttachedGroupIndex(doc))
+
 
 
 def select_group_types(given_groups = None, uidoc = default_uidoc ,title='__title__', version = 'Version 0.1' ,exit_if_none = False):
@@ -58,13 +119,11 @@ def select_attached_groups(list_of_groups, uidoc = default_uidoc, title="__title
     """
     dict_of_attached_group_names = {}
 
-    for g in list_of_groups:
-        attached_groups_ids = g.GetAvailableAttachedDetailGroupTypeIds()
-        for a_group_id in attached_groups_ids:
-            a_group = uidoc.Document.GetElement(a_group_id)
-            a_group_name = a_group.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_NAME).AsString()
-            if a_group_name and a_group_name not in dict_of_attached_group_names:
-                dict_of_attached_group_names[a_group_name] = a_group
+    index = get_attached_group_index(uidoc.Document)
+    for type_id in set(g.GetTypeId().IntegerValue for g in list_of_groups):
+        for a_group_name, a_group_id in index.attached.get(type_id, {}).items():
+            if a_group_name not in dict_of_attached_group_names:
+                dict_of_attached_group_names[a_group_name] = uidoc.Document.GetElement(a_group_id)
 
 
     selected_a_groups = select_from_dict(elements_dict = dict_of_attached_group_names,
@@ -88,17 +147,43 @@ def show_attached_group(view, group, list_a_group_names_to_show, uidoc = default
     :param list_a_group_names_to_show:
     :return:
     """
-    all_attached_groups = group.GetAvailableAttachedDetailGroupTypeIds()
-    attached_group_id = None
-    # print("\n\nAtached Groups:")
-    for a_group_id in all_attached_groups:
-        a_group = uidoc.Document.GetElement(a_group_id)
-        a_group_name = a_group.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_NAME).AsString()
-        # print(a_group_name)
-        if a_group_name in list_a_group_names_to_show:
-            attached_group_id = a_group_id
-
-
-    if attached_group_id:
+    index = get_attached_group_index(uidoc.Document)
+    for attached_group_id in index.get_attached_ids(group, list_a_group_names_to_show):
         print("Showing attached group on the group [{}] in view - [{}]".format(group.Id, view.Name))
-        group.ShowAttachedDetailGroups(view,attached_group_id )
+        group.ShowAttachedDetailGroups(view, attached_group_id)
+
+
+
+
+def show_attached_groups_in_views(views, list_a_group_names_to_show, groups=None, uidoc = default_uidoc,
+                                  transaction_name='Show Attached Groups'):
+    #type:(list, list, list, UIDocument, str) -> list
+    """Function to show attached groups that match list_a_group_names_to_show
+    for every model group in each of the given views, in a single Transaction.
+    An attached group that can't be shown (e.g. made for another view type) is counted as failed,
+    the rest of the batch continues.
+    :param views:   Views where attached groups should be shown.
+    :param groups:  Model groups to use. All groups visible in each view if None.
+    :return:        [(view, number of attached groups shown, [(group, reason)] failed)]"""
+    doc    = uidoc.Document
+    index  = get_attached_group_index(doc)
+    counts = []
+
+    t = Transaction(doc, transaction_name)
+    t.Start()
+    try:
+        for view in views:
+            n_shown, failed = 0, []
+            for group in (groups if groups is not None else index.get_groups_in_view(view)):
+                for attached_group_id in index.get_attached_ids(group, list_a_group_names_to_show):
+                    try:
+                        group.ShowAttachedDetailGroups(view, attached_group_id)
+                        n_shown += 1
+                    except Exception as e:
+                        failed.append((group, str(e)))
+            counts.append((view, n_shown, failed))
+        t.Commit()
+    except:
+        t.RollBack()
+        raise
+    return counts
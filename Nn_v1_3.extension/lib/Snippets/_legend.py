@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import *
+
+# CUSTOM IMPORTS
+from Snippets._cache   import DocumentCache
+from Snippets._convert import CM_TO_FEET
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+_PATTERNS = DocumentCache('solid_fill_pattern', session=True)
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_solid_fill_pattern_id(doc):
+    #type:(Document) -> ElementId
+    """Function to get Id of the drafting <Solid fill> FillPatternElement (cached per document).
+    :return: ElementId or ElementId.InvalidElementId if there is none."""
+    def find_solid_fill():
+        for pattern in FilteredElementCollector(doc).OfClass(FillPatternElement):
+            fill = pattern.GetFillPattern()
+            if fill.IsSolidFill and fill.Target == FillPatternTarget.Drafting:
+                return pattern.Id
+        return ElementId.InvalidElementId
+    return _PATTERNS.get(doc, 'solid_fill', find_solid_fill)
+
+
+def rectangle_loop(width, height):
+    #type:(float, float) -> CurveLoop
+    """Function to create a rectangle CurveLoop with its top-left corner at origin."""
+    points = [XYZ(0, 0, 0), XYZ(width, 0, 0), XYZ(width, -height, 0), XYZ(0, -height, 0)]
+    loop   = CurveLoop()
+    for n, point in enumerate(points):
+        loop.Append(Line.CreateBound(point, points[(n + 1) % len(points)]))
+    return loop
+
+
+def to_color(color):
+    #type:(any) -> Color
+    """(r, g, b) or Color -> Color"""
+    if color is None or isinstance(color, Color):
+        return color
+    return Color(color[0], color[1], color[2])
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class LegendRow(object):
+    """Single row of a legend: optional color swatch followed by text cells."""
+    def __init__(self, cells, color=None, bold=False):
+        #type:(list, any, bool) -> None
+        """:param cells: list of texts, one per column
+        :param color: (r, g, b) / Color of the swatch or None for no swatch
+        :param bold:  Bold text (e.g. header)"""
+        self.cells = [str(cell) if cell not in (None, '') else '-' for cell in cells]
+        self.color = to_color(color)
+        self.bold  = bold
+
+
+class LegendBuilder(object):
+    """Table/Legend of FilledRegion swatches, TextNotes and separator lines built in one Transaction.
+    Types are resolved once, the swatch CurveLoop and separator Line are built once and
+    moved with a Transform for every row, all separators are created with one NewDetailCurveArray call.
+    One OverrideGraphicSettings (solid fill + color) is created per unique color.
+
+    Sizes are given in cm on paper and scaled by view.Scale.
+
+    Example:
+        rows    = [LegendRow([m.Name, '{},{},{}'.format(m.Color.Red, m.Color.Green, m.Color.Blue)], color=m.Color)
+                   for m in materials]
+        builder = LegendBuilder(doc, doc.ActiveView, column_widths=[6, 3])
+        created = builder.build(rows, header=LegendRow(['Material', 'RGB'], bold=True))"""
+
+    def __init__(self, doc, view, column_widths=(6.0, 3.0), row_height=0.8, swatch_width=1.5,
+                 padding=0.15, origin=None, text_type_id=None, region_type_id=None, separators=True):
+        #type:(Document, View, list, float, float, float, XYZ, ElementId, ElementId, bool) -> None
+        scale = view.Scale if view.Scale > 0 else 1
+        feet  = CM_TO_FEET * scale
+
+        self.doc            = doc
+        self.view           = view
+        self.column_widths  = [w * feet for w in column_widths]
+        self.row_height     = row_height   * feet
+        self.swatch_width   = swatch_width * feet
+        self.padding        = padding      * feet
+        self.origin         = origin or XYZ(0, 0, 0)
+        self.total_width    = self.swatch_width + sum(self.column_widths)
+        self.separators     = separators
+
+        #>>>>>>>>>> TYPES (resolved once)
+        self.text_type_id   = text_type_id   or doc.GetDefaultElementTypeId(ElementTypeGroup.TextNoteType)
+        self.region_type_id = region_type_id or doc.GetDefaultElementTypeId(ElementTypeGroup.FilledRegionType)
+        self.solid_fill_id  = get_solid_fill_pattern_id(doc)
+
+        #>>>>>>>>>> TEMPLATES (moved to each row with a Transform)
+        inset               = self.padding
+        self.swatch_loop    = CurveLoop.CreateViaTransform(
+                                    rectangle_loop(self.swatch_width - 2 * inset, self.row_height - 2 * inset),
+                                    Transform.CreateTranslation(XYZ(inset, -inset, 0)))
+        self.separator_line = Line.CreateBound(XYZ(0, 0, 0), XYZ(self.total_width, 0, 0))
+        self.overrides      = {}    # {(r, g, b): OverrideGraphicSettings}
+
+    def get_overrides(self, color):
+        #type:(Color) -> OverrideGraphicSettings
+        """Function to get shared OverrideGraphicSettings for given swatch color."""
+        key = (color.Red, color.Green, color.Blue)
+        if key not in self.overrides:
+            settings = OverrideGraphicSettings()
+            if self.solid_fill_id != ElementId.InvalidElementId:
+                settings.SetSurfaceForegroundPatternId(self.solid_fill_id)
+            settings.SetSurfaceForegroundPatternColor(color)
+            self.overrides[key] = settings
+        return self.overrides[key]
+
+    def create_text(self, x, y, text, bold):
+        #type:(float, float, str, bool) -> TextNote
+        text_note = TextNote.Create(self.doc, self.view.Id, XYZ(x, y, 0), text, self.text_type_id)
+        if bold:
+            formatted_text = FormattedText(text)
+            formatted_text.SetBoldStatus(True)
+            text_note.SetFormattedText(formatted_text)
+        return text_note
+
+    def add_row(self, row, top, created):
+        #type:(LegendRow, float, dict) -> None
+        """Function to create elements of a single row with its top edge at given Y."""
+        x0, y = self.origin.X, self.origin.Y + top
+
+        #1️⃣ SWATCH
+        if row.color is not None:
+            move   = Transform.CreateTranslation(XYZ(x0, y, self.origin.Z))
+            loops  = List[CurveLoop]([CurveLoop.CreateViaTransform(self.swatch_loop, move)])
+            region = FilledRegion.Create(self.doc, self.region_type_id, self.view.Id, loops)
+            self.view.SetElementOverrides(region.Id, self.get_overrides(row.color))
+            created['regions'].append(region.Id)
+
+        #2️⃣ TEXT CELLS
+        x = x0 + self.swatch_width
+        for text, width in zip(row.cells, self.column_widths):
+            created['texts'].append(self.create_text(x + self.padding, y - self.padding, text, row.bold).Id)
+            x += width
+
+    def build(self, rows, header=None, transaction_name='Create Legend'):
+        #type:(list, LegendRow, str) -> dict
+        """Function to create the whole legend.
+        A Transaction is started only if the document is not modifiable already.
+        :return: {'regions': [ElementId], 'texts': [ElementId], 'lines': [ElementId]}"""
+        rows    = ([header] if header else []) + list(rows)
+        created = {'regions': [], 'texts': [], 'lines': []}
+
+        t = None
+        if not self.doc.IsModifiable:
+            t = Transaction(self.doc, transaction_name)
+            t.Start()
+        try:
+            separators = CurveArray()
+            for n, row in enumerate(rows):
+                top = -n * self.row_height
+                self.add_row(row, top, created)
+                if self.separators:
+                    move = Transform.CreateTranslation(XYZ(self.origin.X, self.origin.Y + top - self.row_height, self.origin.Z))
+                    separators.Append(self.separator_line.CreateTransformed(move))
+
+            if not separators.IsEmpty:
+                for line in self.doc.Create.NewDetailCurveArray(self.view, separators):
+                    created['lines'].append(line.Id)
+            if t:
+                t.Commit()
+        except:
+            if t:
+                t.RollBack()
+            raise
+        return created
@@ -5,6 +5,11 @@
 # ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝
 #==================================================
 from Autodesk.Revit.DB import *
+from array import array
+import math
+
+# CUSTOM IMPORTS
+from Snippets._cache import DocumentCache
 
 
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
@@ -19,56 +24,161 @@ active_view_id      = doc.ActiveView.Id
 active_view         = doc.GetElement(active_view_id)
 active_view_level   = active_view.GenLevel
 
+# Sampling modes of sample_curves
+STEP, FIT, COUNT = 'step', 'fit', 'count'
+TOLERANCE        = 1e-9
+
+_LINE_STYLES = DocumentCache('line_styles', session=True)
+
+# OST_Lines subcategories that can't be assigned to DetailLines
+NON_DETAIL_LINE_CATEGORIES = ['OST_SketchLines',
+                              'OST_RoomSeparationLines',
+                              'OST_AreaSchemeLines',
+                              'OST_MEPSpaceSeparationLines',
+                              'OST_AxisOfRotation',
+                              'OST_InsulationLines']
+
 # ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
 # ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
 # ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
 #==================================================
 
+def get_sample_distances(length, step=None, count=None, mode=STEP):
+    #type:(float, float, int, str) -> list
+    """Function to get distances along a curve of given length where points are sampled.
+    - STEP:  0, step, 2*step, ... (remainder is left at the end)
+    - FIT:   closest step that divides the curve evenly (remainder is split), both ends included
+    - COUNT: count points evenly, both ends included (single point is in the middle)"""
+    if mode == COUNT:
+        if not count or count < 1:
+            return []
+        if count == 1:
+            return [length / 2.0]
+        return [length * i / (count - 1) for i in range(count)]
+
+    if not step or step <= 0:
+        raise ValueError('Step has to be positive: {}'.format(step))
+    if mode == FIT:
+        n = max(1, int(round(length / step)))
+        return [length * i / n for i in range(n + 1)]
+    n = int((length + TOLERANCE) / step)
+    return [step * i for i in range(n + 1)]
+
+
+def _sample_line(curve, distances, coords):
+    """Points of a Line: start + direction * distance."""
+    start, direction = curve.GetEndPoint(0), curve.Direction
+    x, y, z    = start.X, start.Y, start.Z
+    dx, dy, dz = direction.X, direction.Y, direction.Z
+    for d in distances:
+        coords.extend((x + dx * d, y + dy * d, z + dz * d))
+
+
+def _sample_arc(curve, distances, coords):
+    """Points of an Arc: center + r * (cos(t) * XDirection + sin(t) * YDirection), t = t0 + distance / r."""
+    center, r = curve.Center, curve.Radius
+    x_dir, y_dir = curve.XDirection, curve.YDirection
+    t0 = curve.GetEndParameter(0) if curve.IsBound else 0.0
+    cx, cy, cz = center.X, center.Y, center.Z
+    for d in distances:
+        t = t0 + d / r
+        c, s = r * math.cos(t), r * math.sin(t)
+        coords.extend((cx + c * x_dir.X + s * y_dir.X,
+                       cy + c * x_dir.Y + s * y_dir.Y,
+                       cz + c * x_dir.Z + s * y_dir.Z))
+
+
+def _sample_tessellated(curve, distances, coords, length):
+    """Points of any other curve (splines, ellipses...) interpolated along curve.Tessellate().
+    Distances are scaled to the length of the polyline, so both ends match."""
+    points = [(p.X, p.Y, p.Z) for p in curve.Tessellate()]
+    cumulative = [0.0]
+    for (x0, y0, z0), (x1, y1, z1) in zip(points, points[1:]):
+        cumulative.append(cumulative[-1] + math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2 + (z1 - z0) ** 2))
+    scale = cumulative[-1] / length if length else 0.0
+
+    i, last = 0, len(points) - 1
+    for d in sorted(distances):
+        d *= scale
+        while i < last - 1 and cumulative[i + 1] < d:
+            i += 1
+        segment = cumulative[i + 1] - cumulative[i] if last else 0.0
+        k = min(max((d - cumulative[i]) / segment, 0.0), 1.0) if segment else 0.0
+        (x0, y0, z0), (x1, y1, z1) = points[i], points[min(i + 1, last)]
+        coords.extend((x0 + (x1 - x0) * k, y0 + (y1 - y0) * k, z0 + (z1 - z0) * k))
+
+
+def sample_curves(curves, step=None, count=None, mode=STEP):
+    #type:(list, float, int, str) -> tuple
+    """Function to sample points along many curves in a single call.
+    Lines and Arcs are computed analytically (a few API reads per curve),
+    other curves are interpolated along curve.Tessellate().
+
+    Example:
+        coords, offsets = sample_curves(curves, step=0.3, mode=FIT)
+        for i in range(len(curves)):
+            points = to_XYZ(coords, offsets[i], offsets[i + 1])
+
+    :param curves: list of Curves
+    :param step:   Step distance between points in feet (STEP/FIT)
+    :param count:  Number of points per curve (COUNT)
+    :param mode:   STEP, FIT or COUNT (see get_sample_distances)
+    :return:       (coords, offsets) - flat array('d') of x,y,z and array('l') where
+                   points of curve i are points offsets[i]:offsets[i+1]"""
+    coords, offsets = array('d'), array('l', [0])
+    for curve in curves:
+        length    = curve.Length
+        distances = get_sample_distances(length, step, count, mode)
+        if isinstance(curve, Line):
+            _sample_line(curve, distances, coords)
+        elif isinstance(curve, Arc):
+            _sample_arc(curve, distances, coords)
+        else:
+            _sample_tessellated(curve, distances, coords, length)
+        offsets.append(len(coords) // 3)
+    return coords, offsets
+
+
+def to_XYZ(coords, start=0, stop=None):
+    #type:(array, int, int) -> list
+    """Function to convert points start:stop of a flat x,y,z array to XYZ."""
+    stop = len(coords) // 3 if stop is None else stop
+    return [XYZ(coords[3 * i], coords[3 * i + 1], coords[3 * i + 2]) for i in range(start, stop)]
+
+
 def get_points_along_a_curve(curve, step=0.3):
     """ Function to get points along given Curve
     :param curve: Curve that will be tessellated.
     :param step:  approx. Step distance between points in feet
-    :return: list of Points along the curve."""
-
-    # Generate points along curve
-    pt_0 = curve.GetEndParameter(0)
-    pt_1 = curve.GetEndParameter(1)
-    list_XYZ = []
-    n = 1
-    while True:
-        dist = step * n
-        n += 1
-        if dist > curve.Length:
-            break
-
-        # Get point on curve?
-        paramCalc = pt_0 + ((pt_1 - pt_0) * dist / curve.Length)
-
-        if curve.IsInside(paramCalc):
-            normParam = curve.ComputeNormalizedParameter(paramCalc)
-
-            evaluatedPoint = curve.Evaluate(normParam, True)
-            list_XYZ.append(evaluatedPoint)
-
-    return list_XYZ
-
-
-
-def get_line_styles(uidoc):
-    """Function to get available LineStyles for DetaiLines.
-    It will create a temporary DetailLine to get LineStyles to prevent having issues
-    in a project without lines.
-
-    !IMPORTANT This function has to be run outside of any transactions!
-
-    :return: list of Available LineStyles"""
-
-    # CREATE TEMP LINE
-    with Transaction(doc, "temp - Create DetailLine") as t:
-        t.Start()
-        new_line         = Line.CreateBound(XYZ(0,0,0), XYZ(1,1,0))
-        random_line      = uidoc.Document.Create.NewDetailCurve(active_view, new_line)
-        line_styles_ids  = random_line.GetLineStyleIds()
-        t.RollBack()
-    line_styles = [doc.GetElement(line_style) for line_style in line_styles_ids]
-    return line_styles
\ No newline at end of file
+    :return: list of Points along the curve (start point is not included)."""
+    coords, offsets = sample_curves([curve], step=step, mode=STEP)
+    return to_XYZ(coords, 1)
+
+
+
+def get_line_style_catalog(doc):
+    #type:(Document) -> dict
+    """Function to get LineStyles available for DetailLines {name: GraphicsStyle}.
+    Read from OST_Lines subcategories without any Transaction, so it can be called
+    from anywhere (inside transactions, in any view). Cached until the document changes."""
+    def read_catalog():
+        lines_cat = doc.Settings.Categories.get_Item(BuiltInCategory.OST_Lines)
+        excluded  = set(int(getattr(BuiltInCategory, bic)) for bic in NON_DETAIL_LINE_CATEGORIES
+                        if hasattr(BuiltInCategory, bic))
+        catalog   = {}
+        for sub_cat in lines_cat.SubCategories:
+            if sub_cat.Id.IntegerValue in excluded:
+                continue
+            style = sub_cat.GetGraphicsStyle(GraphicsStyleType.Projection)
+            if style:
+                catalog[sub_cat.Name] = style
+        return catalog
+    return _LINE_STYLES.get(doc, 'catalog', read_catalog)
+
+
+def get_line_styles(uidoc=None):
+    """Function to get available LineStyles for DetaiLines (see get_line_style_catalog).
+    :return: list of Available LineStyles sorted by name"""
+    document = uidoc.Document if uidoc else doc
+    catalog  = get_line_style_catalog(document)
+    return [catalog[name] for name in sorted(catalog)]
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import FilteredElementCollector, RevitLinkInstance, ElementId
+
+# CUSTOM IMPORTS
+from Snippets._cache import DocumentCache
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+_REGISTRIES = DocumentCache('link_registry')
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class LinkRegistry(object):
+    """Loaded RevitLinkInstances of a host Document, collected once.
+    - instances:  {RevitLinkInstance.Id.IntegerValue: RevitLinkInstance}
+    - documents:  {RevitLinkInstance.Id.IntegerValue: Document}   (only loaded links)"""
+
+    def __init__(self, host_doc):
+        self.host_doc  = host_doc
+        self.instances = {}
+        self.documents = {}
+        for link in FilteredElementCollector(host_doc).OfClass(RevitLinkInstance):
+            link_doc = link.GetLinkDocument()
+            if link_doc:
+                self.instances[link.Id.IntegerValue] = link
+                self.documents[link.Id.IntegerValue] = link_doc
+
+    def get_instance(self, link_instance_id):
+        #type:(ElementId) -> RevitLinkInstance
+        return self.instances.get(link_instance_id.IntegerValue)
+
+    def get_document(self, link_instance_id):
+        #type:(ElementId) -> Document
+        return self.documents.get(link_instance_id.IntegerValue)
+
+    def get_linked_element(self, reference):
+        #type:(Reference) -> Element
+        """Element in a link from a Reference picked with ObjectType.LinkedElement."""
+        link_doc = self.get_document(reference.ElementId)
+        if link_doc and reference.LinkedElementId != ElementId.InvalidElementId:
+            return link_doc.GetElement(reference.LinkedElementId)
+
+    def group_references(self, references):
+        #type:(list) -> dict
+        """Function to group linked references by link Document.
+        Several instances of the same link share one Document, so it is queried only once.
+        :return: {link_doc: ([RevitLinkInstance], [Element])}"""
+        groups = {}
+        for ref in references:
+            link    = self.get_instance(ref.ElementId)
+            element = self.get_linked_element(ref)
+            if not link or not element:
+                continue
+            links, elements = groups.setdefault(link.GetLinkDocument(), ([], []))
+            if link not in links:
+                links.append(link)
+            elements.append(element)
+        return groups
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_link_registry(host_doc):
+    #type:(Document) -> LinkRegistry
+    """Function to get LinkRegistry of the host Document (cached until the Document changes)."""
+    return _REGISTRIES.get(host_doc, 'registry', lambda: LinkRegistry(host_doc))
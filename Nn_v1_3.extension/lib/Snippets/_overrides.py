@@ -1,5 +1,119 @@
 # -*- coding: utf-8 -*-
-from Autodesk.Revit.DB import ElementId, OverrideGraphicSettings, Color
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import (ElementId, OverrideGraphicSettings, Color, Transaction,
+                               FilteredElementCollector, SelectionFilterElement, FilterElement)
+import traceback
+import hashlib
+
+# CUSTOM IMPORTS
+from Snippets._context_manager import ef_SubTransaction
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+FILTER_THRESHOLD = 200              # Groups with more elements are overridden with one view filter
+FILTER_PREFIX    = 'NnBim_Override'
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def build_override_settings(fg_pattern_id=None, fg_color=None, bg_pattern_id=None, bg_color=None,
+                            line_color=None, line_pattern_id=None, lineweight=None,
+                            halftone=None, transparency=None):
+    #type:(ElementId, Color, ElementId, Color, Color, ElementId, int, bool, int) -> OverrideGraphicSettings
+    """Function to create OverrideGraphicSettings. Only given values are set.
+    Pattern ids equal to ElementId(-1) keep the original behaviour of override_graphics_region:
+    the pattern is not set and its color is set to white."""
+    override_settings = OverrideGraphicSettings()
+
+    # SURFACE
+    if fg_pattern_id is not None:
+        if fg_pattern_id != ElementId(-1):
+            override_settings.SetSurfaceForegroundPatternId(fg_pattern_id)
+            if fg_color: override_settings.SetSurfaceForegroundPatternColor(fg_color)
+        else:
+            override_settings.SetSurfaceForegroundPatternColor(Color(255, 255, 255))
+    elif fg_color:
+        override_settings.SetSurfaceForegroundPatternColor(fg_color)
+
+    if bg_pattern_id is not None:
+        if bg_pattern_id != ElementId(-1):
+            override_settings.SetSurfaceBackgroundPatternId(bg_pattern_id)
+            if bg_color: override_settings.SetSurfaceBackgroundPatternColor(bg_color)
+        else:
+            override_settings.SetSurfaceBackgroundPatternColor(Color(255, 255, 255))
+    elif bg_color:
+        override_settings.SetSurfaceBackgroundPatternColor(bg_color)
+
+    # LINE
+    if line_color:      override_settings.SetProjectionLineColor(line_color)
+    if line_pattern_id: override_settings.SetProjectionLinePatternId(line_pattern_id)
+    if lineweight:      override_settings.SetProjectionLineWeight(lineweight)
+
+    # OTHER
+    if halftone is not None:     override_settings.SetHalftone(halftone)
+    if transparency is not None: override_settings.SetSurfaceTransparency(transparency)
+    return override_settings
+
+
+def settings_key(**settings):
+    #type:(...) -> tuple
+    """Function to make a hashable key of override settings, so identical settings are grouped.
+    Colors -> (r, g, b), ElementIds -> IntegerValue."""
+    key = []
+    for name, value in sorted(settings.items()):
+        if value is None:
+            continue
+        if isinstance(value, Color):
+            value = (value.Red, value.Green, value.Blue)
+        elif isinstance(value, ElementId):
+            value = value.IntegerValue
+        key.append((name, value))
+    return tuple(key)
+
+
+def get_filter_elements(doc):
+    #type:(Document) -> dict
+    """{name: FilterElement} of all view filters in the Document."""
+    return {f.Name: f for f in FilteredElementCollector(doc).OfClass(FilterElement)}
+
+
+def remove_filters(view, name_prefix, keep_ids=()):
+    #type:(View, str, iter) -> int
+    """Function to remove filters whose name starts with name_prefix from a view (except keep_ids).
+    :return: number of removed filters"""
+    keep    = set(e_id.IntegerValue for e_id in keep_ids)
+    removed = 0
+    for filter_id in view.GetFilters():
+        if filter_id.IntegerValue in keep:
+            continue
+        filter_element = view.Document.GetElement(filter_id)
+        if filter_element and filter_element.Name.startswith(name_prefix):
+            view.RemoveFilter(filter_id)
+            removed += 1
+    return removed
+
+
+def apply_filter_to_view(view, filter_id, override_settings):
+    #type:(View, ElementId, OverrideGraphicSettings) -> None
+    """Function to add a view filter (if needed) and set its overrides."""
+    if not view.IsFilterApplied(filter_id):
+        view.AddFilter(filter_id)
+    view.SetFilterOverrides(filter_id, override_settings)
+    view.SetFilterVisibility(filter_id, True)
+
+
 def override_graphics_region(doc, view, region,
                              fg_pattern_id, fg_color,
                              bg_pattern_id, bg_color,
@@ -13,29 +127,12 @@ def override_graphics_region(doc, view, region,
     :param bg_color:        Background - Colour
     :return:                None """
     try:
-        override_settings = OverrideGraphicSettings()
-        if fg_pattern_id != ElementId(-1):
-            override_settings.SetSurfaceForegroundPatternId(fg_pattern_id)
-            override_settings.SetSurfaceForegroundPatternColor(fg_color)
-        else:
-            override_settings.SetSurfaceForegroundPatternColor(Color(255, 255, 255))
-
-        if bg_pattern_id != ElementId(-1):
-            override_settings.SetSurfaceBackgroundPatternId(bg_pattern_id)
-            override_settings.SetSurfaceBackgroundPatternColor(bg_color)
-        else:
-            override_settings.SetSurfaceBackgroundPatternColor(Color(255, 255, 255))
-
-        # LINE
-        if line_color:      override_settings.SetProjectionLineColor(line_color)
-        if line_pattern_id: override_settings.SetProjectionLinePatternId(line_pattern_id)
-        if lineweight:      override_settings.SetProjectionLineWeight(lineweight)
-
+        override_settings = build_override_settings(fg_pattern_id, fg_color, bg_pattern_id, bg_color,
+                                                    line_color, line_pattern_id, lineweight)
         view.SetElementOverrides(region.Id, override_settings)
 
     except:
-        # DELETE REGIONS IF MODEL PATTERN IS USED ?
-        doc.Delete(region.Id)
+        print(traceback.format_exc())
 
 
 
@@ -52,18 +149,147 @@ def override_graphics_line(doc, view, line,
     :return:                None """
 
     try:
-        override_settings = OverrideGraphicSettings()
-        # LINE
-        if line_color:      override_settings.SetProjectionLineColor(line_color)
-        if line_pattern_id: override_settings.SetProjectionLinePatternId(line_pattern_id)
-        if lineweight:      override_settings.SetProjectionLineWeight(lineweight)
-
+        override_settings = build_override_settings(line_color=line_color,
+                                                    line_pattern_id=line_pattern_id,
+                                                    lineweight=lineweight)
         view.SetElementOverrides(line.Id, override_settings)
 
     except:
-        import traceback
         print(traceback.format_exc())
 
 
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class OverrideEngine(object):
+    """Collects graphic overrides and applies them to many views at once.
+    - Elements with identical settings are grouped and share one OverrideGraphicSettings.
+    - Groups bigger than filter_threshold become one SelectionFilterElement
+      (named by settings and elements, reused only if identical) applied as a view filter
+      instead of N element overrides.
+    - Rule based filters (ParameterFilterElement) can be added directly with add_filter.
+    - Filters of earlier runs (names starting with filter_prefix) are removed from the views,
+      each view is applied in its own SubTransaction (all or nothing).
+
+    Example:
+        engine = OverrideEngine(doc)
+        engine.add(walls, fg_pattern_id=solid_id, fg_color=Color(255, 0, 0))
+        engine.add(doors, line_color=Color(0, 0, 255), lineweight=5)
+        report = engine.apply([view_1, view_2])"""
+
+    def __init__(self, doc, filter_threshold=FILTER_THRESHOLD, filter_prefix=FILTER_PREFIX):
+        self.doc              = doc
+        self.filter_threshold = filter_threshold
+        self.filter_prefix    = filter_prefix
+        self.groups           = {}      # {settings key: [ElementId]}
+        self.filters          = {}      # {settings key: [FilterElement]}
+        self.specs            = {}      # {settings key: settings kwargs}
+        self._settings        = {}      # {settings key: OverrideGraphicSettings}
+
+    def _register(self, settings):
+        key = settings_key(**settings)
+        self.specs.setdefault(key, settings)
+        return key
+
+    def add(self, elements, **settings):
+        """Function to add elements (or ElementIds) with given override settings
+        (keyword arguments of build_override_settings)."""
+        key = self._register(settings)
+        ids = self.groups.setdefault(key, [])
+        for e in elements:
+            ids.append(e if isinstance(e, ElementId) else e.Id)
+        return key
+
+    def add_filter(self, filter_element, **settings):
+        """Function to add an existing FilterElement (e.g. ParameterFilterElement) with given override settings."""
+        key = self._register(settings)
+        self.filters.setdefault(key, []).append(filter_element)
+        return key
+
+    def get_settings(self, key):
+        #type:(tuple) -> OverrideGraphicSettings
+        """Function to get shared OverrideGraphicSettings of a settings key (created once)."""
+        if key not in self._settings:
+            self._settings[key] = build_override_settings(**self.specs[key])
+        return self._settings[key]
+
+    def get_filter_name(self, key, ids):
+        #type:(tuple, list) -> str
+        """Stable name of the SelectionFilterElement of a settings key and element set
+        (same settings and same elements -> same filter)."""
+        content = repr((key, sorted(e_id.IntegerValue for e_id in ids)))
+        return '{}_{}'.format(self.filter_prefix, hashlib.md5(content).hexdigest()[:8])
+
+    def _create_selection_filters(self):
+        """Function to turn large element groups into SelectionFilterElements (must run in a Transaction).
+        An existing filter is reused only if it has exactly the same elements, it is never modified:
+        other views that use it would change too."""
+        existing = get_filter_elements(self.doc)
+        for key, ids in list(self.groups.items()):
+            if len(ids) <= self.filter_threshold:
+                continue
+            base_name = name = self.get_filter_name(key, ids)
+            id_values = set(e_id.IntegerValue for e_id in ids)
+            selection_filter, n = existing.get(name), 1
+            while selection_filter is not None:
+                if isinstance(selection_filter, SelectionFilterElement) and \
+                        set(e_id.IntegerValue for e_id in selection_filter.GetElementIds()) == id_values:
+                    break
+                name = '{}_{}'.format(base_name, n)
+                selection_filter, n = existing.get(name), n + 1
+
+            if selection_filter is None:
+                selection_filter = SelectionFilterElement.Create(self.doc, name)
+                selection_filter.SetElementIds(List[ElementId](ids))
+                existing[name] = selection_filter
+            self.filters.setdefault(key, []).append(selection_filter)
+            del self.groups[key]
+
+    def apply(self, views, transaction_name='Override Graphics'):
+        #type:(list, str) -> dict
+        """Function to apply all collected overrides to given views in one Transaction
+        (or in the current one if the Document is already modifiable).
+        Filters of earlier runs (names starting with filter_prefix) are removed from the views first.
+        Each view runs in its own SubTransaction: a view that fails (e.g. filters controlled by a View Template)
+        is rolled back as a whole and reported, the rest continue.
+        :return: {'elements': n element overrides, 'filters': n filter overrides,
+                  'removed': n removed old filters, 'failed': [(view, reason)]}"""
+        report = {'elements': 0, 'filters': 0, 'removed': 0, 'failed': []}
+
+        t = None
+        if not self.doc.IsModifiable:
+            t = Transaction(self.doc, transaction_name)
+            t.Start()
+        try:
+            self._create_selection_filters()
+            keep_ids = [f.Id for filter_elements in self.filters.values() for f in filter_elements]
+            for view in views:
+                n_filters = n_elements = 0
+                try:
+                    with ef_SubTransaction(self.doc, 'Override View', debug=False, reraise=True):
+                        removed = remove_filters(view, self.filter_prefix, keep_ids)
 
+                        for key, filter_elements in self.filters.items():
+                            for filter_element in filter_elements:
+                                apply_filter_to_view(view, filter_element.Id, self.get_settings(key))
+                                n_filters += 1
 
+                        for key, ids in self.groups.items():
+                            override_settings = self.get_settings(key)
+                            for e_id in ids:
+                                view.SetElementOverrides(e_id, override_settings)
+                            n_elements += len(ids)
+                except Exception as e:
+                    report['failed'].append((view, str(e)))
+                    continue
+                report['removed']  += removed
+                report['filters']  += n_filters
+                report['elements'] += n_elements
+            if t:
+                t.Commit()
+        except:
+            if t:
+                t.RollBack()
+            raise
+        return report
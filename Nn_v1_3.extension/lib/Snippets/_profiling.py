@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from pyrevit import script
+from collections import OrderedDict
+import contextlib
+import functools
+import datetime
+import json
+
+# CUSTOM IMPORTS
+from Snippets._context_manager import get_metrics
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Diagnostics import Stopwatch
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+logger = script.get_logger()
+
+# Usual phases of NnBim tools (any other name can be used too)
+SELECTION  = 'selection'
+COLLECTION = 'collection'
+DEDUP      = 'dedup'
+GEOMETRY   = 'geometry'
+CREATION   = 'creation'
+RENAME     = 'rename'
+LAYOUT     = 'layout'
+VIEWPORTS  = 'viewports'
+
+API_CALLS  = 'api_calls'    # Counter of Revit API calls, incremented explicitly with count(API_CALLS, n)
+
+_PROFILERS = {}
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class Phase(object):
+    """Wall time, number of calls and counters of a named phase."""
+    def __init__(self, name):
+        self.name     = name
+        self.calls    = 0
+        self.total_ms = 0.0
+        self.counters = {}
+
+    def as_dict(self):
+        return {'phase': self.name, 'calls': self.calls, 'total_ms': round(self.total_ms, 3), 'counters': self.counters}
+
+
+class Profiler(object):
+    """Records time per phase of a command run.
+
+    Example:
+        PROFILER = get_profiler('Gerar Vistas')
+
+        with PROFILER.phase(SELECTION):
+            refs = uidoc.Selection.PickObjects(...)
+
+        @PROFILER.timed(GEOMETRY)
+        def get_geometry(el): ...
+
+        PROFILER.count(API_CALLS, 3)      # counted in the innermost open phase
+        PROFILER.finish()                 # output window + JSONL file of this run
+
+    Phases can be nested, each phase records its own total (inclusive) time.
+    Re-entering a phase that is already open (e.g. a @timed function called inside the same phase)
+    is not timed again, so a phase never counts the same time twice.
+    Transactions run through Snippets._context_manager are added to the report."""
+
+    def __init__(self, name):
+        self.name    = name
+        self.run_id  = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        self.phases  = OrderedDict()    # {name: Phase}
+        self._stack  = []
+        self._timer  = Stopwatch.StartNew()
+
+    def get_phase(self, name):
+        #type:(str) -> Phase
+        if name not in self.phases:
+            self.phases[name] = Phase(name)
+        return self.phases[name]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Context manager to time a block as given phase."""
+        phase = self.get_phase(name)
+        if phase in self._stack:
+            yield phase
+            return
+        phase.calls += 1
+        self._stack.append(phase)
+        timer = Stopwatch.StartNew()
+        try:
+            yield phase
+        finally:
+            phase.total_ms += timer.Elapsed.TotalMilliseconds
+            self._stack.pop()
+
+    def timed(self, name=None):
+        """Decorator to time every call of a function as given phase (function name by default)."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, counter, n=1, phase=None):
+        """Function to increment a counter of given phase (innermost open phase by default)."""
+        if phase is not None:
+            target = self.get_phase(phase)
+        elif self._stack:
+            target = self._stack[-1]
+        else:
+            target = self.get_phase('total')
+        target.counters[counter] = target.counters.get(counter, 0) + n
+
+    # ╦═╗╔═╗╔═╗╔═╗╦═╗╔╦╗
+    # ╠╦╝║╣ ╠═╝║ ║╠╦╝ ║
+    # ╩╚═╚═╝╩  ╚═╝╩╚═ ╩ REPORT
+    #==================================================
+    @property
+    def total_ms(self):
+        return self._timer.Elapsed.TotalMilliseconds
+
+    def records(self):
+        #type:() -> list
+        """Function to get JSON-ready records of this run (phases + transaction metrics)."""
+        base    = {'run': self.run_id, 'command': self.name}
+        records = []
+        for phase in self.phases.values():
+            record = dict(base, kind='phase')
+            record.update(phase.as_dict())
+            records.append(record)
+        for metrics in get_metrics():
+            record = dict(base)
+            record.update(metrics.as_dict())
+            records.append(record)
+        records.append(dict(base, kind='run', total_ms=round(self.total_ms, 3)))
+        return records
+
+    def report(self, output=None):
+        """Function to print phases and transactions as tables in the pyRevit output window."""
+        output = output or script.get_output()
+        total  = self.total_ms or 1.0
+
+        rows = []
+        for phase in self.phases.values():
+            counters = ', '.join('{}: {}'.format(k, v) for k, v in sorted(phase.counters.items()))
+            rows.append([phase.name, phase.calls, '{:.0f}'.format(phase.total_ms),
+                         '{:.0f}%'.format(100.0 * phase.total_ms / total), counters])
+        output.print_table(table_data = rows,
+                           columns    = ['Phase', 'Calls', 'Time [ms]', '% of run', 'Counters'],
+                           title      = '{} - {:.0f} ms'.format(self.name, total))
+
+        metrics = get_metrics()
+        if metrics:
+            output.print_table(table_data = [[m.kind, m.name, str(m.status), '{:.0f}'.format(m.duration_ms),
+                                              '{:.0f}'.format(m.regenerate_ms),
+                                              '' if m.element_delta is None else m.element_delta]
+                                             for m in metrics],
+                               columns    = ['Kind', 'Name', 'Status', 'Time [ms]', 'Regenerate [ms]', 'Elements'],
+                               title      = 'Transactions')
+
+    def save(self, path=None):
+        #type:(str) -> str
+        """Function to write records of this run to a JSONL file (one file per run in pyRevit data folder).
+        :return: path of the file"""
+        if path is None:
+            path = script.get_data_file('NnBim_profile_{}_{}'.format(self.name.replace(' ', '_'), self.run_id), 'jsonl')
+        with open(path, 'a') as f:
+            for record in self.records():
+                f.write(json.dumps(record) + '\n')
+        return path
+
+    def finish(self, show=True):
+        """Function to save the run to JSONL and show the report (if show)."""
+        try:
+            path = self.save()
+            logger.debug('Profile saved: {}'.format(path))
+        except Exception as e:
+            logger.warning('Profile could not be saved: {}'.format(e))
+        if show:
+            self.report()
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_profiler(name='NnBim'):
+    #type:(str) -> Profiler
+    """Function to get Profiler of this command run (one per name)."""
+    if name not in _PROFILERS:
+        _PROFILERS[name] = Profiler(name)
+    return _PROFILERS[name]
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import (FilteredElementCollector,
+                               BuiltInParameter,
+                               ElementId,
+                               Category,
+                               ElementFilter,
+                               ElementQuickFilter,
+                               ElementCategoryFilter,
+                               ElementMulticategoryFilter,
+                               ElementClassFilter,
+                               ElementMulticlassFilter,
+                               ElementIsElementTypeFilter,
+                               ElementParameterFilter,
+                               ExclusionFilter,
+                               LogicalOrFilter)
+
+# CUSTOM IMPORTS
+from Snippets._filters import create_rule
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System import Type
+from System.Collections.Generic import List
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def _flatten(values):
+    """Accept f(a, b), f([a, b]) and f(set) in the same way."""
+    flat = []
+    for value in values:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            flat.extend(value)
+        elif hasattr(value, 'GetEnumerator') and not isinstance(value, basestring):
+            flat.extend(list(value))    # .NET collections (List[ElementId], ICollection...)
+        else:
+            flat.append(value)
+    return flat
+
+
+def category_id_value(category):
+    #type:(any) -> int
+    """Function to get integer id of a category given as BuiltInCategory, Category, ElementId or int."""
+    if isinstance(category, Category):
+        return category.Id.IntegerValue
+    if isinstance(category, ElementId):
+        return category.IntegerValue
+    return int(category)
+
+
+def _value_key(value):
+    """Hashable key of a rule value, used to merge equal rules."""
+    if isinstance(value, ElementId):
+        return ('id', value.IntegerValue)
+    if isinstance(value, float):
+        return ('double', round(value, 9))
+    return (type(value).__name__, value)
+
+
+def _param_key(parameter):
+    if isinstance(parameter, ElementId):
+        return parameter.IntegerValue
+    return int(parameter)
+
+
+def _param_label(param_key):
+    try:
+        return str(BuiltInParameter(param_key)) if param_key < 0 else 'ParameterId({})'.format(param_key)
+    except:
+        return 'ParameterId({})'.format(param_key)
+
+
+def _value_label(value):
+    if isinstance(value, ElementId):
+        return str(value.IntegerValue)
+    return repr(value)
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class Q(object):
+    """Fluent FilteredElementCollector builder.
+    Quick filters (category, class, element type, exclusion) are always applied
+    before slow ElementParameterFilters, no matter in which order they were chained.
+
+    Example:
+        door_ids = Q(doc).category(BuiltInCategory.OST_Doors).instances()\\
+                         .type_id(type_a_id, type_b_id)\\
+                         .param_eq(BuiltInParameter.ALL_MODEL_MARK, 'D01')\\
+                         .in_view(doc.ActiveView).ids()
+        print(Q(doc).category(BuiltInCategory.OST_Doors).type_id(type_a_id).explain())
+
+    Chaining rules:
+        - category() / of_class() calls extend one OR-group each.
+        - param_eq(p, a, b) is an OR-group of values; repeated values are merged.
+          ELEM_CATEGORY_PARAM rules become a quick category filter.
+        - Different parameters are combined with AND."""
+
+    def __init__(self, doc=None):
+        self.doc          = doc or __revit__.ActiveUIDocument.Document
+        self._view_id     = None
+        self._link_id     = None        # RevitLinkInstance.Id when collecting linked elements visible in a host view
+        self._host_doc    = None        # Document of the RevitLinkInstance (host of the view)
+        self._is_type     = None        # None - all, True - types only, False - instances only
+        self._categories  = []          # [int]
+        self._classes     = []          # [type]
+        self._excluded    = []          # [ElementId]
+        self._param_rules = []          # [(param_key, parameter, {value_key: value})]
+        self._filters     = []          # [ElementFilter]
+
+    # ╔╦╗╔═╗╔═╗╦
+    #  ║║╚═╗║
+    # ═╩╝╚═╝╩═╝ CHAIN
+    # ==================================================
+    def category(self, *categories):
+        """Keep elements of any of the given categories (BuiltInCategory/Category/ElementId/int)."""
+        for cat in _flatten(categories):
+            cat_id = category_id_value(cat)
+            if cat_id not in self._categories:
+                self._categories.append(cat_id)
+        return self
+
+    def of_class(self, *classes):
+        """Keep elements of any of the given classes (e.g. Wall, FamilyInstance)."""
+        for cls in _flatten(classes):
+            if cls not in self._classes:
+                self._classes.append(cls)
+        return self
+
+    def instances(self):
+        """Keep only element instances (WhereElementIsNotElementType)."""
+        self._is_type = False
+        return self
+
+    def types(self):
+        """Keep only element types (WhereElementIsElementType)."""
+        self._is_type = True
+        return self
+
+    def in_view(self, view, link_instance = None):
+        """Collect only elements visible in the given View or ViewId.
+        :param link_instance: RevitLinkInstance - collect its elements visible in the host view (RVT 2024+).
+                              In that case doc of Q is the link Document and view belongs to the host."""
+        self._view_id = view if isinstance(view, ElementId) else view.Id
+        if link_instance:
+            self._link_id  = link_instance.Id
+            self._host_doc = link_instance.Document
+        else:
+            self._link_id  = None
+            self._host_doc = None
+        return self
+
+    def excluding(self, *element_ids):
+        """Skip given ElementIds (ExclusionFilter)."""
+        self._excluded.extend(_flatten(element_ids))
+        return self
+
+    def param_eq(self, parameter, *values):
+        """Keep elements where parameter equals any of the values.
+        :param parameter: BuiltInParameter or ElementId of a parameter.
+        :param values:    ElementId | str | int | float values (OR-group)."""
+        key = _param_key(parameter)
+
+        # Category rule can be answered by a quick filter.
+        if key == int(BuiltInParameter.ELEM_CATEGORY_PARAM):
+            return self.category(*values)
+
+        for p_key, _, group in self._param_rules:
+            if p_key == key:
+                break
+        else:
+            group = {}
+            self._param_rules.append((key, parameter, group))
+
+        for value in _flatten(values):
+            group.setdefault(_value_key(value), value)
+        return self
+
+    def type_id(self, *type_ids):
+        """Keep elements of any of the given type ids (ELEM_TYPE_PARAM)."""
+        return self.param_eq(BuiltInParameter.ELEM_TYPE_PARAM, *type_ids)
+
+    def where(self, element_filter):
+        """Add any ElementFilter. Quick filters are still moved in front of slow ones."""
+        self._filters.append(element_filter)
+        return self
+
+    # ╔═╗╔═╗╔╦╗╔═╗╦╦  ╔═╗
+    # ║  ║ ║║║║╠═╝║║  ║╣
+    # ╚═╝╚═╝╩ ╩╩  ╩╩═╝╚═╝ COMPILE
+    # ==================================================
+    def _plan(self):
+        """Return list of (is_quick, ElementFilter, description) in execution order."""
+        quick, slow = [], []
+
+        #1️⃣ CATEGORIES
+        if len(self._categories) == 1:
+            quick.append((ElementCategoryFilter(ElementId(self._categories[0])),
+                          'ElementCategoryFilter      category={}'.format(self._categories[0])))
+        elif self._categories:
+            cat_ids = List[ElementId]([ElementId(c) for c in self._categories])
+            quick.append((ElementMulticategoryFilter(cat_ids),
+                          'ElementMulticategoryFilter categories={}'.format(sorted(self._categories))))
+
+        #2️⃣ CLASSES
+        if len(self._classes) == 1:
+            quick.append((ElementClassFilter(self._classes[0]),
+                          'ElementClassFilter         class={}'.format(self._classes[0].__name__)))
+        elif self._classes:
+            types = List[Type]([clr.GetClrType(c) for c in self._classes])
+            quick.append((ElementMulticlassFilter(types),
+                          'ElementMulticlassFilter    classes={}'.format([c.__name__ for c in self._classes])))
+
+        #3️⃣ TYPES / INSTANCES
+        if self._is_type is not None:
+            quick.append((ElementIsElementTypeFilter(not self._is_type),
+                          'ElementIsElementTypeFilter {}'.format('types only' if self._is_type else 'instances only')))
+
+        #4️⃣ EXCLUSIONS
+        if self._excluded:
+            quick.append((ExclusionFilter(List[ElementId](self._excluded)),
+                          'ExclusionFilter            {} ids'.format(len(self._excluded))))
+
+        #5️⃣ CUSTOM FILTERS
+        for f in self._filters:
+            target = quick if isinstance(f, ElementQuickFilter) else slow
+            target.append((f, type(f).__name__))
+
+        #6️⃣ PARAMETER RULES (slow)
+        for key, parameter, group in self._param_rules:
+            values  = list(group.values())
+            filters = [ElementParameterFilter(create_rule(parameter, v)) for v in values]
+            label   = '{} in [{}]'.format(_param_label(key), ', '.join(_value_label(v) for v in values))
+            if len(filters) == 1:
+                slow.append((filters[0], 'ElementParameterFilter     ' + label))
+            elif filters:
+                slow.append((LogicalOrFilter(List[ElementFilter](filters)),
+                             'LogicalOrFilter({} rules)  '.format(len(filters)) + label))
+
+        return [(True, f, d) for f, d in quick] + [(False, f, d) for f, d in slow]
+
+    def compile(self):
+        #type:() -> list
+        """Return ElementFilters in the order they will be applied."""
+        return [f for _, f, _ in self._plan()]
+
+    def explain(self):
+        #type:() -> str
+        """Return a readable description of the compiled plan."""
+        lines = ['Q plan: {} {}'.format(self.doc.Title,
+                                        '(view {})'.format(self._view_id.IntegerValue) if self._view_id else '(model)')]
+        plan  = self._plan()
+        for n, (is_quick, _, desc) in enumerate(plan):
+            lines.append('  {}. [{}] {}'.format(n + 1, 'quick' if is_quick else 'slow ', desc))
+        if not plan:
+            lines.append('  - no filters (all elements)')
+        return '\n'.join(lines)
+
+    # ╦═╗╦ ╦╔╗╔
+    # ╠╦╝║ ║║║║
+    # ╩╚═╚═╝╝╚╝ RUN
+    # ==================================================
+    def collector(self):
+        #type:() -> FilteredElementCollector
+        """Return FilteredElementCollector with compiled filters applied."""
+        if self._view_id and self._link_id:
+            collector = FilteredElementCollector(self._host_doc, self._view_id, self._link_id)
+        elif self._view_id:
+            collector = FilteredElementCollector(self.doc, self._view_id)
+        else:
+            collector = FilteredElementCollector(self.doc)
+
+        for f in self.compile():
+            collector = collector.WherePasses(f)
+        return collector
+
+    def ids(self):
+        return self.collector().ToElementIds()
+
+    def elements(self):
+        return self.collector().ToElements()
+
+    def first(self):
+        return self.collector().FirstElement()
+
+    def count(self):
+        #type:() -> int
+        return self.collector().GetElementCount()
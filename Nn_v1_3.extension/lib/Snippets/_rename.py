@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import (Transaction, FilteredElementCollector, View, ViewSheet,
+                               FamilySymbol, SpatialElement)
+import re
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+PROHIBITED_CHARS = set('\\:{}[]|;<>?`~')   # Characters Revit does not allow in names
+
+# Row status
+OK          = 'OK'
+UNCHANGED   = 'Unchanged'
+INVALID     = 'Invalid name'
+DUPLICATE   = 'Duplicate'       # Several rows get the same new name
+COLLISION   = 'Name exists'     # New name is used by an element that is not renamed
+FAILED      = 'Failed'
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_name_scope(element):
+    #type:(Element) -> tuple
+    """Function to get the scope in which element's Name has to be unique.
+    Views have to be unique per ViewType, family types per Family, other elements per class.
+    :return: scope key or None if Name does not have to be unique (e.g. Sheet Names, Rooms)."""
+    if isinstance(element, (ViewSheet, SpatialElement)):
+        return None
+    if isinstance(element, View):
+        return ('View', str(element.ViewType))
+    if isinstance(element, FamilySymbol):
+        return ('FamilySymbol', element.Family.Id.IntegerValue)
+    return (type(element).__name__, )
+
+
+def get_collector_class(element):
+    #type:(Element) -> type
+    """Function to get the class used to collect elements of the same scope.
+    Some API classes (e.g. AnnotationSymbolType) can't be used in OfClass, their base class is used instead."""
+    if isinstance(element, View):
+        return View
+    if isinstance(element, FamilySymbol):
+        return FamilySymbol
+    return type(element)
+
+
+def build_name_index(doc, elements):
+    #type:(Document, list) -> dict
+    """Function to index existing names of every scope used by given elements in one pass.
+    :return: {scope: {name: ElementId.IntegerValue}}"""
+    index, classes = {}, set()
+    for element in elements:
+        scope = get_name_scope(element)
+        if scope is not None:
+            index.setdefault(scope, {})
+            classes.add(get_collector_class(element))
+
+    for cls in classes:
+        for element in FilteredElementCollector(doc).OfClass(cls):
+            scope = get_name_scope(element)
+            if scope in index:
+                index[scope][element.Name] = element.Id.IntegerValue
+    return index
+
+
+def is_valid_name(name):
+    #type:(str) -> bool
+    return bool(name.strip()) and not PROHIBITED_CHARS.intersection(name)
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class RenameRule(object):
+    """Find/Replace + Prefix/Suffix rule.
+    :param regex:       find is a regular expression, replace may use groups (\\1, \\g<name>).
+    :param ignore_case: case insensitive find.
+    Raises re.error on invalid regex, so GUI can show it before anything is renamed."""
+    def __init__(self, find='', replace='', prefix='', suffix='', regex=False, ignore_case=False):
+        self.find    = find
+        self.replace = replace
+        self.prefix  = prefix
+        self.suffix  = suffix
+        self.regex   = regex
+        flags        = re.IGNORECASE if ignore_case else 0
+        pattern      = find if regex else re.escape(find)
+        self.pattern = re.compile(pattern, flags) if find else None
+        if self.pattern and not regex:
+            self.replace = replace.replace('\\', '\\\\')   # Plain text replace - no group references
+
+    def apply(self, name):
+        #type:(str) -> str
+        if self.pattern:
+            name = self.pattern.sub(self.replace, name)
+        return self.prefix + name + self.suffix
+
+
+class RenameRow(object):
+    """Single row of preview: element, OldName -> NewName and Status (bound in preview grid)."""
+    def __init__(self, element, old_name, new_name, scope):
+        self.element  = element
+        self.OldName  = old_name
+        self.NewName  = new_name
+        self.scope    = scope
+        self.Status   = OK
+
+    @property
+    def ok(self):
+        return self.Status == OK
+
+
+class RenamePlan(object):
+    """Preview of a bulk rename. Collisions are detected against the index of existing names,
+    names freed by other rows of the same batch are allowed (swap chains, e.g. A->B, B->A).
+
+    Example:
+        plan = RenamePlan(doc, views, RenameRule('Level', 'L', regex=False))
+        print(plan.counters)
+        plan.apply()"""
+
+    def __init__(self, doc, elements, rule, name_index=None):
+        self.doc        = doc
+        self.elements   = list(elements)
+        self.names      = [e.Name for e in self.elements]           # Read from Revit only once
+        self.scopes     = [get_name_scope(e) for e in self.elements]
+        self.name_index = name_index if name_index is not None else build_name_index(doc, self.elements)
+        self.rows       = []
+        self.update(rule)
+
+    def update(self, rule):
+        """Recompute new names and statuses for another rule (existing name index is reused)."""
+        self.rule = rule
+        self.rows = [RenameRow(e, name, rule.apply(name), scope)
+                     for e, name, scope in zip(self.elements, self.names, self.scopes)]
+
+        #1️⃣ UNCHANGED / INVALID
+        for row in self.rows:
+            if row.NewName == row.OldName:
+                row.Status = UNCHANGED
+            elif not is_valid_name(row.NewName):
+                row.Status = INVALID
+
+        #2️⃣ DUPLICATES WITHIN BATCH
+        targets = {}
+        for row in self.rows:
+            if row.ok and row.scope is not None:
+                targets.setdefault((row.scope, row.NewName), []).append(row)
+        for rows in targets.values():
+            if len(rows) > 1:
+                for row in rows:
+                    row.Status = DUPLICATE
+
+        #3️⃣ COLLISIONS WITH NAMES THAT STAY
+        # A name is freed only by a row that is renamed. A row marked as COLLISION keeps its name,
+        # so rows that wanted that name collide too - repeat until nothing changes.
+        changed = True
+        while changed:
+            changed = False
+            freed   = set((row.scope, row.OldName) for row in self.rows if row.ok)
+            for row in self.rows:
+                if not row.ok or row.scope is None:
+                    continue
+                holder = self.name_index.get(row.scope, {}).get(row.NewName)
+                if holder is not None and holder != row.element.Id.IntegerValue and (row.scope, row.NewName) not in freed:
+                    row.Status = COLLISION
+                    changed    = True
+        return self
+
+    @property
+    def counters(self):
+        #type:() -> dict
+        """{status: number of rows}"""
+        counts = {}
+        for row in self.rows:
+            counts[row.Status] = counts.get(row.Status, 0) + 1
+        return counts
+
+    def apply(self, transaction_name='Rename Elements'):
+        #type:(str) -> dict
+        """Rename all OK rows in a single Transaction.
+        Rows whose current name is the target of another row are renamed in two phases
+        (temporary name first), so swap chains never collide mid-batch.
+        A row that fails is marked FAILED and the rest of the batch continues.
+        :return: counters after applying"""
+        rows     = [row for row in self.rows if row.ok]
+        targeted = set((row.scope, row.NewName) for row in rows if row.scope is not None)
+        chained  = [row for row in rows if (row.scope, row.OldName) in targeted]
+
+        t = Transaction(self.doc, transaction_name)
+        t.Start()
+        try:
+            #1️⃣ TEMPORARY NAMES - free names taken by other rows
+            for row in chained:
+                try:
+                    row.element.Name = '{}__tmp{}'.format(row.OldName, row.element.Id.IntegerValue)
+                except:
+                    row.Status = FAILED
+
+            #2️⃣ FINAL NAMES
+            for row in rows:
+                if not row.ok:
+                    continue
+                try:
+                    row.element.Name = row.NewName
+                except:
+                    row.Status = FAILED
+
+            #3️⃣ RESTORE rows that failed after getting a temporary name
+            for row in chained:
+                if not row.ok and row.element.Name != row.OldName:
+                    try:
+                        row.element.Name = row.OldName
+                    except:
+                        pass
+            t.Commit()
+        except:
+            t.RollBack()
+            raise
+
+        # Keep names and index up to date for the next preview
+        for n, element in enumerate(self.elements):
+            row = self.rows[n]
+            if not row.ok:
+                continue
+            self.names[n] = row.NewName
+            if row.scope is not None:
+                names = self.name_index.setdefault(row.scope, {})
+                if names.get(row.OldName) == element.Id.IntegerValue:
+                    del names[row.OldName]
+                names[row.NewName] = element.Id.IntegerValue
+        return self.counters
@@ -4,23 +4,35 @@
 # ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
 #====================================================================================================
 import traceback
+import csv, os
 
 from Autodesk.Revit.DB import (RevisionNumberType,
                                Revision,
                                ViewSheet,
-                               ElementId)
+                               ElementId,
+                               Transaction)
 from Snippets._context_manager import try_except
+from Snippets._sheets          import get_sheet_index
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
 
 doc = __revit__.ActiveUIDocument.Document
 app = __revit__.Application
 rvt_year = int(app.VersionNumber)
 
+# Matrix cells that do NOT issue a revision to a sheet
+EMPTY_MARKS = ('', '0', '-', 'n', 'no', 'nao', u'não', 'false')
+
 
-def create_revision(description, date, revision_type = RevisionNumberType.None):
-    #type:(str,str,RevisionNumberType) -> Revision
+def create_revision(description, date, revision_type = RevisionNumberType.None, doc = doc):
+    #type:(str,str,RevisionNumberType, Document) -> Revision
     """Function to create new Revision.
     :param description: string for Description
     :param date:        string for Date
+    :param doc:         Document (active Document by default)
     :return:            new Revision"""
     with try_except(debug=True):
         new_rev              = Revision.Create(doc)
@@ -58,6 +70,145 @@ def add_revision_to_sheet(sheet, revision_id):
 
 
 
+# ╔╦╗╔═╗╔╦╗╦═╗╦═╗ ╦
+# ║║║╠═╣ ║ ╠╦╝║╔╩╦╝
+# ╩ ╩╩ ╩ ╩ ╩╚═╩╩ ╚═ REVISION MATRIX
+#==================================================
+def _cell(value):
+    #type:(any) -> unicode
+    """Cell value -> stripped text (Excel numbers like 101.0 -> '101')."""
+    if value is None:
+        return u''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, str):
+        value = value.decode('utf-8-sig')
+    return unicode(value).strip()
+
+
+def _read_csv_rows(path):
+    #type:(str) -> list
+    """Function to read rows of a CSV file (',' or ';' separated)."""
+    with open(path, 'rb') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        return [row for row in csv.reader(f, dialect)]
+
+
+def _read_excel_rows(path, worksheet=None):
+    #type:(str, str) -> list
+    """Function to read rows of an Excel worksheet with pyrevit.interop.xl.
+    :param worksheet: Name of the worksheet. Can be omitted if the workbook has a single worksheet."""
+    try:
+        from pyrevit.interop import xl
+    except ImportError:
+        raise ImportError('Excel files can not be read in this pyRevit version. Save the matrix as CSV.')
+
+    data = xl.load(path, headers=False)
+    if worksheet is None:
+        if len(data) != 1:
+            raise ValueError('Workbook has several worksheets, choose one of: {}'.format(', '.join(data)))
+        worksheet = list(data)[0]
+
+    sheet_data = data[worksheet]
+    headers    = sheet_data.get('headers') or []
+    rows       = sheet_data.get('rows', [])
+    # Rows are lists, or dicts {header: value} in some pyRevit versions.
+    return [[row.get(h) for h in headers] if isinstance(row, dict) else list(row) for row in rows]
+
+
+def read_revision_matrix(path, worksheet=None):
+    #type:(str, str) -> tuple
+    """Function to read a grid of Sheet Numbers x Revisions from a CSV or Excel file.
+    First row:    anything | Revision Description | Revision Description | ...
+    Other rows:   Sheet Number | mark | mark | ...
+    Any mark that is not in EMPTY_MARKS (e.g. 'x') issues the revision to the sheet.
+    :return: ([revision descriptions], {sheet_number: set(revision descriptions)})"""
+    ext  = os.path.splitext(path)[1].lower()
+    rows = _read_excel_rows(path, worksheet) if ext in ('.xlsx', '.xls') else _read_csv_rows(path)
+    rows = [[_cell(value) for value in row] for row in rows]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        raise ValueError('Revision matrix is empty: {}'.format(path))
+
+    descriptions = rows[0][1:]
+    issues       = {}
+    for row in rows[1:]:
+        sheet_number = row[0]
+        if not sheet_number:
+            continue
+        marked = set(description for description, mark in zip(descriptions, row[1:])
+                     if description and mark.lower() not in EMPTY_MARKS)
+        issues.setdefault(sheet_number, set()).update(marked)
+    return [d for d in descriptions if d], issues
+
+
+def apply_revision_matrix(doc, descriptions, issues, date='', replace=False,
+                          transaction_name='Revision Matrix'):
+    #type:(Document, list, dict, str, bool, str) -> dict
+    """Function to issue revisions to sheets according to a matrix (see read_revision_matrix).
+    Missing revisions are created with create_revision. Final revision set of each sheet is
+    computed in memory, so every sheet gets a single SetAdditionalRevisionIds call.
+    Everything is done in one Transaction.
+    :param replace: Also remove matrix revisions that are not marked for a sheet.
+                    Revisions that are not in the matrix are always kept.
+    :return:        {'created': [description], 'updated': [sheet_number], 'unchanged': [sheet_number],
+                     'missing': [sheet_number], 'failed': [(sheet_number, reason)]}"""
+    report = {'created': [], 'updated': [], 'unchanged': [], 'missing': [], 'failed': []}
+
+    # EXISTING REVISIONS
+    revisions = {}
+    for rev_id in Revision.GetAllRevisionIds(doc):
+        revisions.setdefault(doc.GetElement(rev_id).Description, rev_id)
+
+    index = get_sheet_index(doc)
+
+    t = Transaction(doc, transaction_name)
+    t.Start()
+    try:
+        #1️⃣ CREATE MISSING REVISIONS
+        for description in descriptions:
+            if description not in revisions:
+                new_rev = create_revision(description, date, doc=doc)
+                if new_rev:
+                    revisions[description] = new_rev.Id
+                    report['created'].append(description)
+
+        matrix_ids = set(revisions[d].IntegerValue for d in descriptions if d in revisions)
+
+        #2️⃣ ONE WRITE PER SHEET
+        for sheet_number in sorted(issues):
+            sheet = index.get_sheet(sheet_number)
+            if not sheet:
+                report['missing'].append(sheet_number)
+                continue
+
+            current = list(sheet.GetAdditionalRevisionIds())
+            wanted  = dict((revisions[d].IntegerValue, revisions[d]) for d in issues[sheet_number] if d in revisions)
+            final   = [rev_id for rev_id in current
+                       if not (replace and rev_id.IntegerValue in matrix_ids and rev_id.IntegerValue not in wanted)]
+            kept    = set(rev_id.IntegerValue for rev_id in final)
+            final  += [wanted[i] for i in sorted(wanted) if i not in kept]
+
+            if [i.IntegerValue for i in final] == [i.IntegerValue for i in current]:
+                report['unchanged'].append(sheet_number)
+                continue
+            try:
+                sheet.SetAdditionalRevisionIds(List[ElementId](final))
+                report['updated'].append(sheet_number)
+            except Exception as e:
+                report['failed'].append((sheet_number, str(e)))
+        t.Commit()
+    except:
+        t.RollBack()
+        raise
+    return report
+
+
 
 # ╔╦╗╔═╗╔═╗╔╦╗╦╔╗╔╔═╗
 #  ║ ║╣ ╚═╗ ║ ║║║║║ ╦
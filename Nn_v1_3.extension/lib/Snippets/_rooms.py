@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import *
+
+# CUSTOM IMPORTS
+from Snippets._context_manager import SwallowWarnings, set_failure_policy
+
+#>>>>>>>>>> .NET IMPORTS
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+app      = __revit__.Application
+rvt_year = int(app.VersionNumber)
+
+CHUNK_SIZE = 100        # Rooms per Transaction (all chunks are assimilated into one undo step)
+
+_BOUNDARY_OPTIONS = {}  # {SpatialElementBoundaryLocation: SpatialElementBoundaryOptions}
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_boundary_options(location=SpatialElementBoundaryLocation.Finish):
+    #type:(SpatialElementBoundaryLocation) -> SpatialElementBoundaryOptions
+    """Function to get SpatialElementBoundaryOptions (created once per boundary location)."""
+    if location not in _BOUNDARY_OPTIONS:
+        options = SpatialElementBoundaryOptions()
+        options.SpatialElementBoundaryLocation = location
+        _BOUNDARY_OPTIONS[location] = options
+    return _BOUNDARY_OPTIONS[location]
+
+
+def get_room_loops(room, location=SpatialElementBoundaryLocation.Finish):
+    #type:(SpatialElement, SpatialElementBoundaryLocation) -> list
+    """Function to get boundary CurveLoops of a room. First loop is the outer boundary.
+    Raises ValueError for unplaced/not enclosed rooms."""
+    if not room.Location or room.Area <= 0:
+        raise ValueError('Room is not placed or not enclosed')
+
+    loops = []
+    for segments in room.GetBoundarySegments(get_boundary_options(location)):
+        loop = CurveLoop()
+        for segment in segments:
+            loop.Append(segment.GetCurve())
+        loops.append(loop)
+    if not loops:
+        raise ValueError('Room has no boundary')
+    return loops
+
+
+def offset_loops(loops, offset):
+    #type:(list, float) -> list
+    """Function to offset room loops. Positive offset makes the region bigger
+    (outer loop grows, inner loops shrink), whatever the direction of each loop is.
+    :param offset: Offset in internal units (feet)."""
+    if not offset:
+        return loops
+
+    new_loops = []
+    for n, loop in enumerate(loops):
+        is_outer = n == 0
+        # CreateViaOffset moves curves to the right of their direction (seen from normal):
+        # outside for counterclockwise outer loops, into the hole for clockwise inner loops.
+        sign = 1 if loop.IsCounterclockwise(XYZ.BasisZ) == is_outer else -1
+        new_loops.append(CurveLoop.CreateViaOffset(loop, sign * offset, XYZ.BasisZ))
+    return new_loops
+
+
+def check_element_type(element_type):
+    #type:(ElementType) -> None
+    """Function to check that elements of given type can be created in this Revit version.
+    Raises ValueError with a message for the user."""
+    if isinstance(element_type, CeilingType) and rvt_year < 2022:
+        raise ValueError('Ceilings can be created from rooms only in Revit 2022+ (Ceiling.Create).')
+    if not isinstance(element_type, (FloorType, CeilingType)):
+        raise ValueError('Select a Floor or Ceiling type.')
+
+
+def _create_element(doc, element_type, loops, level_id):
+    #type:(Document, ElementType, list, ElementId) -> Element
+    """Create Floor/Ceiling of given type from loops."""
+    if rvt_year >= 2022:
+        profile = List[CurveLoop](loops)
+        if isinstance(element_type, CeilingType):
+            return Ceiling.Create(doc, profile, element_type.Id, level_id)
+        return Floor.Create(doc, profile, element_type.Id, level_id)
+
+    # RVT 2021 and older: NewFloor takes a single profile (ceilings are rejected in check_element_type).
+    profile = CurveArray()
+    for curve in loops[0]:
+        profile.Append(curve)
+    return doc.Create.NewFloor(profile, element_type, doc.GetElement(level_id), False)
+
+
+# ╔╦╗╔═╗╦╔╗╔
+# ║║║╠═╣║║║║
+# ╩ ╩╩ ╩╩╝╚╝ MAIN
+# ==================================================
+def create_from_rooms(doc, rooms, element_type, offset=0.0,
+                      location=SpatialElementBoundaryLocation.Finish, chunk_size=CHUNK_SIZE):
+    #type:(Document, list, ElementType, float, SpatialElementBoundaryLocation, int) -> tuple
+    """Function to create a Floor or Ceiling for each room.
+    1. Boundaries of all rooms are read in one pass (shared SpatialElementBoundaryOptions).
+    2. Elements are created in Transactions of chunk_size rooms inside one TransactionGroup.
+    Bad rooms/loops are collected, they never stop the batch.
+    Raises ValueError if the element type can't be created in this Revit version (see check_element_type).
+
+    Example:
+        GUI     = CreateFromRooms(floor_types)
+        created, failed = create_from_rooms(doc, get_selected_rooms(uidoc), GUI.selected_type, GUI.offset)
+
+    :param element_type: FloorType or CeilingType
+    :param offset:       Offset of room boundary in internal units (see GUI CreateFromRooms.offset)
+    :return:             ([created ElementId], [(room, reason)])"""
+    check_element_type(element_type)
+    created, failed = [], []
+
+    #1️⃣ READ BOUNDARIES
+    profiles = []       # [(room, loops)]
+    for room in rooms:
+        try:
+            profiles.append((room, offset_loops(get_room_loops(room, location), offset)))
+        except Exception as e:
+            failed.append((room, str(e)))
+
+    #2️⃣ CREATE IN CHUNKS
+    tg, t = TransactionGroup(doc, 'Create from Rooms'), None
+    tg.Start()
+    try:
+        for start in range(0, len(profiles), chunk_size):
+            t = Transaction(doc, 'Create from Rooms ({}-{})'.format(start + 1, min(start + chunk_size, len(profiles))))
+            set_failure_policy(t, SwallowWarnings())
+            t.Start()
+
+            chunk_created = []
+            for room, loops in profiles[start:start + chunk_size]:
+                try:
+                    chunk_created.append(_create_element(doc, element_type, loops, room.LevelId).Id)
+                except Exception as e:
+                    failed.append((room, str(e)))
+
+            if t.Commit() == TransactionStatus.Committed:
+                created.extend(chunk_created)
+            else:
+                failed.extend((room, 'Transaction was rolled back') for room, _ in profiles[start:start + chunk_size])
+        tg.Assimilate()
+    except:
+        # Unexpected error (e.g. Commit failed): nothing of this batch is kept.
+        if t and t.HasStarted() and not t.HasEnded():
+            t.RollBack()
+        if tg.HasStarted() and not tg.HasEnded():
+            tg.RollBack()
+        raise
+
+    return created, failed
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+import re
+import heapq
+from bisect import bisect_left, bisect_right, insort
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+# Names are split on separators and on letter/digit boundaries:
+# 'DET_Wall-01'    -> ['det', 'wall', '01']
+# 'A-101 Level 2'  -> ['a', '101', 'level', '2']
+RE_TOKENS    = re.compile(r'[^\W\d_]+|\d+', re.UNICODE)
+RE_SEPARATOR = re.compile(r'[\W_]+', re.UNICODE)
+
+MIN_TRIGRAM_SCORE = 0.5     # Share of query trigrams an item needs to be a fuzzy match
+
+# Short query tokens share few trigrams with a typo ('waal' - 'wall' share none),
+# they are matched with one edit (Damerau: insert, delete, replace or swap two neighbours).
+TYPO_MIN_LENGTH = 3
+TYPO_MAX_LENGTH = 8
+
+# Score of each kind of match, higher is better.
+SCORE_EXACT     = 1000
+SCORE_PREFIX    = 800
+SCORE_TOKENS    = 600       # Every query token is a prefix of a name token
+SCORE_SUBSTRING = 400
+SCORE_TYPO      = 300       # Every query token is one edit from a prefix of a name token
+SCORE_FUZZY     = 200       # * share of matching trigrams
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def tokenize(text):
+    #type:(str) -> list
+    """Function to split a name into lowercase tokens (see RE_TOKENS)."""
+    return RE_TOKENS.findall(text.lower())
+
+
+def compact(text):
+    #type:(str) -> str
+    """Function to remove separators, so 'a101' matches 'A-101' and 'det wall' matches 'DET_Wall'."""
+    return RE_SEPARATOR.sub('', text.lower())
+
+
+def within_one_edit(a, b):
+    #type:(str, str) -> bool
+    """Function to check if Damerau-Levenshtein distance of a and b is at most 1."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+
+    k = 0
+    while k < la and a[k] == b[k]:
+        k += 1
+    if la < lb:                                     # Insert
+        return a[k:] == b[k + 1:]
+    if a[k + 1:] == b[k + 1:]:                      # Replace
+        return True
+    return k + 1 < la and a[k] == b[k + 1] and a[k + 1] == b[k] and a[k + 2:] == b[k + 2:]   # Swap
+
+
+def trigrams(text):
+    #type:(str) -> set
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class SearchIndex(object):
+    """Ranked search over a list of names, built once (e.g. when a window opens).
+    - Token prefix index: {token: set(item)} + sorted unique tokens searched with bisect.
+    - Key prefix index:   compact names sorted once (+ their items) searched with bisect.
+    - Trigram index:      {trigram: [item]} over compact names for typos and partial matches.
+
+    Names are compared without separators and case, so 'a101' finds 'A-101'.
+    Ranking: exact > prefix > all tokens prefixed > substring > one typo in short tokens > fuzzy (trigram share),
+    then shorter names first, then original order.
+
+    Example:
+        index   = SearchIndex([v.Name for v in views])
+        results = index.search('det wal')           # [item positions], best first
+        ranks   = index.rank('a101')                # {item position: rank}"""
+
+    def __init__(self, names=()):
+        self.names     = []
+        self.keys      = []
+        self._tokens   = {}         # {token: set(item)}
+        self._trigrams = {}         # {trigram: [item]}
+        self._order    = []         # Sort key of equal scores: shorter name, then original order
+
+        for name in names:
+            self._add(name)
+        self._sorted_tokens = sorted(self._tokens)
+        by_key              = sorted((key, i) for i, key in enumerate(self.keys))
+        self._sorted_keys   = [key for key, _ in by_key]
+        self._key_items     = [i for _, i in by_key]
+
+    def _add(self, name):
+        #type:(str) -> list
+        """Add name to the indexes, return its new tokens."""
+        i = len(self.names)
+        self.names.append(name)
+        self.keys.append(compact(name))
+        self._order.append((len(name) << 32) + i)
+
+        new_tokens = []
+        for token in tokenize(name):
+            if token not in self._tokens:
+                self._tokens[token] = set()
+                new_tokens.append(token)
+            self._tokens[token].add(i)
+        for trigram in trigrams(self.keys[i]):
+            self._trigrams.setdefault(trigram, []).append(i)
+        return new_tokens
+
+    def add(self, name):
+        #type:(str) -> int
+        """Function to add a name to a built index (e.g. while items are still loading).
+        :return: position of the name"""
+        for token in self._add(name):
+            insort(self._sorted_tokens, token)
+        i = len(self.names) - 1
+        n = bisect_right(self._sorted_keys, self.keys[i])
+        self._sorted_keys.insert(n, self.keys[i])
+        self._key_items.insert(n, i)
+        return i
+
+    def __len__(self):
+        return len(self.names)
+
+    # ╔═╗╔═╗╔╗╔╔╦╗╦╔╦╗╔═╗╔╦╗╔═╗╔═╗
+    # ║  ╠═╣║║║ ║║║ ║║╠═╣ ║ ║╣ ╚═╗
+    # ╚═╝╩ ╩╝╚╝═╩╝╩═╩╝╩ ╩ ╩ ╚═╝╚═╝ CANDIDATES
+    # ==================================================
+    def _token_prefix_items(self, prefix):
+        #type:(str) -> set
+        """Items that have a token starting with prefix."""
+        items = set()
+        n = bisect_left(self._sorted_tokens, prefix)
+        while n < len(self._sorted_tokens) and self._sorted_tokens[n].startswith(prefix):
+            items |= self._tokens[self._sorted_tokens[n]]
+            n += 1
+        return items
+
+    def _key_prefix_items(self, prefix):
+        #type:(str) -> tuple
+        """Items whose compact name starts with prefix, and the subset equal to prefix.
+        :return: (set(prefixed), set(exact))"""
+        start = bisect_left(self._sorted_keys, prefix)
+        exact = bisect_right(self._sorted_keys, prefix, start)
+        end   = bisect_left(self._sorted_keys, prefix + u'\uffff', exact)
+        return set(self._key_items[start:end]), set(self._key_items[start:exact])
+
+    def _trigram_items(self, query_trigrams):
+        #type:(set) -> set
+        """Items that contain every trigram (substring candidates). Smallest postings are intersected first."""
+        postings = sorted((self._trigrams.get(t, ()) for t in query_trigrams), key=len)
+        items    = set(postings[0]) if postings else set()
+        for posting in postings[1:]:
+            if not items:
+                break
+            items.intersection_update(posting)
+        return items
+
+    def _typo_token_items(self, query_token):
+        #type:(str) -> set
+        """Items with a token whose prefix is one edit from query_token ('waal' -> 'Walls', 'parde' -> 'Parede')."""
+        items, n = set(), len(query_token)
+        for token in self._sorted_tokens:
+            if len(token) >= n - 1 and any(within_one_edit(query_token, token[:m]) for m in (n - 1, n, n + 1)):
+                items |= self._tokens[token]
+        return items
+
+    def _typo_items(self, query_tokens):
+        #type:(list) -> set
+        """Items where every query token prefixes a name token, short tokens allowing one typo.
+        Empty if no token can have a typo (too short or long enough for trigrams)."""
+        typo_tokens = [t for t in query_tokens if TYPO_MIN_LENGTH <= len(t) <= TYPO_MAX_LENGTH]
+        if not typo_tokens:
+            return set()
+        items = None
+        for token in query_tokens:
+            token_items = self._token_prefix_items(token)
+            if token in typo_tokens:
+                token_items |= self._typo_token_items(token)
+            items = token_items if items is None else items & token_items
+            if not items:
+                break
+        return items
+
+    def _trigram_counts(self, query_trigrams):
+        #type:(set) -> dict
+        """{item: number of shared trigrams}"""
+        counts = {}
+        for trigram in query_trigrams:
+            for i in self._trigrams.get(trigram, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return counts
+
+    # ╔═╗╔═╗╔═╗╦═╗╔═╗╦ ╦
+    # ╚═╗║╣ ╠═╣╠╦╝║  ╠═╣
+    # ╚═╝╚═╝╩ ╩╩╚═╚═╝╩ ╩ SEARCH
+    # ==================================================
+    def score(self, i, query_key, token_items=()):
+        #type:(int, str, set) -> int
+        """Score of a single item for exact/prefix/token/substring matches, 0 if it does not match.
+        :param token_items: items where every query token prefixes a name token."""
+        key = self.keys[i]
+        if key == query_key:
+            return SCORE_EXACT
+        if key.startswith(query_key):
+            return SCORE_PREFIX
+        if i in token_items:
+            return SCORE_TOKENS
+        if query_key in key:
+            return SCORE_SUBSTRING
+        return 0
+
+    def _direct_tiers(self, query_key, query_tokens, query_trigrams):
+        """Generator of direct matches as sets of items, best score first:
+        exact > prefix > all tokens prefixed > substring.
+        Tiers are built with set operations (no score per item) and only when they are needed."""
+        prefixed, exact = self._key_prefix_items(query_key)
+        yield exact
+        yield prefixed - exact
+
+        token_items = set()
+        if query_tokens:
+            token_items = self._token_prefix_items(query_tokens[0])
+            for token in query_tokens[1:]:
+                token_items &= self._token_prefix_items(token)
+        yield token_items - prefixed
+
+        if query_trigrams:
+            substrings = set(i for i in self._trigram_items(query_trigrams) if query_key in self.keys[i])
+        else:
+            # 1-2 characters: no trigrams, substring scan is cheap enough.
+            substrings = set(i for i, key in enumerate(self.keys) if query_key in key)
+        yield substrings - prefixed - token_items
+
+    def search(self, query, limit=None, min_results=10):
+        #type:(str, int, int) -> list
+        """Function to get positions of matching names, best match first.
+        :param query:       Text typed by user.
+        :param limit:       Max number of results, all matches if None.
+                            Only the best `limit` matches are selected (no sort of all matches)
+                            and lower tiers are not searched once the limit is reached.
+        :param min_results: Fuzzy (typo, trigram) matches are added only if there are fewer direct matches."""
+        query_key    = compact(query)
+        query_tokens = tokenize(query)
+        if not query_key:
+            return list(range(len(self.names)))[:limit]
+        query_trigrams = trigrams(query_key)
+
+        # DIRECT MATCHES: within a tier shorter names first, then original order
+        results, order = [], self._order.__getitem__
+        for tier in self._direct_tiers(query_key, query_tokens, query_trigrams):
+            need = limit - len(results) if limit else len(tier)
+            if need < len(tier):
+                results.extend(heapq.nsmallest(need, tier, key=order))
+            else:
+                results.extend(sorted(tier, key=order))
+            if limit and len(results) >= limit:
+                return results
+
+        # FUZZY MATCHES: one typo in short tokens, then share of query trigrams
+        if len(results) < min_results:
+            matched = set(results)
+            scores  = {}        # {item: score}
+            if len(query_trigrams) > 1:
+                n_trigrams = float(len(query_trigrams))
+                for i, shared in self._trigram_counts(query_trigrams).items():
+                    if shared / n_trigrams >= MIN_TRIGRAM_SCORE:
+                        scores[i] = SCORE_FUZZY * shared / n_trigrams
+            for i in self._typo_items(query_tokens):
+                scores[i] = SCORE_TYPO
+
+            fuzzy = [(-score, self._order[i], i) for i, score in scores.items() if i not in matched]
+            fuzzy = heapq.nsmallest(limit - len(results), fuzzy) if limit else sorted(fuzzy)
+            results.extend(i for _, _, i in fuzzy)
+        return results
+
+    def rank(self, query, limit=None):
+        #type:(str, int) -> dict
+        """Function to get {position: rank} of matching names (rank 0 is the best match)."""
+        return {i: n for n, i in enumerate(self.search(query, limit))}
@@ -20,6 +20,9 @@ from System.Collections.Generic import List
 
 # CUSTOM IMPORTS
 from Snippets._variables import ALL_VIEW_TYPES
+from Snippets._selection_filters import (CustomISelectionFilter,
+                                         ISelectionFilter_Classes,
+                                         ISelectionFilter_Categories)
 from GUI.forms           import select_from_dict
 
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
@@ -30,6 +33,83 @@ uidoc     = __revit__.ActiveUIDocument
 doc       = __revit__.ActiveUIDocument.Document
 selection = uidoc.Selection                          # type: Selection
 
+# ╔═╗╔╗╔╔═╗╔═╗╔═╗╦ ╦╔═╗╔╦╗
+# ╚═╗║║║╠═╣╠═╝╚═╗╠═╣║ ║ ║
+# ╚═╝╝╚╝╩ ╩╩  ╚═╝╩ ╩╚═╝ ╩  SELECTION SNAPSHOT
+#==================================================
+class SelectionSnapshot(object):
+    """Current selection resolved once (one doc.GetElement per id) into buckets.
+    - elements:    [Element] in selection order
+    - int_ids:     set of ElementId.IntegerValue
+    - by_class:    {type(e): [Element]}
+    - by_category: {Category.Id.IntegerValue or None: [Element]}"""
+
+    def __init__(self, uidoc):
+        doc          = uidoc.Document
+        self.doc     = doc
+        self.ids     = list(uidoc.Selection.GetElementIds())
+        self.int_ids = set(e_id.IntegerValue for e_id in self.ids)
+
+        self.elements    = []
+        self.by_class    = {}
+        self.by_category = {}
+        for e_id in self.ids:
+            element = doc.GetElement(e_id)
+            if not element:
+                continue
+            cat    = element.Category
+            cat_id = cat.Id.IntegerValue if cat else None
+            self.elements.append(element)
+            self.by_class.setdefault(type(element), []).append(element)
+            self.by_category.setdefault(cat_id, []).append(element)
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def __contains__(self, element_id):
+        """Check by ElementId or its IntegerValue."""
+        if isinstance(element_id, ElementId):
+            element_id = element_id.IntegerValue
+        return element_id in self.int_ids
+
+    def of_types(self, types):
+        #type:(list) -> list
+        """Selected elements whose exact class is in types (same as type(e) in types)."""
+        types = set(types)
+        if len(types) == 1:
+            return list(self.by_class.get(types.pop(), []))
+        return [e for e in self.elements if type(e) in types]
+
+    def of_categories(self, categories):
+        #type:(list) -> list
+        """Selected elements of given categories (BuiltInCategory/ElementId/int)."""
+        cat_ids = set(int(c.IntegerValue) if isinstance(c, ElementId) else int(c) for c in categories)
+        return [e for cat_id in cat_ids for e in self.by_category.get(cat_id, [])]
+
+
+_SNAPSHOTS = {}
+
+def get_selection_snapshot(uidoc = uidoc, refresh = False):
+    #type:(UIDocument, bool) -> SelectionSnapshot
+    """Function to get SelectionSnapshot of the given UIDocument.
+    It is resolved once per command and reused until the selected ids change
+    (e.g. after Selection.SetElementIds) or refresh=True is given."""
+    doc      = uidoc.Document
+    snapshot = _SNAPSHOTS.get(doc)
+    if snapshot and not refresh:
+        current_ids = uidoc.Selection.GetElementIds()
+        if current_ids.Count == len(snapshot.int_ids) and \
+                all(e_id.IntegerValue in snapshot.int_ids for e_id in current_ids):
+            return snapshot
+
+    snapshot        = SelectionSnapshot(uidoc)
+    _SNAPSHOTS[doc] = snapshot
+    return snapshot
+
+
 # ╔═╗╔═╗╔╦╗  ╔═╗╔═╗╦  ╔═╗╔═╗╔╦╗╔═╗╔╦╗
 # ║ ╦║╣  ║   ╚═╗║╣ ║  ║╣ ║   ║ ║╣  ║║
 # ╚═╝╚═╝ ╩   ╚═╝╚═╝╩═╝╚═╝╚═╝ ╩ ╚═╝═╩╝
@@ -39,11 +119,8 @@ selection = uidoc.Selection                          # type: Selection
 
 def get_selected_elements(uidoc = uidoc, exitscript=True):
     """Property that retrieves selected views or promt user to select some from the dialog box."""
-    doc       = uidoc.Document
-    selection = uidoc.Selection  # type: Selection
-
     try:
-        selected_elements = [doc.GetElement(e_id) for e_id in selection.GetElementIds()]
+        selected_elements = list(get_selection_snapshot(uidoc).elements)
         if not selected_elements and exitscript:
             forms.alert("No elements  were selected.\nPlease, try again.", exitscript=exitscript)
     except:
@@ -63,8 +140,7 @@ def get_selected_rooms(uidoc=uidoc, exitscript = True):
     doc       = uidoc.Document
     selection = uidoc.Selection  # type: Selection
 
-    selected_elements = [doc.GetElement(e_id) for e_id in selection.GetElementIds()]
-    selected_rooms    = [e for e in selected_elements if type(e) == Room]
+    selected_rooms    = get_selection_snapshot(uidoc).of_types([Room])
     ref_rooms         = [Reference(r) for r in selected_rooms]
     ref_preselection  = List[Reference](ref_rooms)
 
@@ -99,18 +175,16 @@ def get_selected_views(given_uidoc = uidoc, exit_if_none = False, title = '__tit
     [15.02.2022] - If no views selected -> Select from DialogBox
     :return: list of selected views."""
 
-    # GET SELECTED ELEMENTS
-    doc         = given_uidoc.Document
-    UI_selected = given_uidoc.Selection.GetElementIds()
-
     # GET VIEWS FROM SELECTION
-    selected_views = [given_uidoc.Document.GetElement(view_id) for view_id in UI_selected if type(doc.GetElement(view_id)) in ALL_VIEW_TYPES]
+    doc            = given_uidoc.Document
+    selected_views = get_selection_snapshot(given_uidoc).of_types(ALL_VIEW_TYPES)
 
     # IF NONE SELECTED - OPEN A DIALOGBOX TO CHOOSE FROM.
     if not selected_views:
-        all_views = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).WhereElementIsNotElementType().ToElements()
-        dict_views = {view.Name:view for view in all_views}
-        selected_views = select_from_dict(dict_views, title=title, label = 'Select Views', button_name='Select', version=version)
+        # Views are pulled lazily by the dialog while it is already open.
+        all_views  = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Views).WhereElementIsNotElementType()
+        view_pairs = ((view.Name, view) for view in all_views)
+        selected_views = select_from_dict(view_pairs, title=title, label = 'Select Views', button_name='Select', version=version)
 
     # EXIT IF STILL NONE SELECTED
     if not selected_views and exit_if_none:
@@ -125,18 +199,15 @@ def get_selected_sheets(given_uidoc = uidoc, exit_if_none = False, title='__titl
     LastUpdates:
     [15.02.2022] - If no sheets selected -> Select from DialogBox
     [01.06.2022] - Bug Fixed + added more controls(label, btn_name)"""
-    #>>>>>>>>>> GET SELECTED ELEMENTS
-    doc         = given_uidoc.Document
-    UI_selected = given_uidoc.Selection.GetElementIds()
-
     #>>>>>>>>>> GET SHEETS FROM SELECTION
-    selected_sheets = [doc.GetElement(sheet_id) for sheet_id in UI_selected if type(doc.GetElement(sheet_id)) == ViewSheet]
+    doc             = given_uidoc.Document
+    selected_sheets = get_selection_snapshot(given_uidoc).of_types([ViewSheet])
 
     #>>>>>>>>>> IF NONE SELECTED - OPEN A DIALOGBOX TO CHOOSE FROM.
     if not selected_sheets:
-        all_sheets      = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets).WhereElementIsNotElementType().ToElements()
-        dict_sheets     = {'{} - {}'.format(sheet.SheetNumber, sheet.Name): sheet for sheet in all_sheets}
-        selected_sheets = select_from_dict(dict_sheets, title=title, label=label, button_name=btn_name, version=version)
+        all_sheets      = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Sheets).WhereElementIsNotElementType()
+        sheet_pairs     = (('{} - {}'.format(sheet.SheetNumber, sheet.Name), sheet) for sheet in all_sheets)
+        selected_sheets = select_from_dict(sheet_pairs, title=title, label=label, button_name=btn_name, version=version)
 
     #>>>>>>>>>> EXIT IF STILL NONE SELECTED
     if not selected_sheets and exit_if_none:
@@ -148,8 +219,7 @@ def get_selected_walls(uidoc, exitscript = True):
     doc       = uidoc.Document
     selection = uidoc.Selection  # type: Selection
 
-    selected_elements = [doc.GetElement(e_id) for e_id in selection.GetElementIds()]
-    selected_walls    = [e for e in selected_elements if type(e) == Wall]
+    selected_walls    = get_selection_snapshot(uidoc).of_types([Wall])
 
 
     ref_walls         = [Reference(r) for r in selected_walls]
@@ -229,37 +299,8 @@ def select_floor_type(given_uidoc = uidoc):
 # ╦  ╔═╗╔═╗╦  ╔═╗╔═╗╔╦╗╦╔═╗╔╗╔  ╔═╗╦╦ ╔╦╗╔═╗╦═╗
 # ║  ╚═╗║╣ ║  ║╣ ║   ║ ║║ ║║║║  ╠╣ ║║  ║ ║╣ ╠╦╝
 # ╩  ╚═╝╚═╝╩═╝╚═╝╚═╝ ╩ ╩╚═╝╝╚╝  ╚  ╩╩═╝╩ ╚═╝╩╚═
-class CustomISelectionFilter(ISelectionFilter):
-    """Filter user selection to certain element."""
-    def __init__(self, cats):
-        self.cats = cats
-    def AllowElement(self, e):
-        if str(e.Category.Id) == str(self.cats):
-        #if e.Category.Name == "Walls"
-            return True
-        return False
-
-class ISelectionFilter_Classes(ISelectionFilter):
-    def __init__(self, allowed_types):
-        """ ISelectionFilter made to filter with types
-        :param allowed_types: list of allowed Types"""
-        self.allowed_types = allowed_types
-
-    def AllowElement(self, element):
-        if type(element) in self.allowed_types:
-            return True
-
-
-
-class ISelectionFilter_Categories(ISelectionFilter):
-    def __init__(self, allowed_cats):
-        """ ISelectionFilter made to filter with types
-        :param allowed_types: list of allowed Types"""
-        self.allowed_cat_ids = [ElementId(bic) for bic in allowed_cats]
-        # P.S. Use Category.Id because Category.BuiltInCategory is not available in older versions
-    def AllowElement(self, element):
-        if element.Category.Id in self. allowed_cat_ids:
-            return True
+# Moved to Snippets._selection_filters (imported above for existing callers):
+# CustomISelectionFilter, ISelectionFilter_Classes, ISelectionFilter_Categories
 
 
 
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+#==================================================
+from Autodesk.Revit.UI.Selection import ISelectionFilter
+from Autodesk.Revit.DB import ElementId, Category, RevitLinkInstance
+
+# CUSTOM IMPORTS
+from Snippets._links import get_link_registry
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+#==================================================
+def _to_category_int(category):
+    """BuiltInCategory / Category / ElementId / int / '-2000011' -> int"""
+    if isinstance(category, Category):
+        return category.Id.IntegerValue
+    if isinstance(category, ElementId):
+        return category.IntegerValue
+    return int(category)
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+#==================================================
+class NnSelectionFilter(ISelectionFilter):
+    """Base ISelectionFilter with O(1) checks on precomputed int sets.
+    Subclasses implement is_allowed(element). Elements in Revit links are
+    checked with the same rule; each link's Document is resolved once per filter.
+
+    :param allow_links: True to accept elements picked with ObjectType.LinkedElement."""
+    def __init__(self, allow_links = False):
+        self.allow_links = allow_links
+        self._link_docs  = {}       # {RevitLinkInstance.Id.IntegerValue: Document}
+
+    def is_allowed(self, element):
+        return True
+
+    def AllowElement(self, element):
+        if self.allow_links and isinstance(element, RevitLinkInstance):
+            return True         # Hovering a link - let AllowReference decide on linked element.
+        try:
+            return bool(self.is_allowed(element))
+        except:
+            return False
+
+    def AllowReference(self, reference, point):
+        if not self.allow_links or reference.LinkedElementId == ElementId.InvalidElementId:
+            return False
+        try:
+            link_doc = self.get_link_document(reference.ElementId)
+            element  = link_doc.GetElement(reference.LinkedElementId) if link_doc else None
+            return bool(element and self.is_allowed(element))
+        except:
+            return False
+
+    def get_link_document(self, link_instance_id):
+        """Linked Document of a RevitLinkInstance id (cached per filter)."""
+        key = link_instance_id.IntegerValue
+        if key not in self._link_docs:
+            registry = get_link_registry(__revit__.ActiveUIDocument.Document)
+            self._link_docs[key] = registry.get_document(link_instance_id)
+        return self._link_docs[key]
+
+
+class CustomISelectionFilter(NnSelectionFilter):
+    """Filter user selection to a single category.
+    :param cats: Category id as str ('-2000011'), int, ElementId or BuiltInCategory."""
+    def __init__(self, cats, allow_links = False):
+        NnSelectionFilter.__init__(self, allow_links)
+        self.cats   = cats
+        self.cat_id = _to_category_int(cats)
+
+    def is_allowed(self, e):
+        return e.Category is not None and e.Category.Id.IntegerValue == self.cat_id
+
+
+class ISelectionFilter_Classes(NnSelectionFilter):
+    def __init__(self, allowed_types, allow_links = False):
+        """ ISelectionFilter made to filter with types
+        :param allowed_types: list of allowed Types"""
+        NnSelectionFilter.__init__(self, allow_links)
+        self.allowed_types = set(allowed_types)
+
+    def is_allowed(self, element):
+        return type(element) in self.allowed_types
+
+
+class ISelectionFilter_Categories(NnSelectionFilter):
+    def __init__(self, allowed_cats, allow_links = False):
+        """ ISelectionFilter made to filter with categories
+        :param allowed_cats: list of allowed BuiltInCategories (or Category/ElementId/int)"""
+        NnSelectionFilter.__init__(self, allow_links)
+        self.allowed_cat_ids = set(_to_category_int(cat) for cat in allowed_cats)
+        # P.S. Use Category.Id because Category.BuiltInCategory is not available in older versions
+
+    def is_allowed(self, element):
+        return element.Category is not None and element.Category.Id.IntegerValue in self.allowed_cat_ids
@@ -1,34 +1,106 @@
 from Autodesk.Revit.DB import *
 from Autodesk.Revit.UI import UIDocument
+
+# CUSTOM IMPORTS
+from Snippets._cache import DocumentCache
+
 default_uidoc = __revit__.ActiveUIDocument
 default_doc = default_uidoc.Document
 
-
+_SHEET_INDEXES = DocumentCache('sheet_index')
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class SheetIndex(object):
+    """Content of every ViewSheet in a Document, collected in one pass per element class.
+    - sheets:      {sheet_id: ViewSheet}
+    - by_number:   {SheetNumber: ViewSheet}
+    - titleblocks: {sheet_id: [FamilyInstance]}
+    - viewports:   {sheet_id: [Viewport]}
+    - views:       {sheet_id: [View]}
+    - schedules:   {sheet_id: [ScheduleSheetInstance]}   (revision schedules of TitleBlocks excluded)
+    Keys are ElementId.IntegerValue.
+
+    Example:
+        index = get_sheet_index(doc)
+        for sheet in index.sheets.values():
+            title_blocks = index.get_titleblocks(sheet)"""
+
+    def __init__(self, doc):
+        self.doc         = doc
+        self.sheets      = {}
+        self.by_number   = {}
+        self.titleblocks = {}
+        self.viewports   = {}
+        self.views       = {}
+        self.schedules   = {}
+
+        for sheet in FilteredElementCollector(doc).OfClass(ViewSheet):
+            self.sheets[sheet.Id.IntegerValue] = sheet
+            self.by_number[sheet.SheetNumber]  = sheet
+
+        for title_block in FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TitleBlocks)\
+                                                        .WhereElementIsNotElementType():
+            self.titleblocks.setdefault(title_block.OwnerViewId.IntegerValue, []).append(title_block)
+
+        for viewport in FilteredElementCollector(doc).OfClass(Viewport):
+            sheet_id = viewport.SheetId.IntegerValue
+            self.viewports.setdefault(sheet_id, []).append(viewport)
+            self.views.setdefault(sheet_id, []).append(doc.GetElement(viewport.ViewId))
+
+        for schedule in FilteredElementCollector(doc).OfClass(ScheduleSheetInstance):
+            if not schedule.IsTitleblockRevisionSchedule:
+                self.schedules.setdefault(schedule.OwnerViewId.IntegerValue, []).append(schedule)
+
+    def get_sheet(self, sheet_number):
+        #type:(str) -> ViewSheet
+        return self.by_number.get(sheet_number)
+
+    def get_titleblocks(self, sheet):
+        #type:(ViewSheet) -> list
+        return list(self.titleblocks.get(sheet.Id.IntegerValue, []))
+
+    def get_viewports(self, sheet):
+        #type:(ViewSheet) -> list
+        return list(self.viewports.get(sheet.Id.IntegerValue, []))
+
+    def get_views(self, sheet):
+        #type:(ViewSheet) -> list
+        return list(self.views.get(sheet.Id.IntegerValue, []))
+
+    def get_schedules(self, sheet):
+        #type:(ViewSheet) -> list
+        return list(self.schedules.get(sheet.Id.IntegerValue, []))
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_sheet_index(doc=default_doc):
+    #type:(Document) -> SheetIndex
+    """Function to get SheetIndex of the Document (built once, rebuilt after the document changes).
+    Inside an open Transaction (doc.IsModifiable) the cache is not updated yet (DocumentChanged comes
+    after commit), so a fresh index is built on every call and not cached.
+    Build one SheetIndex and reuse it if you read many sheets inside a Transaction."""
+    if doc.IsModifiable:
+        return SheetIndex(doc)
+    return _SHEET_INDEXES.get(doc, 'index', lambda: SheetIndex(doc))
 
 
 def get_views_on_sheet(sheet, uidoc=default_uidoc):
     """Function to return all views found on the given sheet."""
-    doc = uidoc.Document
-    viewports_ids   = sheet.GetAllViewports()
-    viewports       = [doc.GetElement(viewport_id)  for viewport_id in viewports_ids]
-    views_ids       = [viewport.ViewId              for viewport    in viewports]
-    views           = [doc.GetElement(view_id)      for view_id     in views_ids]
-    return views
+    return get_sheet_index(uidoc.Document).get_views(sheet)
 
 
 def get_titleblock_on_sheet(sheet, uidoc=default_uidoc):
     """Function to get TitleBlock from given ViewSheet.
     It will not return any TitleBlocks if there are more than 1 on ViewSheet.
     :returns TitleBlock"""
-    #TODO THIS FUNCTION IS OBSOLETE
-    doc = uidoc.Document
-
-    all_TitleBlocks = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_TitleBlocks).WhereElementIsNotElementType().ToElements()
-    title_blocks_on_sheet = []
-
-    for title_block in all_TitleBlocks:
-        if title_block.OwnerViewId == sheet.Id:
-            title_blocks_on_sheet.append(title_block)
+    title_blocks_on_sheet = get_sheet_index(uidoc.Document).get_titleblocks(sheet)
 
     if not title_blocks_on_sheet:
         print("***No TitleBlocks were found on given ViewSheet ({}***".format(sheet.SheetNumber))
@@ -46,18 +118,4 @@ def get_titleblocks_from_sheet(sheet, uidoc):
     :param sheet: ViewSheet that has TitleBlock/
     :param uidoc: UIDocument of the Project
     :return:      list of TitleBlocks that are placed on the given Sheet."""
-    # CREATE A RULE
-    rule_value = sheet.SheetNumber
-    param_sheet_number = ElementId(BuiltInParameter.SHEET_NUMBER)
-    f_pvp = ParameterValueProvider(param_sheet_number)
-    evaluator = FilterStringEquals()
-    f_rule = FilterStringRule(f_pvp, evaluator, rule_value, True)
-
-    # CREATE A FILTER
-    tb_filter = ElementParameterFilter(f_rule)
-
-    tb = FilteredElementCollector(uidoc.Document).OfCategory(BuiltInCategory.OST_TitleBlocks) \
-        .WhereElementIsNotElementType().WherePasses(tb_filter).ToElements()
-
-    return list(tb)
-
+    return get_sheet_index(uidoc.Document).get_titleblocks(sheet)
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# ╦╔╦╗╔═╗╔═╗╦═╗╔╦╗╔═╗
+# ║║║║╠═╝║ ║╠╦╝ ║ ╚═╗
+# ╩╩ ╩╩  ╚═╝╩╚═ ╩ ╚═╝ IMPORTS
+# ==================================================
+from Autodesk.Revit.DB import ElementLevelFilter, XYZ
+from array import array
+import math
+
+# CUSTOM IMPORTS
+from Snippets._cache import DocumentCache
+from Snippets._query import Q, category_id_value
+
+# ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
+# ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
+#  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
+# ==================================================
+_INDEXES = DocumentCache('spatial_index')
+
+# Flat layout of one box in SpatialIndex.boxes
+MIN_X, MIN_Y, MIN_Z, MAX_X, MAX_Y, MAX_Z = range(6)
+
+
+# ╔═╗╦ ╦╔╗╔╔═╗╔╦╗╦╔═╗╔╗╔╔═╗
+# ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
+# ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
+# ==================================================
+def get_bb_values(element, view=None):
+    #type:(Element, View) -> tuple
+    """Function to get (min_x, min_y, min_z, max_x, max_y, max_z) of element's BoundingBox or None."""
+    BB = element.get_BoundingBox(view)
+    if not BB:
+        return None
+    return (BB.Min.X, BB.Min.Y, BB.Min.Z, BB.Max.X, BB.Max.Y, BB.Max.Z)
+
+
+def _as_xyz_values(points):
+    """XYZ list / (x, y[, z]) tuples / flat array('d') of x,y,z -> generator of (x, y, z)."""
+    if isinstance(points, array):
+        for i in range(0, len(points), 3):
+            yield points[i], points[i + 1], points[i + 2]
+        return
+    for p in points:
+        if isinstance(p, XYZ):
+            yield p.X, p.Y, p.Z
+        else:
+            yield p[0], p[1], (p[2] if len(p) > 2 else None)
+
+
+# ╔═╗╦  ╔═╗╔═╗╔═╗╔═╗╔═╗
+# ║  ║  ╠═╣╚═╗╚═╗║╣ ╚═╗
+# ╚═╝╩═╝╩ ╩╚═╝╚═╝╚═╝╚═╝ CLASSES
+# ==================================================
+class SpatialIndex(object):
+    """Uniform XY grid over axis-aligned boxes stored in one flat array('d').
+    Each box is registered in every grid cell it touches, so a query only
+    tests boxes of the cells it touches instead of every box.
+
+    Queries are 2D (XY) unless Z is given; they return keys
+    (ElementId.IntegerValue for from_elements, position in boxes otherwise).
+
+    Example:
+        rooms = get_spatial_index(doc, BuiltInCategory.OST_Rooms, level)
+        for door, room_ids in zip(doors, rooms.query_points([d.Location.Point for d in doors])): ...
+        pairs = get_spatial_index(doc, BuiltInCategory.OST_Walls).overlap_pairs()
+        near  = rooms.nearest(XYZ(0, 0, 0), k=3)    # [(distance, key)]"""
+
+    def __init__(self, boxes, keys=None, cell_size=None):
+        """:param boxes:     flat sequence of min_x, min_y, min_z, max_x, max_y, max_z per box
+        :param keys:      key of each box, default - position of the box
+        :param cell_size: grid cell size in internal units, computed from data if None"""
+        self.boxes = boxes if isinstance(boxes, array) else array('d', boxes)
+        self.count = len(self.boxes) // 6
+        self.keys  = list(keys) if keys is not None else list(range(self.count))
+        self.cells = {}         # {(ix, iy): [box index]}
+
+        if not self.count:
+            self.origin_x, self.origin_y, self.cell_size, self.nx, self.ny = 0.0, 0.0, 1.0, 0, 0
+            return
+
+        b = self.boxes
+        self.origin_x = min(b[i * 6 + MIN_X] for i in range(self.count))
+        self.origin_y = min(b[i * 6 + MIN_Y] for i in range(self.count))
+        extent_x      = max(b[i * 6 + MAX_X] for i in range(self.count)) - self.origin_x
+        extent_y      = max(b[i * 6 + MAX_Y] for i in range(self.count)) - self.origin_y
+        self.cell_size = cell_size or self._auto_cell_size(extent_x, extent_y)
+        self.nx = int(extent_x / self.cell_size) + 1
+        self.ny = int(extent_y / self.cell_size) + 1
+
+        for i in range(self.count):
+            o = i * 6
+            ix0, iy0 = self._cell(b[o + MIN_X], b[o + MIN_Y])
+            ix1, iy1 = self._cell(b[o + MAX_X], b[o + MAX_Y])
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    self.cells.setdefault((ix, iy), []).append(i)
+
+    @classmethod
+    def from_elements(cls, elements, view=None, cell_size=None):
+        """Build index from elements' BoundingBoxes. Elements without BoundingBox are skipped."""
+        boxes, keys = array('d'), []
+        for element in elements:
+            values = get_bb_values(element, view)
+            if values:
+                boxes.extend(values)
+                keys.append(element.Id.IntegerValue)
+        return cls(boxes, keys, cell_size)
+
+    def __len__(self):
+        return self.count
+
+    def _auto_cell_size(self, extent_x, extent_y):
+        """Average box size, but no more than ~4 cells per box on average over the extent."""
+        b = self.boxes
+        mean_size = sum((b[i * 6 + MAX_X] - b[i * 6 + MIN_X]) + (b[i * 6 + MAX_Y] - b[i * 6 + MIN_Y])
+                        for i in range(self.count)) / (2.0 * self.count)
+        density   = math.sqrt(max(extent_x * extent_y, 1e-9) / self.count)
+        return max(mean_size, density / 2.0, 1e-6)
+
+    def _cell(self, x, y):
+        return int(math.floor((x - self.origin_x) / self.cell_size)), \
+               int(math.floor((y - self.origin_y) / self.cell_size))
+
+    def _contains(self, i, x, y, z=None):
+        o, b = i * 6, self.boxes
+        if not (b[o + MIN_X] <= x <= b[o + MAX_X] and b[o + MIN_Y] <= y <= b[o + MAX_Y]):
+            return False
+        return z is None or b[o + MIN_Z] <= z <= b[o + MAX_Z]
+
+    def _overlaps(self, i, box, use_z, tolerance=0.0):
+        o, b = i * 6, self.boxes
+        if b[o + MIN_X] > box[MAX_X] + tolerance or box[MIN_X] > b[o + MAX_X] + tolerance: return False
+        if b[o + MIN_Y] > box[MAX_Y] + tolerance or box[MIN_Y] > b[o + MAX_Y] + tolerance: return False
+        if use_z and (b[o + MIN_Z] > box[MAX_Z] + tolerance or box[MIN_Z] > b[o + MAX_Z] + tolerance): return False
+        return True
+
+    def _distance(self, i, x, y):
+        o, b = i * 6, self.boxes
+        dx = max(b[o + MIN_X] - x, 0.0, x - b[o + MAX_X])
+        dy = max(b[o + MIN_Y] - y, 0.0, y - b[o + MAX_Y])
+        return math.sqrt(dx * dx + dy * dy)
+
+    def box(self, key_index):
+        #type:(int) -> tuple
+        """Box values of the box at given position."""
+        o = key_index * 6
+        return tuple(self.boxes[o:o + 6])
+
+    # ╔═╗ ╦ ╦╔═╗╦═╗╦╔═╗╔═╗
+    # ║═╬╗║ ║║╣ ╠╦╝║║╣ ╚═╗
+    # ╚═╝╚╚═╝╚═╝╩╚═╩╚═╝╚═╝ QUERIES
+    # ==================================================
+    def query_point(self, x, y, z=None):
+        #type:(float, float, float) -> list
+        """Keys of boxes that contain the point (XY only if z is None)."""
+        candidates = self.cells.get(self._cell(x, y), ())
+        return [self.keys[i] for i in candidates if self._contains(i, x, y, z)]
+
+    def query_points(self, points, use_z=False):
+        #type:(list, bool) -> list
+        """Batch point-in-box.
+        :param points: [XYZ] | [(x, y[, z])] | flat array('d') of x, y, z
+        :return:       [[keys]] - one list per point, in the same order"""
+        return [self.query_point(x, y, z if use_z else None) for x, y, z in _as_xyz_values(points)]
+
+    def query_box(self, box, use_z=False, tolerance=0.0):
+        #type:(tuple, bool, float) -> list
+        """Keys of boxes overlapping the given box (min_x, min_y, min_z, max_x, max_y, max_z)."""
+        ix0, iy0 = self._cell(box[MIN_X] - tolerance, box[MIN_Y] - tolerance)
+        ix1, iy1 = self._cell(box[MAX_X] + tolerance, box[MAX_Y] + tolerance)
+        ix0, iy0 = max(ix0, 0), max(iy0, 0)
+        ix1, iy1 = min(ix1, self.nx - 1), min(iy1, self.ny - 1)
+
+        found = set()
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                for i in self.cells.get((ix, iy), ()):
+                    if i not in found and self._overlaps(i, box, use_z, tolerance):
+                        found.add(i)
+        return [self.keys[i] for i in sorted(found)]
+
+    def overlap_pairs(self, other=None, use_z=True, tolerance=0.0):
+        #type:(SpatialIndex, bool, float) -> list
+        """Pairs of overlapping boxes - candidates for clash detection.
+        :param other: None - pairs within this index, SpatialIndex - pairs between both indexes
+        :return:      [(key, key)] (key of other index second)"""
+        if other is not None:
+            pairs = []
+            for j in range(other.count):
+                box = other.box(j)
+                for key in self.query_box(box, use_z, tolerance):
+                    pairs.append((key, other.keys[j]))
+            return pairs
+
+        # Boxes sharing several cells are reported only in the first shared cell.
+        # P.S. Within one index, tolerance only applies to boxes sharing a cell.
+        pairs, b = [], self.boxes
+        first_cell = [self._cell(b[i * 6 + MIN_X], b[i * 6 + MIN_Y]) for i in range(self.count)]
+        for cell, items in self.cells.items():
+            for n, i in enumerate(items):
+                box_i = self.box(i)
+                for j in items[n + 1:]:
+                    shared = (max(first_cell[i][0], first_cell[j][0]), max(first_cell[i][1], first_cell[j][1]))
+                    if shared == cell and self._overlaps(j, box_i, use_z, tolerance):
+                        pairs.append((self.keys[i], self.keys[j]))
+        return pairs
+
+    def _ring(self, cx, cy, r):
+        """Cells on the perimeter of ring r around cell (cx, cy), clamped to the grid (8r cells at most)."""
+        if r == 0:
+            yield cx, cy
+            return
+        x0, x1 = max(cx - r, 0), min(cx + r, self.nx - 1)
+        y0, y1 = max(cy - r + 1, 0), min(cy + r - 1, self.ny - 1)
+        for iy in (cy - r, cy + r):
+            if 0 <= iy < self.ny:
+                for ix in range(x0, x1 + 1):
+                    yield ix, iy
+        for ix in (cx - r, cx + r):
+            if 0 <= ix < self.nx:
+                for iy in range(y0, y1 + 1):
+                    yield ix, iy
+
+    def nearest(self, point, k=1, max_distance=None):
+        #type:(XYZ, int, float) -> list
+        """k nearest boxes to the point in XY (distance 0 if the point is inside).
+        Grid rings around the nearest grid cell are visited until no closer box can be found.
+        If rings would visit more cells than there are boxes (sparse grid, small cell_size),
+        the remaining boxes are checked directly instead.
+        :return: [(distance, key)] sorted by distance"""
+        x, y = (point.X, point.Y) if isinstance(point, XYZ) else (point[0], point[1])
+        if not self.count:
+            return []
+
+        # Point outside of the grid starts from the nearest cell of the grid.
+        cx, cy = self._cell(x, y)
+        cx, cy = min(max(cx, 0), self.nx - 1), min(max(cy, 0), self.ny - 1)
+        gap_x  = max(self.origin_x - x, 0.0, x - (self.origin_x + self.nx * self.cell_size))
+        gap_y  = max(self.origin_y - y, 0.0, y - (self.origin_y + self.ny * self.cell_size))
+        gap    = math.sqrt(gap_x * gap_x + gap_y * gap_y)      # Distance from the point to the grid
+        if max_distance is not None and gap > max_distance:
+            return []
+
+        def add(i):
+            if i not in seen:
+                seen.add(i)
+                d = self._distance(i, x, y)
+                if max_distance is None or d <= max_distance:
+                    best.append((d, i))
+
+        max_ring = max(cx, self.nx - 1 - cx, cy, self.ny - 1 - cy)
+        seen, best, n_visited = set(), [], 0
+        for r in range(max_ring + 1):
+            # Boxes not seen yet are at least (r-1) cells away from the grid cell, outside of the grid too.
+            ring_distance = max(r - 1, 0) * self.cell_size
+            bound         = math.sqrt(gap * gap + ring_distance * ring_distance)
+            if len(best) >= k and best[k - 1][0] <= bound:
+                break
+            if max_distance is not None and bound > max_distance:
+                break
+
+            n_visited += 8 * r or 1
+            if n_visited > self.count:
+                for i in range(self.count):
+                    add(i)
+                best.sort()
+                break
+
+            for cell in self._ring(cx, cy, r):
+                for i in self.cells.get(cell, ()):
+                    add(i)
+            best.sort()
+
+        return [(d, self.keys[i]) for d, i in best[:k]]
+
+
+# ╔╦╗╔═╗╦╔╗╔
+# ║║║╠═╣║║║║
+# ╩ ╩╩ ╩╩╝╚╝ MAIN
+# ==================================================
+def get_spatial_index(doc, categories, level=None, view=None):
+    #type:(Document, any, Level, View) -> SpatialIndex
+    """Function to get SpatialIndex of element instances of given categories,
+    optionally limited to a Level (ElementLevelFilter) or elements visible in a View.
+    Index is built once per Document/categories/level/view until the Document changes.
+    :param categories: BuiltInCategory or list of them"""
+    categories = categories if isinstance(categories, (list, tuple, set)) else [categories]
+    cat_ids    = tuple(sorted(category_id_value(c) for c in categories))
+    key        = (cat_ids,
+                  level.Id.IntegerValue if level else None,
+                  view.Id.IntegerValue  if view  else None)
+
+    def build():
+        query = Q(doc).category(cat_ids).instances()
+        if level:
+            query.where(ElementLevelFilter(level.Id))
+        if view:
+            query.in_view(view)
+        return SpatialIndex.from_elements(query.elements())
+
+    return _INDEXES.get(doc, key, build)
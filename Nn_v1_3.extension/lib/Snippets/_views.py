@@ -6,6 +6,9 @@
 from pyrevit import forms
 from Autodesk.Revit.DB import *
 
+# CUSTOM IMPORTS
+from Snippets._filters import create_string_equals_filter
+
 # ╦  ╦╔═╗╦═╗╦╔═╗╔╗ ╦  ╔═╗╔═╗
 # ╚╗╔╝╠═╣╠╦╝║╠═╣╠╩╗║  ║╣ ╚═╗
 #  ╚╝ ╩ ╩╩╚═╩╩ ╩╚═╝╩═╝╚═╝╚═╝ VARIABLES
@@ -19,18 +22,6 @@ rvt_year = int(app.VersionNumber)
 # ╠╣ ║ ║║║║║   ║ ║║ ║║║║╚═╗
 # ╚  ╚═╝╝╚╝╚═╝ ╩ ╩╚═╝╝╚╝╚═╝ FUNCTIONS
 # ==================================================
-def create_string_equals_filter(key_parameter, element_value, caseSensitive = True):
-    """Function to create ElementParameterFilter based on FilterStringRule."""
-    f_parameter         = ParameterValueProvider(ElementId(key_parameter))
-    f_parameter_value   = element_value
-
-    if rvt_year < 2022:
-        f_rule = FilterStringRule(f_parameter, FilterStringEquals(), f_parameter_value, caseSensitive)
-    else:
-        f_rule = FilterStringRule(f_parameter, FilterStringEquals(), f_parameter_value)
-
-    return ElementParameterFilter(f_rule)
-
 def get_sheet_from_view(view):
     #type:(View) -> ViewPlan
     """Function to get ViewSheet associated with the given ViewPlan"""